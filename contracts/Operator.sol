@@ -13,6 +13,15 @@ bytes4 constant SafeMathErrorSelector = 0xf87815b3;
 // bytes4(keccak256('InvalidJumpDestination()'));
 bytes4 constant InvalidJumpDestinationSelector = 0x5b7ccd90;
 
+// bytes4(keccak256('ReturnStackOverflow()'));
+bytes4 constant ReturnStackOverflowSelector = 0xcdec52f2;
+
+// bytes4(keccak256('InvalidAddressTable()'));
+bytes4 constant InvalidAddressTableSelector = 0xd8f5c456;
+
+// bytes4(keccak256('InvalidAddressReference()'));
+bytes4 constant InvalidAddressReferenceSelector = 0x1f31078e;
+
 // bytes4(keccak256('transientAccess(bytes32)'));
 bytes4 constant transientAccessSelector = 0x834178fe;
 
@@ -173,6 +182,16 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
     // action[1]
     // action[2]
     // ...
+    //
+    // memory layout for 'unlockCallback' is as follows:
+    //
+    // scratch space              - from byte 0 (64 bytes)
+    // free memory pointer        - from byte 64 (32 bytes)
+    // Solidity's zero slot       - from byte 96 (32 bytes)
+    // registers 248 to 255       - from byte 128 (256 bytes)
+    // calldata of the calls      - from byte 384
+    //
+    // where the data of 'RETURN_SLOTS' is also written from byte 384.
 
     // 'payer' and the deadline are read from calldata.
     address _payer_;
@@ -196,6 +215,14 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
     // The address of the 'universalQuoter' contract.
     address _quoter_ = quoter;
 
+    // The return addresses of 'CALL_BLOCK', 16 bits each and relative to the
+    // first action, with the latest one in the least significant bits.
+    uint256 _returnStack_;
+
+    // The byte count of the return data which 'RETURN_SLOTS' writes in memory
+    // from byte 384 onwards, or zero if there is none.
+    uint256 _returnDataSize_;
+
     // A loop over all of the actions.
     uint256 _pointer_ = 104;
     while (_pointer_ < endOfData) {
@@ -234,8 +261,40 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           value0 := shr(shl(3, length1), content)
         }
 
+        // Slots from 248 onwards are registers in memory '[128, 384)' which
+        // are cheaper than transient storage but do not outlive this call.
+        // The rest are transient storage slots which can be read back through
+        // 'transientAccess', e.g., by hooks or by a quoter.
+        //
+        // The registers are never cleared. A register which is read before
+        // it is written, e.g., the zero slot of the sequence builders, is
+        // zero only because every call to 'unlockCallback' starts with fresh
+        // memory and nothing else writes to '[128, 384)'. Hence, the calls
+        // keep their calldata from byte 384 onwards and this function must
+        // not allocate memory through Solidity, whose free memory pointer is
+        // left at 128.
+        function _getSlot(slot) -> value {
+          switch lt(slot, 248)
+          case 0 {
+            value := mload(shl(5, sub(slot, 244)))
+          }
+          default {
+            value := tload(slot)
+          }
+        }
+
+        function _setSlot(slot, value) {
+          switch lt(slot, 248)
+          case 0 {
+            mstore(shl(5, sub(slot, 244)), value)
+          }
+          default {
+            tstore(slot, value)
+          }
+        }
+
         function _verifyUnsigned(amountSlot) -> amount {
-          amount := tload(amountSlot)
+          amount := _getSlot(amountSlot)
           if slt(amount, 0) {
             _safeMathRevert()
           }
@@ -251,6 +310,29 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           revert(0, 4)
         }
 
+        // Returns the pointer to the action at 'destination', relative to the
+        // first action, which should be a 'JUMPDEST'.
+        function _jumpDestination(destination) -> pointer {
+          pointer := add(104, destination)
+          if iszero(eq(shr(248, calldataload(pointer)), 20)) {
+            _jumpDestinationRevert()
+          }
+        }
+
+        // The address table, if any, is the first action of 'data'. Its
+        // opcode is at byte 104 of calldata, followed by 'numberOfAddresses'
+        // and the addresses from byte 106 onwards, 20 bytes each.
+        function _address(reference) -> value {
+          let header := shr(240, calldataload(104))
+          if iszero(
+            and(eq(shr(8, header), 60), lt(reference, and(header, 0xFF)))
+          ) {
+            mstore(0, InvalidAddressReferenceSelector)
+            revert(0, 4)
+          }
+          value := shr(96, calldataload(add(106, mul(20, reference))))
+        }
+
         function _removeOffset(limitOffsetted, poolId) -> limit {
           limit := add(
             sub(limitOffsetted, shl(63, 1)),
@@ -258,11 +340,30 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           )
         }
         
+        // abi.encodePacked(
+        //    Action Action.ADDRESS_TABLE,
+        //    uint8 numberOfAddresses,
+        //    address address[0],
+        //    address address[1],
+        //    ...
+        // )
+        function _addressTable(pointer) -> nextPointer {
+          // The table is only allowed as the first action so that
+          // '_address' finds it at a fixed offset.
+          if iszero(eq(pointer, 105)) {
+            mstore(0, InvalidAddressTableSelector)
+            revert(0, 4)
+          }
+          let numberOfAddresses
+          numberOfAddresses, nextPointer := _load(1, pointer)
+          nextPointer := add(nextPointer, mul(20, numberOfAddresses))
+        }
+
         // abi.encodePacked(Action.PUSH0, uint8(valueSlot))
         function _push0(pointer) -> nextPointer {
           let valueSlot
           valueSlot, nextPointer := _load(1, pointer)
-          tstore(valueSlot, 0)
+          _setSlot(valueSlot, 0)
         }
 
         // abi.encodePacked(
@@ -274,7 +375,7 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           let content
           content, nextPointer := _load(11, pointer)
           let value, valueSlot := _decode2(1, content)
-          tstore(valueSlot, signextend(9, value))
+          _setSlot(valueSlot, signextend(9, value))
         }
 
         // abi.encodePacked(
@@ -286,7 +387,7 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           let content
           content, nextPointer := _load(17, pointer)
           let value, valueSlot := _decode2(1, content)
-          tstore(valueSlot, signextend(15, value))
+          _setSlot(valueSlot, signextend(15, value))
         }
 
         // abi.encodePacked(
@@ -298,7 +399,7 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           let value, valueSlot
           value, nextPointer := _load32(pointer)
           valueSlot, nextPointer := _load(1, nextPointer)
-          tstore(valueSlot, value)
+          _setSlot(valueSlot, value)
         }
 
         // abi.encodePacked(
@@ -310,13 +411,13 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           let content
           content, nextPointer := _load(2, pointer)
           let valueSlot, resultSlot := _decode2(1, content)
-          let value := tload(valueSlot)
+          let value := _getSlot(valueSlot)
 
           // Reverted if 'value == type(int256).min' which cannot be negated.
           if eq(value, shl(255, 1)) {
             _safeMathRevert()
           }
-          tstore(resultSlot, sub(0, value))
+          _setSlot(resultSlot, sub(0, value))
         }
 
         // abi.encodePacked(
@@ -329,8 +430,8 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           let content
           content, nextPointer := _load(3, pointer)
           let value0Slot, value1Slot, resultSlot := _decode3(1, 1, content)
-          let value0 := tload(value0Slot)
-          let value1 := tload(value1Slot)
+          let value0 := _getSlot(value0Slot)
+          let value1 := _getSlot(value1Slot)
           let result := add(value0, value1)
 
           // The following requirement is satisfied if and only if 'result'
@@ -346,7 +447,7 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           if iszero(eq(slt(value1, 0), slt(result, value0))) {
             _safeMathRevert()
           }
-          tstore(resultSlot, result)
+          _setSlot(resultSlot, result)
         }
 
         // abi.encodePacked(
@@ -359,8 +460,8 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           let content
           content, nextPointer := _load(3, pointer)
           let value0Slot, value1Slot, resultSlot := _decode3(1, 1, content)
-          let value0 := tload(value0Slot)
-          let value1 := tload(value1Slot)
+          let value0 := _getSlot(value0Slot)
+          let value1 := _getSlot(value1Slot)
           let result := sub(value0, value1)
 
           // The following requirement is satisfied if and only if 'result'
@@ -376,7 +477,7 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           if iszero(eq(sgt(value1, 0), slt(result, value0))) {
             _safeMathRevert()
           }
-          tstore(resultSlot, result)
+          _setSlot(resultSlot, result)
         }
 
         // abi.encodePacked(
@@ -389,10 +490,10 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           let content
           content, nextPointer := _load(3, pointer)
           let value0Slot, value1Slot, resultSlot := _decode3(1, 1, content)
-          let value0 := tload(value0Slot)
-          let value1 := tload(value1Slot)
+          let value0 := _getSlot(value0Slot)
+          let value1 := _getSlot(value1Slot)
 
-          tstore(
+          _setSlot(
             resultSlot,
             add(value0, mul(slt(value1, value0), sub(value1, value0)))
           )
@@ -408,10 +509,10 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           let content
           content, nextPointer := _load(3, pointer)
           let value0Slot, value1Slot, resultSlot := _decode3(1, 1, content)
-          let value0 := tload(value0Slot)
-          let value1 := tload(value1Slot)
+          let value0 := _getSlot(value0Slot)
+          let value1 := _getSlot(value1Slot)
 
-          tstore(
+          _setSlot(
             resultSlot,
             add(value0, mul(sgt(value1, value0), sub(value1, value0)))
           )
@@ -427,8 +528,8 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           let content
           content, nextPointer := _load(3, pointer)
           let value0Slot, value1Slot, resultSlot := _decode3(1, 1, content)
-          let value0 := tload(value0Slot)
-          let value1 := tload(value1Slot)
+          let value0 := _getSlot(value0Slot)
+          let value1 := _getSlot(value1Slot)
           let result := mul(value0, value1)
 
           if gt(value0, 0) {
@@ -436,7 +537,7 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
               _safeMathRevert()
             }
           }
-          tstore(resultSlot, result)
+          _setSlot(resultSlot, result)
         }
 
         function _safeDivision(value0, value1) {
@@ -460,11 +561,11 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           let content
           content, nextPointer := _load(3, pointer)
           let value0Slot, value1Slot, resultSlot := _decode3(1, 1, content)
-          let value0 := tload(value0Slot)
-          let value1 := tload(value1Slot)
+          let value0 := _getSlot(value0Slot)
+          let value1 := _getSlot(value1Slot)
 
           _safeDivision(value0, value1)
-          tstore(resultSlot, sdiv(value0, value1))
+          _setSlot(resultSlot, sdiv(value0, value1))
         }
 
         // abi.encodePacked(
@@ -477,11 +578,11 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           let content
           content, nextPointer := _load(3, pointer)
           let value0Slot, value1Slot, resultSlot := _decode3(1, 1, content)
-          let value0 := tload(value0Slot)
-          let value1 := tload(value1Slot)
+          let value0 := _getSlot(value0Slot)
+          let value1 := _getSlot(value1Slot)
 
           _safeDivision(value0, value1)
-          tstore(
+          _setSlot(
             resultSlot,
             sub(
               sdiv(value0, value1),
@@ -503,11 +604,11 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           let content
           content, nextPointer := _load(3, pointer)
           let value0Slot, value1Slot, resultSlot := _decode3(1, 1, content)
-          let value0 := tload(value0Slot)
-          let value1 := tload(value1Slot)
+          let value0 := _getSlot(value0Slot)
+          let value1 := _getSlot(value1Slot)
 
           _safeDivision(value0, value1)
-          tstore(
+          _setSlot(
             resultSlot,
             add(
               sdiv(value0, value1),
@@ -530,7 +631,7 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           content, nextPointer := _load(3, pointer)
           let value0Slot, value1Slot, resultSlot := _decode3(1, 1, content)
 
-          tstore(resultSlot, slt(tload(value0Slot), tload(value1Slot)))
+          _setSlot(resultSlot, slt(_getSlot(value0Slot), _getSlot(value1Slot)))
         }
 
         // abi.encodePacked(
@@ -544,7 +645,7 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           content, nextPointer := _load(3, pointer)
           let value0Slot, value1Slot, resultSlot := _decode3(1, 1, content)
 
-          tstore(resultSlot, eq(tload(value0Slot), tload(value1Slot)))
+          _setSlot(resultSlot, eq(_getSlot(value0Slot), _getSlot(value1Slot)))
         }
 
         // abi.encodePacked(
@@ -558,7 +659,10 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           content, nextPointer := _load(3, pointer)
           let value0Slot, value1Slot, resultSlot := _decode3(1, 1, content)
 
-          tstore(resultSlot, iszero(sgt(tload(value0Slot), tload(value1Slot))))
+          _setSlot(
+            resultSlot,
+            iszero(sgt(_getSlot(value0Slot), _getSlot(value1Slot)))
+          )
         }
 
         // abi.encodePacked(
@@ -571,7 +675,7 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           content, nextPointer := _load(2, pointer)
           let valueSlot, resultSlot := _decode2(1, content)
 
-          tstore(resultSlot, iszero(tload(valueSlot)))
+          _setSlot(resultSlot, iszero(_getSlot(valueSlot)))
         }
 
         // abi.encodePacked(
@@ -585,7 +689,7 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           content, nextPointer := _load(3, pointer)
           let value0Slot, value1Slot, resultSlot := _decode3(1, 1, content)
 
-          tstore(resultSlot, and(tload(value0Slot), tload(value1Slot)))
+          _setSlot(resultSlot, and(_getSlot(value0Slot), _getSlot(value1Slot)))
         }
 
         // abi.encodePacked(
@@ -599,7 +703,7 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           content, nextPointer := _load(3, pointer)
           let value0Slot, value1Slot, resultSlot := _decode3(1, 1, content)
 
-          tstore(resultSlot, or(tload(value0Slot), tload(value1Slot)))
+          _setSlot(resultSlot, or(_getSlot(value0Slot), _getSlot(value1Slot)))
         }
 
         // abi.encodePacked(
@@ -613,7 +717,7 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           content, nextPointer := _load(3, pointer)
           let value0Slot, value1Slot, resultSlot := _decode3(1, 1, content)
 
-          tstore(resultSlot, xor(tload(value0Slot), tload(value1Slot)))
+          _setSlot(resultSlot, xor(_getSlot(value0Slot), _getSlot(value1Slot)))
         }
 
         // abi.encodePacked(
@@ -625,15 +729,98 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           let content
           content, nextPointer := _load(3, pointer)
           let destination, conditionSlot := _decode2(1, content)
-          if tload(conditionSlot) {
-            destination := add(104, destination)
-            if iszero(eq(shr(248, calldataload(destination)), 20)) {
-              _jumpDestinationRevert()
+          if _getSlot(conditionSlot) {
+            nextPointer := _jumpDestination(destination)
+          }
+        }
+
+        // abi.encodePacked(
+        //    Action Action.CALL_BLOCK,
+        //    uint16 destination
+        // )
+        function _callBlock(
+          returnStack,
+          pointer
+        ) -> nextReturnStack, nextPointer {
+          let destination
+          destination, nextPointer := _load(2, pointer)
+          if shr(240, returnStack) {
+            mstore(0, ReturnStackOverflowSelector)
+            revert(0, 4)
+          }
+          let returnAddress := sub(nextPointer, 104)
+          if gt(returnAddress, 0xFFFF) {
+            _jumpDestinationRevert()
+          }
+          nextReturnStack := or(shl(16, returnStack), returnAddress)
+          nextPointer := _jumpDestination(destination)
+        }
+
+        // abi.encodePacked(Action Action.RETURN_BLOCK)
+        function _returnBlock(
+          returnStack,
+          endOfData
+        ) -> nextReturnStack, nextPointer {
+          // Return addresses are never zero, so an empty stack ends the
+          // sequence.
+          nextPointer := endOfData
+          let returnAddress := and(returnStack, 0xFFFF)
+          if returnAddress {
+            nextPointer := add(104, returnAddress)
+          }
+          nextReturnStack := shr(16, returnStack)
+        }
+
+        // abi.encodePacked(
+        //    Action Action.LOOP,
+        //    uint16 destination,
+        //    uint8 counterSlot
+        // )
+        function _loop(pointer) -> nextPointer {
+          let content
+          content, nextPointer := _load(3, pointer)
+          let destination, counterSlot := _decode2(1, content)
+          let counter := _verifyUnsigned(counterSlot)
+          if counter {
+            counter := sub(counter, 1)
+            _setSlot(counterSlot, counter)
+            if counter {
+              nextPointer := _jumpDestination(destination)
             }
-            nextPointer := destination
           }
         }
 
+        // abi.encodePacked(
+        //    Action Action.RETURN_SLOTS,
+        //    uint8 numberOfSlots,
+        //    uint8[] slots
+        // )
+        function _returnSlots(pointer) -> returnDataSize {
+          // The values of 'slots' are returned as 'bytes' which are passed
+          // back to the caller of 'nofeeswap.unlock'. Since the call buffers
+          // are no longer needed, the return data is written from byte 384:
+          //
+          // 384    416                448                480
+          //  |      |                  |                  |
+          //  +------+------------------+------------------+---
+          //  | 0x20 | 32*numberOfSlots | value(slots[0])  | ...
+          //  +------+------------------+------------------+---
+          //
+          let numberOfSlots
+          numberOfSlots, pointer := _load(1, pointer)
+          mstore(384, 0x20)
+          mstore(416, shl(5, numberOfSlots))
+          let end := add(pointer, numberOfSlots)
+          let output := 448
+          for {} lt(pointer, end) {} {
+            let slot
+            slot, pointer := _load(1, pointer)
+            mstore(output, _getSlot(slot))
+            output := add(output, 32)
+          }
+          returnDataSize := sub(output, 384)
+        }
+
         // abi.encodePacked(
         //    Action Action.READ_TRANSIENT_BALANCE,
         //    Tag tag,
@@ -686,7 +873,7 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           mstore(0, transientAccessSelector)
           mstore(4, transientSlot)
           pop(call(gas(), caller(), 0, 0, 36, 0, 32))
-          tstore(resultSlot, mload(0))
+          _setSlot(resultSlot, mload(0))
         }
 
         // abi.encodePacked(
@@ -701,10 +888,10 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
 
           switch eq(owner, address())
           case 0 {
-            tstore(resultSlot, balance(owner))
+            _setSlot(resultSlot, balance(owner))
           }
           case 1 {
-            tstore(resultSlot, selfbalance())
+            _setSlot(resultSlot, selfbalance())
           }
         }
 
@@ -737,8 +924,8 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           //
           mstore(0, balanceOfERC20Selector)
           mstore(4, owner)
-          tstore(successSlot, call(gas(), token, 0, 0, 36, 0, 32))
-          tstore(resultSlot, mload(0))
+          _setSlot(successSlot, call(gas(), token, 0, 0, 36, 0, 32))
+          _setSlot(resultSlot, mload(0))
         }
 
         // abi.encodePacked(
@@ -766,17 +953,20 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following 68 bytes of calldata are written in
           // memory.
           //
-          //   128                           132     164  196
+          //   384                           388     420  452
           //    |                             |       |    |
           //    +-----------------------------+-------+----+
           //    | balanceOfMultiTokenSelector | owner | id |
           //    +-----------------------------+-------+----+
           //
-          mstore(128, balanceOfMultiTokenSelector)
-          mstore(132, owner)
-          mstore(164, id)
-          tstore(successSlot, call(gas(), token, 0, 128, sub(196, 128), 0, 32))
-          tstore(resultSlot, mload(0))
+          mstore(384, balanceOfMultiTokenSelector)
+          mstore(388, owner)
+          mstore(420, id)
+          _setSlot(
+            successSlot,
+            call(gas(), token, 0, 384, sub(452, 384), 0, 32)
+          )
+          _setSlot(resultSlot, mload(0))
         }
 
         // abi.encodePacked(
@@ -803,17 +993,20 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following 68 bytes of calldata are written in
           // memory.
           //
-          //   128                      132     164       196
+          //   384                      388     420       452
           //    |                        |       |         |
           //    +------------------------+-------+---------+
           //    | allowanceERC20Selector | owner | spender |
           //    +------------------------+-------+---------+
           //
-          mstore(128, allowanceERC20Selector)
-          mstore(132, owner)
-          mstore(164, spender)
-          tstore(successSlot, call(gas(), token, 0, 128, sub(196, 128), 0, 32))
-          tstore(resultSlot, mload(0))
+          mstore(384, allowanceERC20Selector)
+          mstore(388, owner)
+          mstore(420, spender)
+          _setSlot(
+            successSlot,
+            call(gas(), token, 0, 384, sub(452, 384), 0, 32)
+          )
+          _setSlot(resultSlot, mload(0))
         }
 
         // abi.encodePacked(
@@ -839,18 +1032,18 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following 100 bytes of calldata are written in
           // memory.
           //
-          //   128                        132     164     196       228
+          //   384                        388     420     452       484
           //    |                          |       |       |         |
           //    +--------------------------+-------+-------+---------+
           //    | allowancePermit2Selector | owner | token | spender |
           //    +--------------------------+-------+-------+---------+
           //
-          mstore(128, allowancePermit2Selector)
-          mstore(132, owner)
-          mstore(164, token)
-          mstore(196, spender)
-          pop(call(gas(), _permit2, 0, 128, sub(228, 128), 0, 32))
-          tstore(resultSlot, mload(0))
+          mstore(384, allowancePermit2Selector)
+          mstore(388, owner)
+          mstore(420, token)
+          mstore(452, spender)
+          pop(call(gas(), _permit2, 0, 384, sub(484, 384), 0, 32))
+          _setSlot(resultSlot, mload(0))
         }
 
         // abi.encodePacked(
@@ -880,18 +1073,21 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following 100 bytes of calldata are written in
           // memory.
           //
-          //   128                        132     164       196  228
+          //   384                        388     420       452  484
           //    |                          |       |         |    |
           //    +--------------------------+-------+---------+----+
           //    | allowanceERC6909Selector | owner | spender | id |
           //    +--------------------------+-------+---------+----+
           //
-          mstore(128, allowanceERC6909Selector)
-          mstore(132, owner)
-          mstore(164, spender)
-          mstore(196, id)
-          tstore(successSlot, call(gas(), token, 0, 128, sub(228, 128), 0, 32))
-          tstore(resultSlot, mload(0))
+          mstore(384, allowanceERC6909Selector)
+          mstore(388, owner)
+          mstore(420, spender)
+          mstore(452, id)
+          _setSlot(
+            successSlot,
+            call(gas(), token, 0, 384, sub(484, 384), 0, 32)
+          )
+          _setSlot(resultSlot, mload(0))
         }
 
         // abi.encodePacked(
@@ -918,17 +1114,20 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following 68 bytes of calldata are written in
           // memory.
           //
-          //   128                         132     164       196
+          //   384                         388     420       452
           //    |                           |       |         |
           //    +---------------------------+-------+---------+
           //    | isOperatorERC6909Selector | owner | spender |
           //    +---------------------------+-------+---------+
           //
-          mstore(128, isOperatorERC6909Selector)
-          mstore(132, owner)
-          mstore(164, spender)
-          tstore(successSlot, call(gas(), token, 0, 128, sub(196, 128), 0, 32))
-          tstore(resultSlot, mload(0))
+          mstore(384, isOperatorERC6909Selector)
+          mstore(388, owner)
+          mstore(420, spender)
+          _setSlot(
+            successSlot,
+            call(gas(), token, 0, 384, sub(452, 384), 0, 32)
+          )
+          _setSlot(resultSlot, mload(0))
         }
 
         // abi.encodePacked(
@@ -955,17 +1154,20 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following 68 bytes of calldata are written in
           // memory.
           //
-          //   128                               132     164       196
+          //   384                               388     420       452
           //    |                                 |       |         |
           //    +---------------------------------+-------+---------+
           //    | isApprovedForAllERC1155Selector | owner | spender |
           //    +---------------------------------+-------+---------+
           //
-          mstore(128, isApprovedForAllERC1155Selector)
-          mstore(132, owner)
-          mstore(164, spender)
-          tstore(successSlot, call(gas(), token, 0, 128, sub(196, 128), 0, 32))
-          tstore(resultSlot, mload(0))
+          mstore(384, isApprovedForAllERC1155Selector)
+          mstore(388, owner)
+          mstore(420, spender)
+          _setSlot(
+            successSlot,
+            call(gas(), token, 0, 384, sub(452, 384), 0, 32)
+          )
+          _setSlot(resultSlot, mload(0))
         }
 
         // abi.encodePacked(
@@ -985,18 +1187,18 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           content, nextPointer := _load(22, nextPointer)
           let owner, value0Slot, value1Slot := _decode3(1, 1, content)
 
-          // We populate the first three memory slots from right to left:
+          // We populate three memory slots from right to left:
           //
-          // 128          160          192           212                 224
+          // 384          416          448           468                 480
           //  |            |            |             |                   |
           //  +------------+------------+-------------+-------------------+
           //  |    tag0    |    tag1    |    owner    | doubleBalanceSlot |
           //  +------------+------------+-------------+-------------------+
           //
-          mstore(192, doubleBalanceSlot) // 192 = 224 - 32
-          mstore(180, owner) // 180 = 212 - 32
-          mstore(160, tag1) // 160 = 192 - 32
-          mstore(128, tag0) // 128 = 160 - 32
+          mstore(448, doubleBalanceSlot) // 448 = 480 - 32
+          mstore(436, owner) // 436 = 468 - 32
+          mstore(416, tag1) // 416 = 448 - 32
+          mstore(384, tag0) // 384 = 416 - 32
 
           // The following lines invoke:
           //
@@ -1012,11 +1214,11 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           //    +-----------------------+-------------+
           //
           mstore(0, storageAccessSelector)
-          mstore(4, keccak256(128, 96))
+          mstore(4, keccak256(384, 96))
           pop(call(gas(), caller(), 0, 0, 36, 0, 32))
           let doubleBalance := mload(0)
-          tstore(value0Slot, and(doubleBalance, sub(shl(128, 1), 1)))
-          tstore(value1Slot, shr(128, doubleBalance))
+          _setSlot(value0Slot, and(doubleBalance, sub(shl(128, 1), 1)))
+          _setSlot(value1Slot, shr(128, doubleBalance))
         }
 
         // abi.encodePacked(
@@ -1043,7 +1245,7 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           //    +-----------------+
           //
           mstore(0, depositSelector)
-          tstore(
+          _setSlot(
             successSlot,
             call(gas(), _weth9, _verifyUnsigned(valueSlot), 0, 4, 0, 0)
           )
@@ -1074,7 +1276,7 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           //
           mstore(0, withdrawSelector)
           mstore(4, _verifyUnsigned(amountSlot))
-          tstore(successSlot, call(gas(), _weth9, 0, 0, 36, 0, 0))
+          _setSlot(successSlot, call(gas(), _weth9, 0, 0, 36, 0, 0))
         }
 
         // abi.encodePacked(
@@ -1111,63 +1313,63 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following bytes of calldata are written in
           // memory.
           //
-          // 128              132     164     196      228          260     292
+          // 384              388     420     452      484          516     548
           //  |                |       |       |        |            |       |
           //  +----------------+-------+-------+--------+------------+-------+
           //  | permitSelector | owner | token | amount | expiration | nonce |
           //  +----------------+-------+-------+--------+------------+-------+
           //
-          // 292       324                 356     388                  420
+          // 548       580                 612     644                  676
           //  |         |                   |       |                    |
           //  +---------+-------------------+-------+--------------------+
           //  | spender | signatureDeadline | 0x100 | signatureByteCount |
           //  +---------+-------------------+-------+--------------------+
           //
-          // 420
+          // 676
           //  |
           //  +-----------+
           //  | signature |
           //  +-----------+
           //
-          mstore(128, permitSelector)
-          mstore(356, 0x100)
+          mstore(384, permitSelector)
+          mstore(612, 0x100)
 
           let content
           {
             content, nextPointer := _load(27, pointer)
             let owner, nonce, amountSlot := _decode3(6, 1, content)
-            let amount := tload(amountSlot)
+            let amount := _getSlot(amountSlot)
             if gt(amount, 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF) {
               _safeMathRevert()
             }
-            mstore(132, owner)
-            mstore(196, amount)
-            mstore(260, nonce)
+            mstore(388, owner)
+            mstore(452, amount)
+            mstore(516, nonce)
           }
 
           {
             content, nextPointer := _load32(nextPointer)
             let token, expiration, signatureDeadline := _decode3(6, 6, content)
-            mstore(164, token)
-            mstore(228, expiration)
-            mstore(324, signatureDeadline)
+            mstore(420, token)
+            mstore(484, expiration)
+            mstore(580, signatureDeadline)
           }
 
           {
             content, nextPointer := _load(22, nextPointer)
             let spender, successSlot, signatureByteCount := 
               _decode3(1, 1, content)
-            mstore(292, spender)
-            mstore(388, signatureByteCount)
-            nextPointer := _copy(420, nextPointer, signatureByteCount)
-            tstore(
+            mstore(548, spender)
+            mstore(644, signatureByteCount)
+            nextPointer := _copy(676, nextPointer, signatureByteCount)
+            _setSlot(
               successSlot,
               call(
                 gas(),
                 _permit2,
                 0,
-                128,
-                add(sub(420, 128), signatureByteCount),
+                384,
+                add(sub(676, 384), signatureByteCount),
                 0,
                 0
               )
@@ -1250,31 +1452,31 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following bytes of calldata are written in
           // memory.
           //
-          // 128                   132     164    196
+          // 384                   388     420    452
           //  |                     |       |      |
           //  +---------------------+-------+------+
           //  | permitBatchSelector | owner | 0x60 |
           //  +---------------------+-------+------+
           //
-          // 196                               228    260       292
+          // 452                               484    516       548
           //  |                                 |      |         |
           //  +---------------------------------+------+---------+
           //  | 224 + 128 * numberOfPermissions | 0x60 | spender |
           //  +---------------------------------+------+---------+
           //
-          // 292           324                   356
+          // 548           580                   612
           //  |             |                     |
           //  +-------------+---------------------+
           //  | sigDeadline | numberOfPermissions |
           //  +-------------+---------------------+
           //
-          // 356        388         420             452        484
+          // 612        644         676             708        740
           //  |          |           |               |          |
           //  +----------+-----------+---------------+----------+
           //  | token[1] | amount[1] | expiration[1] | nonce[1] |
           //  +----------+-----------+---------------+----------+
           //
-          // 484        516         548             580        612
+          // 740        772         804             836        868
           //  |          |           |               |          |
           //  +----------+-----------+---------------+----------+
           //  | token[2] | amount[2] | expiration[2] | nonce[2] |
@@ -1284,21 +1486,21 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           //      .
           //      .
           //
-          // 228 + 128 * n                                     356 + 128 * n
+          // 484 + 128 * n                                     612 + 128 * n
           //  |                                                 |
           //  +----------+-----------+---------------+----------+
           //  | token[n] | amount[n] | expiration[n] | nonce[n] |
           //  +----------+-----------+---------------+----------+
           //
-          // 356 + 128 * n        388 + 128 * n
+          // 612 + 128 * n        644 + 128 * n
           //  |                    |
           //  +--------------------+-----------+
           //  | signatureByteCount | signature |
           //  +--------------------+-----------+
           //
-          mstore(128, permitBatchSelector)
-          mstore(164, 0x60)
-          mstore(228, 0x60)
+          mstore(384, permitBatchSelector)
+          mstore(420, 0x60)
+          mstore(484, 0x60)
 
           let content, signatureByteCount
           {
@@ -1306,8 +1508,8 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
             let owner, signatureDeadline
             owner, signatureDeadline, signatureByteCount := 
               _decode3(6, 1, content)
-            mstore(132, owner)
-            mstore(292, signatureDeadline)
+            mstore(388, owner)
+            mstore(548, signatureDeadline)
           }
 
           let successSlot, startSignatureMemory
@@ -1316,19 +1518,19 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
             let spender, numberOfPermissions
             spender, successSlot, numberOfPermissions := 
               _decode3(1, 1, content)
-            startSignatureMemory := add(356, shl(7, numberOfPermissions))
-            mstore(196, sub(startSignatureMemory, 132))
-            mstore(260, spender)
-            mstore(324, numberOfPermissions)
+            startSignatureMemory := add(612, shl(7, numberOfPermissions))
+            mstore(452, sub(startSignatureMemory, 388))
+            mstore(516, spender)
+            mstore(580, numberOfPermissions)
           }
 
-          let memoryPointer := 356
+          let memoryPointer := 612
           for {} lt(memoryPointer, startSignatureMemory) {} {
             content, nextPointer := _load32(nextPointer)
             {
               let token, amountSlot
               token, amountSlot, content := _decode3(1, 11, content)
-              let amount := tload(amountSlot)
+              let amount := _getSlot(amountSlot)
               if gt(amount, 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF) {
                 _safeMathRevert()
               }
@@ -1350,9 +1552,9 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           nextPointer := _copy(memoryPointer, nextPointer, signatureByteCount)
           memoryPointer := add(memoryPointer, signatureByteCount)
 
-          tstore(
+          _setSlot(
             successSlot,
-            call(gas(), _permit2, 0, 128, sub(memoryPointer, 128), 0, 0)
+            call(gas(), _permit2, 0, 384, sub(memoryPointer, 384), 0, 0)
           )
         }
 
@@ -1367,7 +1569,7 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           content, nextPointer := _load(22, pointer)
           let to, amountSlot, successSlot := _decode3(1, 1, content)
 
-          tstore(
+          _setSlot(
             successSlot,
             call(gas(), to, _verifyUnsigned(amountSlot), 0, 0, 0, 0)
           )
@@ -1387,7 +1589,37 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           let token, amountSlot := _decode2(1, content)
           content, nextPointer := _load(22, nextPointer)
           let to, successSlot, resultSlot := _decode3(1, 1, content)
+          _setSlot(
+            successSlot,
+            _transferFromERC20(payer, token, _verifyUnsigned(amountSlot), to)
+          )
+          _setSlot(resultSlot, mload(0))
+        }
+
+        // abi.encodePacked(
+        //    Action Action.TRANSFER_FROM_PAYER_ERC20_REF,
+        //    uint8 tokenRef,
+        //    uint8 amountSlot,
+        //    uint8 toRef,
+        //    uint8 successSlot,
+        //    uint8 resultSlot,
+        // )
+        function _transferFromPayerERC20Ref(payer, pointer) -> nextPointer {
+          let content
+          content, nextPointer := _load(5, pointer)
+          let tokenRef, amountSlot, toRef := _decode3(1, 1, shr(16, content))
+          let successSlot, resultSlot := _decode2(1, and(content, 0xFFFF))
+          let token := _address(tokenRef)
+          let to := _address(toRef)
+          _setSlot(
+            successSlot,
+            _transferFromERC20(payer, token, _verifyUnsigned(amountSlot), to)
+          )
+          _setSlot(resultSlot, mload(0))
+        }
 
+        // The returned value of 'transferFrom', if any, is left in 'mload(0)'.
+        function _transferFromERC20(payer, token, amount, to) -> success {
           // The following lines invoke:
           //
           //    'IERC20(token).transferFrom(payer, to, amount)'
@@ -1395,18 +1627,17 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following 100 bytes of calldata are written in
           // memory.
           //
-          //   128                         132     164  196      228
+          //   384                         388     420  452      484
           //    |                           |       |    |        |
           //    +---------------------------+-------+----+--------+
           //    | transferFromERC20Selector | payer | to | amount |
           //    +---------------------------+-------+----+--------+
           //
-          mstore(128, transferFromERC20Selector)
-          mstore(132, payer)
-          mstore(164, to)
-          mstore(196, _verifyUnsigned(amountSlot))
-          tstore(successSlot, call(gas(), token, 0, 128, sub(228, 128), 0, 32))
-          tstore(resultSlot, mload(0))
+          mstore(384, transferFromERC20Selector)
+          mstore(388, payer)
+          mstore(420, to)
+          mstore(452, amount)
+          success := call(gas(), token, 0, 384, sub(484, 384), 0, 32)
         }
 
         // abi.encodePacked(
@@ -1434,20 +1665,20 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following 100 bytes of calldata are written in
           // memory.
           //
-          //   128                           132     164  196      228     260
+          //   384                           388     420  452      484     516
           //    |                             |       |    |        |       |
           //    +-----------------------------+-------+----+--------+-------+
           //    | transferFromPermit2Selector | payer | to | amount | token |
           //    +-----------------------------+-------+----+--------+-------+
           //
-          mstore(128, transferFromPermit2Selector)
-          mstore(132, payer)
-          mstore(164, to)
-          mstore(196, _verifyUnsigned(amountSlot))
-          mstore(228, token)
-          tstore(
+          mstore(384, transferFromPermit2Selector)
+          mstore(388, payer)
+          mstore(420, to)
+          mstore(452, _verifyUnsigned(amountSlot))
+          mstore(484, token)
+          _setSlot(
             successSlot,
-            call(gas(), _permit2, 0, 128, sub(260, 128), 0, 0)
+            call(gas(), _permit2, 0, 384, sub(516, 384), 0, 0)
           )
         }
 
@@ -1478,19 +1709,22 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following 132 bytes of calldata are written in
           // memory.
           //
-          //   128                           132     164  196  228      260
+          //   384                           388     420  452  484      516
           //    |                             |       |    |    |        |
           //    +-----------------------------+-------+----+----+--------+
           //    | transferFromERC6909Selector | payer | to | id | amount |
           //    +-----------------------------+-------+----+----+--------+
           //
-          mstore(128, transferFromERC6909Selector)
-          mstore(132, payer)
-          mstore(164, to)
-          mstore(196, id)
-          mstore(228, _verifyUnsigned(amountSlot))
-          tstore(successSlot, call(gas(), token, 0, 128, sub(260, 128), 0, 32))
-          tstore(resultSlot, mload(0))
+          mstore(384, transferFromERC6909Selector)
+          mstore(388, payer)
+          mstore(420, to)
+          mstore(452, id)
+          mstore(484, _verifyUnsigned(amountSlot))
+          _setSlot(
+            successSlot,
+            call(gas(), token, 0, 384, sub(516, 384), 0, 32)
+          )
+          _setSlot(resultSlot, mload(0))
         }
 
         // abi.encodePacked(
@@ -1521,29 +1755,29 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following content is written in memory as
           // calldata.
           //
-          // 128                               132     164  196  228      260
+          // 384                               388     420  452  484      516
           //  |                                 |       |    |    |        |
           //  +---------------------------------+-------+----+----+--------+
           //  | safeTransferFromERC1155Selector | payer | to | id | amount |
           //  +---------------------------------+-------+----+----+--------+
           //
-          // 260    292             324
+          // 516    548             580
           //  |      |               |
           //  +------+---------------+------+
           //  | 0xA0 | dataByteCount | data |
           //  +------+---------------+------+
           //
-          mstore(128, safeTransferFromERC1155Selector)
-          mstore(132, payer)
-          mstore(164, to)
-          mstore(196, id)
-          mstore(228, _verifyUnsigned(amountSlot))
-          mstore(260, 0xA0) // ABI header for 'data'
-          mstore(292, dataByteCount)
-          nextPointer := _copy(324, nextPointer, dataByteCount)
-          tstore(
+          mstore(384, safeTransferFromERC1155Selector)
+          mstore(388, payer)
+          mstore(420, to)
+          mstore(452, id)
+          mstore(484, _verifyUnsigned(amountSlot))
+          mstore(516, 0xA0) // ABI header for 'data'
+          mstore(548, dataByteCount)
+          nextPointer := _copy(580, nextPointer, dataByteCount)
+          _setSlot(
             successSlot,
-            call(gas(), token, 0, 128, add(sub(324, 128), dataByteCount), 0, 0)
+            call(gas(), token, 0, 384, add(sub(580, 384), dataByteCount), 0, 0)
           )
         }
 
@@ -1567,18 +1801,18 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following 68 bytes of calldata are written in
           // memory.
           //
-          //   128             132   164      196
+          //   384             388   420      452
           //    |               |     |        |
           //    +---------------+-----+--------+
           //    | clearSelector | tag | amount |
           //    +---------------+-----+--------+
           //
-          mstore(128, clearSelector)
-          mstore(132, tag)
-          mstore(164, _verifyUnsigned(amountSlot))
-          tstore(
+          mstore(384, clearSelector)
+          mstore(388, tag)
+          mstore(420, _verifyUnsigned(amountSlot))
+          _setSlot(
             successSlot,
-            call(gas(), caller(), 0, 128, sub(196, 128), 0, 0)
+            call(gas(), caller(), 0, 384, sub(452, 384), 0, 0)
           )
         }
 
@@ -1595,7 +1829,27 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           let content
           content, nextPointer := _load(22, nextPointer)
           let to, amountSlot, successSlot := _decode3(1, 1, content)
+          _setSlot(successSlot, _take(token, to, _verifyUnsigned(amountSlot)))
+        }
 
+        // abi.encodePacked(
+        //    Action Action.TAKE_TOKEN_REF,
+        //    uint8 tokenRef,
+        //    uint8 toRef,
+        //    uint8 amountSlot,
+        //    uint8 successSlot
+        // )
+        function _takeTokenRef(pointer) -> nextPointer {
+          let content
+          content, nextPointer := _load(4, pointer)
+          let tokenRef, toRef := _decode2(1, shr(16, content))
+          let amountSlot, successSlot := _decode2(1, and(content, 0xFFFF))
+          let token := _address(tokenRef)
+          let to := _address(toRef)
+          _setSlot(successSlot, _take(token, to, _verifyUnsigned(amountSlot)))
+        }
+
+        function _take(token, to, amount) -> success {
           // The following lines invoke:
           //
           //    'INofeeswap(msg.sender).take(token, to, amount)'
@@ -1603,20 +1857,17 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following 100 bytes of calldata are written in
           // memory.
           //
-          //   128                 132     164  196      228
+          //   384                 388     420  452      484
           //    |                   |       |    |        |
           //    +-------------------+-------+----+--------+
           //    | takeTokenSelector | token | to | amount |
           //    +-------------------+-------+----+--------+
           //
-          mstore(128, takeTokenSelector)
-          mstore(132, token)
-          mstore(164, to)
-          mstore(196, _verifyUnsigned(amountSlot))
-          tstore(
-            successSlot,
-            call(gas(), caller(), 0, 128, sub(228, 128), 0, 0)
-          )
+          mstore(384, takeTokenSelector)
+          mstore(388, token)
+          mstore(420, to)
+          mstore(452, amount)
+          success := call(gas(), caller(), 0, 384, sub(484, 384), 0, 0)
         }
 
         // abi.encodePacked(
@@ -1643,20 +1894,20 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following 132 bytes of calldata are written in
           // memory.
           //
-          //   128                   132     164  196  228      260
+          //   384                   388     420  452  484      516
           //    |                     |       |    |    |        |
           //    +---------------------+-------+----+----+--------+
           //    | takeERC6909Selector | token | id | to | amount |
           //    +---------------------+-------+----+----+--------+
           //
-          mstore(128, takeERC6909Selector)
-          mstore(132, token)
-          mstore(164, id)
-          mstore(196, to)
-          mstore(228, _verifyUnsigned(amountSlot))
-          tstore(
+          mstore(384, takeERC6909Selector)
+          mstore(388, token)
+          mstore(420, id)
+          mstore(452, to)
+          mstore(484, _verifyUnsigned(amountSlot))
+          _setSlot(
             successSlot,
-            call(gas(), caller(), 0, 128, sub(260, 128), 0, 0)
+            call(gas(), caller(), 0, 384, sub(516, 384), 0, 0)
           )
         }
 
@@ -1688,34 +1939,34 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following content is written in memory as
           // calldata.
           //
-          //  128                   132     164  196  228      260    292
+          //  384                   388     420  452  484      516    548
           //   |                     |       |    |    |        |      |
           //   +---------------------+-------+----+----+--------+------+
           //   | takeERC1155Selector | token | id | to | amount | 0xA0 |
           //   +---------------------+-------+----+----+--------+------+
           //
-          //  292             324
+          //  548             580
           //   |               |
           //   +---------------+------+
           //   | dataByteCount | data |
           //   +---------------+------+
           //
-          mstore(128, takeERC1155Selector)
-          mstore(132, token)
-          mstore(164, id)
-          mstore(196, to)
-          mstore(228, _verifyUnsigned(amountSlot))
-          mstore(260, 0xA0) // ABI header for 'data'
-          mstore(292, dataByteCount)
-          nextPointer := _copy(324, nextPointer, dataByteCount)
-          tstore(
+          mstore(384, takeERC1155Selector)
+          mstore(388, token)
+          mstore(420, id)
+          mstore(452, to)
+          mstore(484, _verifyUnsigned(amountSlot))
+          mstore(516, 0xA0) // ABI header for 'data'
+          mstore(548, dataByteCount)
+          nextPointer := _copy(580, nextPointer, dataByteCount)
+          _setSlot(
             successSlot,
             call(
               gas(),
               caller(),
               0,
-              128,
-              add(sub(324, 128), dataByteCount),
+              384,
+              add(sub(580, 384), dataByteCount),
               0,
               0
             )
@@ -1729,7 +1980,20 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
         function _syncToken(pointer) -> nextPointer {
           let token
           token, nextPointer := _load(20, pointer)
+          _sync(token)
+        }
+
+        // abi.encodePacked(
+        //    Action Action.SYNC_TOKEN_REF,
+        //    uint8 tokenRef
+        // )
+        function _syncTokenRef(pointer) -> nextPointer {
+          let tokenRef
+          tokenRef, nextPointer := _load(1, pointer)
+          _sync(_address(tokenRef))
+        }
 
+        function _sync(token) {
           // The following lines invoke:
           //
           //    'INofeeswap(msg.sender).sync(token)'
@@ -1766,16 +2030,16 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following 68 bytes of calldata are written in
           // memory.
           //
-          //   128                      132     164  196
+          //   384                      388     420  452
           //    |                        |       |    |
           //    +------------------------+-------+----+
           //    | syncMultiTokenSelector | token | id |
           //    +------------------------+-------+----+
           //
-          mstore(128, syncMultiTokenSelector)
-          mstore(132, token)
-          mstore(164, id)
-          pop(call(gas(), caller(), 0, 128, sub(196, 128), 0, 0))
+          mstore(384, syncMultiTokenSelector)
+          mstore(388, token)
+          mstore(420, id)
+          pop(call(gas(), caller(), 0, 384, sub(452, 384), 0, 0))
         }
 
         // abi.encodePacked(
@@ -1803,11 +2067,66 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           //    +----------------+
           //
           mstore(0, settleSelector)
-          tstore(
+          _setSlot(
             successSlot,
             call(gas(), caller(), _verifyUnsigned(valueSlot), 0, 4, 0, 32)
           )
-          tstore(resultSlot, mload(0))
+          _setSlot(resultSlot, mload(0))
+        }
+
+        // abi.encodePacked(
+        //    Action Action.SETTLE_NET_ERC20,
+        //    address token,
+        //    uint8 amountSlot,
+        //    uint8 successSlot
+        // )
+        function _settleNetERC20(payer, pointer) -> nextPointer {
+          let token
+          token, nextPointer := _load(20, pointer)
+          let content
+          content, nextPointer := _load(2, nextPointer)
+          let amountSlot, successSlot := _decode2(1, content)
+          let amount := _getSlot(amountSlot)
+
+          // A zero amount is already settled.
+          let success := 1
+
+          // A negative amount is owed to 'payer' and is taken out of
+          // nofeeswap. Reverted if 'amount == type(int256).min' which cannot
+          // be negated.
+          if slt(amount, 0) {
+            if eq(amount, shl(255, 1)) {
+              _safeMathRevert()
+            }
+            success := _take(token, payer, sub(0, amount))
+          }
+
+          // A positive amount is owed by 'payer' and is paid by invoking:
+          //
+          //    'INofeeswap(msg.sender).sync(token)'
+          //    'IERC20(token).transferFrom(payer, msg.sender, amount)'
+          //    'INofeeswap(msg.sender).settle()'
+          //
+          // 'successSlot' receives the success of both the transfer and the
+          // settlement. A token which returns data succeeds only if it
+          // returns 'true'. 'settle' is skipped if the transfer fails, in
+          // which case nothing is paid.
+          if sgt(amount, 0) {
+            _sync(token)
+            success := _transferFromERC20(payer, token, amount, caller())
+            if returndatasize() {
+              success := and(
+                success,
+                and(gt(returndatasize(), 31), eq(mload(0), 1))
+              )
+            }
+            if success {
+              mstore(0, settleSelector)
+              success := call(gas(), caller(), 0, 0, 4, 0, 0)
+            }
+          }
+
+          _setSlot(successSlot, success)
         }
 
         // abi.encodePacked(
@@ -1836,26 +2155,26 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following 132 bytes of calldata are written in
           // memory.
           //
-          //   128                                    132     164        196
+          //   384                                    388     420        452
           //    |                                      |       |          |
           //    +--------------------------------------+-------+----------+
           //    | transferTransientBalanceFromSelector | payer | receiver |
           //    +--------------------------------------+-------+----------+
           //
-          //   196   228      260
+          //   452   484      516
           //    |     |        |
           //    +-----+--------+
           //    | tag | amount |
           //    +-----+--------+
           //
-          mstore(128, transferTransientBalanceFromSelector)
-          mstore(132, payer)
-          mstore(164, receiver)
-          mstore(196, tag)
-          mstore(228, _verifyUnsigned(amountSlot))
-          tstore(
+          mstore(384, transferTransientBalanceFromSelector)
+          mstore(388, payer)
+          mstore(420, receiver)
+          mstore(452, tag)
+          mstore(484, _verifyUnsigned(amountSlot))
+          _setSlot(
             successSlot,
-            call(gas(), caller(), 0, 128, sub(260, 128), 0, 0)
+            call(gas(), caller(), 0, 384, sub(516, 384), 0, 0)
           )
         }
 
@@ -1879,19 +2198,19 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following 100 bytes of calldata are written in
           // memory.
           //
-          //   128                           132     164   196      228
+          //   384                           388     420   452      484
           //    |                             |       |     |        |
           //    +-----------------------------+-------+-----+--------+
           //    | modifySingleBalanceSelector | payer | tag | amount |
           //    +-----------------------------+-------+-----+--------+
           //
-          mstore(128, modifySingleBalanceSelector)
-          mstore(132, payer)
-          mstore(164, tag)
-          mstore(196, tload(amountSlot))
-          tstore(
+          mstore(384, modifySingleBalanceSelector)
+          mstore(388, payer)
+          mstore(420, tag)
+          mstore(452, _getSlot(amountSlot))
+          _setSlot(
             successSlot,
-            call(gas(), caller(), 0, 128, sub(228, 128), 0, 0)
+            call(gas(), caller(), 0, 384, sub(484, 384), 0, 0)
           )
         }
 
@@ -1925,27 +2244,27 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following 164 bytes of calldata are written in
           // memory.
           //
-          // 128                           132     164    196    228       260
+          // 384                           388     420    452    484       516
           //  |                             |       |      |      |         |
           //  +-----------------------------+-------+------+------+---------+
           //  | modifyDoubleBalanceSelector | payer | tag0 | tag1 | amount0 |
           //  +-----------------------------+-------+------+------+---------+
           //
-          // 260       292
+          // 516       548
           //  |         |
           //  +---------+
           //  | amount1 |
           //  +---------+
           //
-          mstore(128, modifyDoubleBalanceSelector)
-          mstore(132, payer)
-          mstore(164, tag0)
-          mstore(196, tag1)
-          mstore(228, tload(amount0Slot))
-          mstore(260, tload(amount1Slot))
-          tstore(
+          mstore(384, modifyDoubleBalanceSelector)
+          mstore(388, payer)
+          mstore(420, tag0)
+          mstore(452, tag1)
+          mstore(484, _getSlot(amount0Slot))
+          mstore(516, _getSlot(amount1Slot))
+          _setSlot(
             successSlot,
-            call(gas(), caller(), 0, 128, sub(292, 128), 0, 0)
+            call(gas(), caller(), 0, 384, sub(548, 384), 0, 0)
           )
         }
 
@@ -1976,19 +2295,19 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following content is written in memory as
           // calldata.
           //
-          // 128            132      164               196     228          260
+          // 384            388      420               452     484          516
           //  |              |        |                 |       |            |
           //  +--------------+--------+-----------------+-------+------------+
           //  | swapSelector | poolId | amountSpecified | limit | zeroForOne |
           //  +--------------+--------+-----------------+-------+------------+
           //
-          // 260    292                  324
+          // 516    548                  580
           //  |      |                    |
           //  +------+--------------------+----------+
           //  | 0xA0 | hookDataBytesCount | hookData |
           //  +------+--------------------+----------+
           //
-          mstore(128, swapSelector)
+          mstore(384, swapSelector)
 
           let content
           {
@@ -1998,46 +2317,150 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
             let amountSpecifiedSlot, limitOffsetted
             amountSpecifiedSlot, limitOffsetted, content := 
               _decode3(8, 7, content)
-            mstore(132, poolId)
-            mstore(164, tload(amountSpecifiedSlot))
-            mstore(196, _removeOffset(limitOffsetted, poolId))
+            mstore(388, poolId)
+            mstore(420, _getSlot(amountSpecifiedSlot))
+            mstore(452, _removeOffset(limitOffsetted, poolId))
           }
 
           {
             let zeroForOne, crossThresholdSlot
             zeroForOne, crossThresholdSlot, content := _decode3(1, 5, content)
-            let crossThreshold := tload(crossThresholdSlot)
+            let crossThreshold := _getSlot(crossThresholdSlot)
             if gt(crossThreshold, 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF) {
               _safeMathRevert()
             }
-            mstore(228, or(shl(128, crossThreshold), zeroForOne))
+            mstore(484, or(shl(128, crossThreshold), zeroForOne))
           }
 
-          mstore(260, 0xA0) // ABI header for 'hookData'
+          mstore(516, 0xA0) // ABI header for 'hookData'
 
           {
             let successSlot, amount0Slot
             successSlot, amount0Slot, content := _decode3(1, 3, content)
             let amount1Slot, hookDataBytesCount := _decode2(2, content)
-            mstore(292, hookDataBytesCount)
-            nextPointer := _copy(324, nextPointer, hookDataBytesCount)
-            tstore(
+            mstore(548, hookDataBytesCount)
+            nextPointer := _copy(580, nextPointer, hookDataBytesCount)
+            _setSlot(
               successSlot,
               call(
                 gas(),
                 target,
                 0,
-                128,
-                add(sub(324, 128), hookDataBytesCount),
+                384,
+                add(sub(580, 384), hookDataBytesCount),
                 0,
                 64
               )
             )
-            tstore(amount0Slot, mload(0))
-            tstore(amount1Slot, mload(32))
+            _setSlot(amount0Slot, mload(0))
+            _setSlot(amount1Slot, mload(32))
           }
         }
 
+        // abi.encodePacked(
+        //    Action Action.SWAP_ROUTE,
+        //    uint8 amountSpecifiedSlot,
+        //    uint8 successSlot,
+        //    uint8 amountInSlot,
+        //    uint8 numberOfHops,
+        //    abi.encodePacked(
+        //      abi.encodePacked(
+        //        uint256 poolId[0],
+        //        uint64 limitOffsetted[0],
+        //        uint8 zeroForOne[0],
+        //        uint8 amountOutSlot[0]
+        //      ),
+        //
+        //      .
+        //      .
+        //      .
+        //
+        //      abi.encodePacked(
+        //        uint256 poolId[numberOfHops - 1],
+        //        uint64 limitOffsetted[numberOfHops - 1],
+        //        uint8 zeroForOne[numberOfHops - 1],
+        //        uint8 amountOutSlot[numberOfHops - 1]
+        //      )
+        //    )
+        // )
+        function _swapRoute(pointer) -> nextPointer {
+          // Every hop invokes:
+          //
+          //    'INofeeswap(msg.sender).swap(
+          //        poolId[k],
+          //        amountSpecified[k],
+          //        limit[k],
+          //        zeroForOne[k],
+          //        ""
+          //     )'.
+          //
+          // 'amountSpecified[0]' is read from 'amountSpecifiedSlot' and every
+          // other hop is given the outgoing amount of the previous hop as its
+          // exact input. The calldata is laid out as in '_swap' with empty
+          // 'hookData', and only 'poolId', 'amountSpecified', 'limit' and
+          // 'zeroForOne' are rewritten from one hop to the next.
+          //
+          // 516    548                  580
+          //  |      |                    |
+          //  +------+--------------------+
+          //  | 0xA0 |         0          |
+          //  +------+--------------------+
+          //
+          mstore(384, swapSelector)
+          mstore(516, 0xA0) // ABI header for 'hookData'
+          mstore(548, 0)
+
+          let content
+          content, nextPointer := _load(4, pointer)
+          let successSlot, amountInSlot, numberOfHops
+          content, amountInSlot, numberOfHops := _decode3(1, 1, content)
+          {
+            let amountSpecifiedSlot
+            amountSpecifiedSlot, successSlot := _decode2(1, content)
+            mstore(420, _getSlot(amountSpecifiedSlot))
+          }
+
+          // The route stops at the first hop that fails, whose amounts and
+          // those of the following hops are not written.
+          let end := add(nextPointer, mul(42, numberOfHops))
+          let success := 1
+          for {} lt(nextPointer, end) {} {
+            let poolId
+            poolId, nextPointer := _load32(nextPointer)
+            content, nextPointer := _load(10, nextPointer)
+            let limitOffsetted, zeroForOne, amountOutSlot := 
+              _decode3(1, 1, content)
+            mstore(388, poolId)
+            mstore(452, _removeOffset(limitOffsetted, poolId))
+            mstore(484, zeroForOne)
+            success := call(gas(), caller(), 0, 384, sub(580, 384), 0, 64)
+            if iszero(success) {
+              break
+            }
+
+            // The incoming amount is positive and the outgoing amount is
+            // negative, whichever the direction of the hop.
+            let incoming := mload(0)
+            let outgoing := mload(32)
+            if slt(incoming, outgoing) {
+              incoming := outgoing
+              outgoing := mload(0)
+            }
+
+            // A slot of zero means that the amount is not requested.
+            if amountInSlot {
+              _setSlot(amountInSlot, incoming)
+              amountInSlot := 0
+            }
+            if amountOutSlot {
+              _setSlot(amountOutSlot, outgoing)
+            }
+            mstore(420, sub(0, outgoing))
+          }
+          nextPointer := end
+          _setSlot(successSlot, success)
+        }
+
         // abi.encodePacked(
         //    Action Action.MODIFY_POSITION,
         //    uint256 poolId,
@@ -2078,49 +2501,49 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following content is written in memory as
           // calldata.
           //
-          // 128                132    164                        196
+          // 384                388    420                        452
           //  |                  |      |                          |
           //  +------------------+------+--------------------------+
           //  | dispatchSelector | 0x20 | 196 + hookDataBytesCount |
           //  +------------------+------+--------------------------+
           //
-          // 196                      200      232    264    296      328
+          // 452                      456      488    520    552      584
           //  |                        |        |      |      |        |
           //  +------------------------+--------+------+------+--------+
           //  | modifyPositionSelector | poolId | qMin | qMax | shares |
           //  +------------------------+--------+------+------+--------+
           //
-          // 328    360                  392
+          // 584    616                  648
           //  |      |                    |
           //  +------+--------------------+----------+
           //  | 0xA0 | hookDataBytesCount | hookData |
           //  +------+--------------------+----------+
           //
-          mstore(128, dispatchSelector)
-          mstore(132, 0x20)
-          mstore(164, add(196, hookDataBytesCount))
-          mstore(196, modifyPositionSelector)
-          mstore(200, poolId)
-          mstore(232, _removeOffset(qMinOffsetted, poolId))
-          mstore(264, _removeOffset(qMaxOffsetted, poolId))
-          mstore(296, tload(sharesSlot))
-          mstore(328, 0xA0)
-          mstore(360, hookDataBytesCount)
-          nextPointer := _copy(392, nextPointer, hookDataBytesCount)
-          tstore(
+          mstore(384, dispatchSelector)
+          mstore(388, 0x20)
+          mstore(420, add(196, hookDataBytesCount))
+          mstore(452, modifyPositionSelector)
+          mstore(456, poolId)
+          mstore(488, _removeOffset(qMinOffsetted, poolId))
+          mstore(520, _removeOffset(qMaxOffsetted, poolId))
+          mstore(552, _getSlot(sharesSlot))
+          mstore(584, 0xA0)
+          mstore(616, hookDataBytesCount)
+          nextPointer := _copy(648, nextPointer, hookDataBytesCount)
+          _setSlot(
             successSlot,
             call(
               gas(),
               caller(),
               0,
-              128,
-              add(sub(392, 128), hookDataBytesCount),
+              384,
+              add(sub(648, 384), hookDataBytesCount),
               0,
               64
             )
           )
-          tstore(amount0Slot, mload(0))
-          tstore(amount1Slot, mload(32))
+          _setSlot(amount0Slot, mload(0))
+          _setSlot(amount1Slot, mload(32))
         }
 
         // abi.encodePacked(
@@ -2157,47 +2580,47 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following content is written in memory as
           // calldata.
           //
-          // 128                132    164                        196
+          // 384                388    420                        452
           //  |                  |      |                          |
           //  +------------------+------+--------------------------+
           //  | dispatchSelector | 0x20 | 132 + hookDataBytesCount |
           //  +------------------+------+--------------------------+
           //
-          // 196              200      232      264    296                  328
+          // 452              456      488      520    552                  584
           //  |                |        |        |      |                    |
           //  +----------------+--------+--------+------+--------------------+
           //  | donateSelector | poolId | shares | 0x60 | hookDataBytesCount |
           //  +----------------+--------+--------+------+--------------------+
           //
-          // 328
+          // 584
           //  |
           //  +----------+
           //  | hookData |
           //  +----------+
           //
-          mstore(128, dispatchSelector)
-          mstore(132, 0x20)
-          mstore(164, add(132, hookDataBytesCount))
-          mstore(196, donateSelector)
-          mstore(200, poolId)
-          mstore(232, _verifyUnsigned(sharesSlot))
-          mstore(264, 0x60)
-          mstore(296, hookDataBytesCount)
-          nextPointer := _copy(328, nextPointer, hookDataBytesCount)
-          tstore(
+          mstore(384, dispatchSelector)
+          mstore(388, 0x20)
+          mstore(420, add(132, hookDataBytesCount))
+          mstore(452, donateSelector)
+          mstore(456, poolId)
+          mstore(488, _verifyUnsigned(sharesSlot))
+          mstore(520, 0x60)
+          mstore(552, hookDataBytesCount)
+          nextPointer := _copy(584, nextPointer, hookDataBytesCount)
+          _setSlot(
             successSlot,
             call(
               gas(),
               caller(),
               0,
-              128,
-              add(sub(328, 128), hookDataBytesCount),
+              384,
+              add(sub(584, 384), hookDataBytesCount),
               0,
               64
             )
           )
-          tstore(amount0Slot, mload(0))
-          tstore(amount1Slot, mload(32))
+          _setSlot(amount0Slot, mload(0))
+          _setSlot(amount1Slot, mload(32))
         }
 
         // abi.encodePacked(
@@ -2237,40 +2660,40 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following content is written in memory as
           // calldata.
           //
-          // 128                      132      164    196    228      260
+          // 384                      388      420    452    484      516
           //  |                        |        |      |      |        |
           //  +------------------------+--------+------+------+--------+
           //  | modifyPositionSelector | poolId | qMin | qMax | shares |
           //  +------------------------+--------+------+------+--------+
           //
-          // 260    292                  324
+          // 516    548                  580
           //  |      |                    |
           //  +------+--------------------+----------+
           //  | 0xA0 | hookDataBytesCount | hookData |
           //  +------+--------------------+----------+
           //
-          mstore(128, modifyPositionSelector)
-          mstore(132, poolId)
-          mstore(164, _removeOffset(qMinOffsetted, poolId))
-          mstore(196, _removeOffset(qMaxOffsetted, poolId))
-          mstore(228, tload(sharesSlot))
-          mstore(260, 0xA0)
-          mstore(292, hookDataBytesCount)
-          nextPointer := _copy(324, nextPointer, hookDataBytesCount)
-          tstore(
+          mstore(384, modifyPositionSelector)
+          mstore(388, poolId)
+          mstore(420, _removeOffset(qMinOffsetted, poolId))
+          mstore(452, _removeOffset(qMaxOffsetted, poolId))
+          mstore(484, _getSlot(sharesSlot))
+          mstore(516, 0xA0)
+          mstore(548, hookDataBytesCount)
+          nextPointer := _copy(580, nextPointer, hookDataBytesCount)
+          _setSlot(
             successSlot,
             call(
               gas(),
               quoter,
               0,
-              128,
-              add(sub(324, 128), hookDataBytesCount),
+              384,
+              add(sub(580, 384), hookDataBytesCount),
               0,
               64
             )
           )
-          tstore(amount0Slot, mload(0))
-          tstore(amount1Slot, mload(32))
+          _setSlot(amount0Slot, mload(0))
+          _setSlot(amount1Slot, mload(32))
         }
 
         // abi.encodePacked(
@@ -2304,38 +2727,38 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           // To this end, the following content is written in memory as
           // calldata.
           //
-          // 128              132      164      196    228                  260
+          // 384              388      420      452    484                  516
           //  |                |        |        |      |                    |
           //  +----------------+--------+--------+------+--------------------+
           //  | donateSelector | poolId | shares | 0x60 | hookDataBytesCount |
           //  +----------------+--------+--------+------+--------------------+
           //
-          // 260
+          // 516
           //  |
           //  +----------+
           //  | hookData |
           //  +----------+
           //
-          mstore(128, donateSelector)
-          mstore(132, poolId)
-          mstore(164, _verifyUnsigned(sharesSlot))
-          mstore(196, 0x60)
-          mstore(228, hookDataBytesCount)
-          nextPointer := _copy(260, nextPointer, hookDataBytesCount)
-          tstore(
+          mstore(384, donateSelector)
+          mstore(388, poolId)
+          mstore(420, _verifyUnsigned(sharesSlot))
+          mstore(452, 0x60)
+          mstore(484, hookDataBytesCount)
+          nextPointer := _copy(516, nextPointer, hookDataBytesCount)
+          _setSlot(
             successSlot,
             call(
               gas(),
               quoter,
               0,
-              128,
-              add(sub(260, 128), hookDataBytesCount),
+              384,
+              add(sub(516, 384), hookDataBytesCount),
               0,
               64
             )
           )
-          tstore(amount0Slot, mload(0))
-          tstore(amount1Slot, mload(32))
+          _setSlot(amount0Slot, mload(0))
+          _setSlot(amount1Slot, mload(32))
         }
 
         // abi.encodePacked(
@@ -2364,193 +2787,509 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           mstore(0, transientAccessSelector)
           mstore(4, transientSlot)
           pop(call(gas(), quoter, 0, 0, 36, 0, 32))
-          tstore(resultSlot, mload(0))
+          _setSlot(resultSlot, mload(0))
         }
 
         // The type of action is loaded from calldata.
         let action
         action, _pointer_ := _load(1, _pointer_)
-        switch action
-        case 1 {
-          _pointer_ := _push10(_pointer_)
-        }
-        case 4 {
-          _pointer_ := _neg(_pointer_)
-        }
-        case 52 {
-          _pointer_ := _swap(caller(), _pointer_)
-        }
-        case 13 {
-          _pointer_ := _lt(_pointer_)
-        }
-        case 16 {
-          _pointer_ := _iszero(_pointer_)
-        }
-        case 20 {
-          // jumpdest does nothing.
-        }
-        case 21 {
-          _pointer_ := _jump(_pointer_)
-        }
+        // The actions are dispatched by a binary decision tree over the low
+        // six bits of 'action', regardless of how common each opcode is. The
+        // first comparison, 'lt(action, 64)', separates the opcodes from 64
+        // onwards, which are the only ones that need to be checked against
+        // unknown opcodes. Hence, every opcode below 64 takes seven
+        // comparisons and the rest take at most five. 'REVERT' and unknown
+        // opcodes revert with the latest return data.
+        switch lt(action, 64)
         case 0 {
-          _pointer_ := _push0(_pointer_)
-        }
-        case 50 {
-          _pointer_ := _modifySingleBalance(_payer_, _pointer_)
-        }
-        case 51 {
-          _pointer_ := _modifyDoubleBalance(_payer_, _pointer_)
-        }
-        case 42 {
-          _pointer_ := _takeToken(_pointer_)
-        }        
-        case 45 {
-          _pointer_ := _syncToken(_pointer_)
-        }
-        case 47 {
-          _pointer_ := _settle(_pointer_)
-        }
-        case 37 {
-          _pointer_ := _transferFromPayerERC20(_payer_, _pointer_)
-        }
-        case 36 {
-          _pointer_ := _transferNative(_pointer_)
-        }
-        case 38 {
-          _pointer_ := _transferFromPayerPermit2(_permit2_, _payer_, _pointer_)
-        }
-        case 34 {
-          _pointer_ := _permitPermit2(_permit2_, _pointer_)
-        }
-        case 35 {
-          _pointer_ := _permitBatchPermit2(_permit2_, _pointer_)
-        }
-        case 41 {
-          _pointer_ := _clear(_pointer_)
-        }
-        case 32 {
-          _pointer_ := _wrapNative(_weth9_, _pointer_)
-        }
-        case 33 {
-          _pointer_ := _unwrapNative(_weth9_, _pointer_)
-        }
-        case 53 {
-          _pointer_ := _modifyPosition(_pointer_)
-        }
-        case 39 {
-          _pointer_ := _transferFromPayerERC6909(_payer_, _pointer_)
-        }
-        case 43 {
-          _pointer_ := _takeERC6909(_pointer_)
-        }
-        case 48 {
-          _pointer_ := _transferTransientBalanceFrom(address(), _pointer_)
-        }
-        case 49 {
-          _pointer_ := _transferTransientBalanceFrom(_payer_, _pointer_)
-        }
-        case 2 {
-          _pointer_ := _push16(_pointer_)
-        }
-        case 55 {
-          _pointer_ := _swap(_quoter_, _pointer_)
-        }
-        case 56 {
-          _pointer_ := _quoteModifyPosition(_quoter_, _pointer_)
-        }
-        case 5 {
-          _pointer_ := _add(_pointer_)
-        }
-        case 6 {
-          _pointer_ := _sub(_pointer_)
-        }
-        case 7 {
-          _pointer_ := _min(_pointer_)
-        }
-        case 8 {
-          _pointer_ := _max(_pointer_)
-        }
-        case 9 {
-          _pointer_ := _mul(_pointer_)
-        }
-        case 11 {
-          _pointer_ := _divRoundDown(_pointer_)
-        }
-        case 12 {
-          _pointer_ := _divRoundUp(_pointer_)
-        }
-        case 10 {
-          _pointer_ := _div(_pointer_)
-        }
-        case 22 {
-          _pointer_ := _readTransientBalance(_pointer_)
-        }
-        case 23 {
-          _pointer_ := _readBalanceOfNative(_pointer_)
-        }
-        case 24 {
-          _pointer_ := _readBalanceOfERC20(_pointer_)
-        }
-        case 31 {
-          _pointer_ := _readDoubleBalance(_pointer_)
-        }
-        case 26 {
-          _pointer_ := _readAllowanceERC20(_pointer_)
-        }
-        case 27 {
-          _pointer_ := _readAllowancePermit2(_permit2_, _pointer_)
-        }
-        case 25 {
-          _pointer_ := _readBalanceOfMultiToken(_pointer_)
-        }
-        case 28 {
-          _pointer_ := _readAllowanceERC6909(_pointer_)
-        }
-        case 29 {
-          _pointer_ := _readIsOperatorERC6909(_pointer_)
-        }
-        case 14 {
-          _pointer_ := _eq(_pointer_)
-        }
-        case 15 {
-          _pointer_ := _lteq(_pointer_)
-        }
-        case 17 {
-          _pointer_ := _and(_pointer_)
-        }
-        case 18 {
-          _pointer_ := _or(_pointer_)
-        }
-        case 19 {
-          _pointer_ := _xor(_pointer_)
-        }
-        case 54 {
-          _pointer_ := _donate(_pointer_)
-        }
-        case 57 {
-          _pointer_ := _quoteDonate(_quoter_, _pointer_)
-        }
-        case 58 {
-          _pointer_ := _quoterTransientAccess(_quoter_, _pointer_)
-        }
-        case 46 {
-          _pointer_ := _syncMultiToken(_pointer_)
-        }
-        case 40 {
-          _pointer_ := _safeTransferFromPayerERC1155(_payer_, _pointer_)
-        }
-        case 44 {
-          _pointer_ := _takeERC1155(_pointer_)
-        }
-        case 30 {
-          _pointer_ := _readIsApprovedForAllERC1155(_pointer_)
-        }
-        case 3 {
-          _pointer_ := _push32(_pointer_)
+          if gt(action, 69) {
+            returndatacopy(0, 0, returndatasize())
+            revert(0, returndatasize())
+          }
+          switch and(action, 4)
+          case 0 {
+            switch and(action, 2)
+            case 0 {
+              switch and(action, 1)
+              case 0 {
+                // SETTLE_NET_ERC20
+                _pointer_ := _settleNetERC20(_payer_, _pointer_)
+              }
+              default {
+                // SWAP_ROUTE
+                _pointer_ := _swapRoute(_pointer_)
+              }
+            }
+            default {
+              switch and(action, 1)
+              case 0 {
+                // CALL_BLOCK
+                _returnStack_, _pointer_ := _callBlock(_returnStack_, _pointer_)
+              }
+              default {
+                // RETURN_BLOCK
+                _returnStack_, _pointer_ :=
+                  _returnBlock(_returnStack_, endOfData)
+              }
+            }
+          }
+          default {
+            switch and(action, 1)
+            case 0 {
+              // LOOP
+              _pointer_ := _loop(_pointer_)
+            }
+            default {
+              // RETURN_SLOTS
+              _returnDataSize_ := _returnSlots(_pointer_)
+              _pointer_ := endOfData
+            }
+          }
         }
         default {
-          returndatacopy(0, 0, returndatasize())
-          revert(0, returndatasize())
+          switch and(action, 32)
+          case 0 {
+            switch and(action, 16)
+            case 0 {
+              switch and(action, 8)
+              case 0 {
+                switch and(action, 4)
+                case 0 {
+                  switch and(action, 2)
+                  case 0 {
+                    switch and(action, 1)
+                    case 0 {
+                      // PUSH0
+                      _pointer_ := _push0(_pointer_)
+                    }
+                    default {
+                      // PUSH10
+                      _pointer_ := _push10(_pointer_)
+                    }
+                  }
+                  default {
+                    switch and(action, 1)
+                    case 0 {
+                      // PUSH16
+                      _pointer_ := _push16(_pointer_)
+                    }
+                    default {
+                      // PUSH32
+                      _pointer_ := _push32(_pointer_)
+                    }
+                  }
+                }
+                default {
+                  switch and(action, 2)
+                  case 0 {
+                    switch and(action, 1)
+                    case 0 {
+                      // NEG
+                      _pointer_ := _neg(_pointer_)
+                    }
+                    default {
+                      // ADD
+                      _pointer_ := _add(_pointer_)
+                    }
+                  }
+                  default {
+                    switch and(action, 1)
+                    case 0 {
+                      // SUB
+                      _pointer_ := _sub(_pointer_)
+                    }
+                    default {
+                      // MIN
+                      _pointer_ := _min(_pointer_)
+                    }
+                  }
+                }
+              }
+              default {
+                switch and(action, 4)
+                case 0 {
+                  switch and(action, 2)
+                  case 0 {
+                    switch and(action, 1)
+                    case 0 {
+                      // MAX
+                      _pointer_ := _max(_pointer_)
+                    }
+                    default {
+                      // MUL
+                      _pointer_ := _mul(_pointer_)
+                    }
+                  }
+                  default {
+                    switch and(action, 1)
+                    case 0 {
+                      // DIV
+                      _pointer_ := _div(_pointer_)
+                    }
+                    default {
+                      // DIV_ROUND_DOWN
+                      _pointer_ := _divRoundDown(_pointer_)
+                    }
+                  }
+                }
+                default {
+                  switch and(action, 2)
+                  case 0 {
+                    switch and(action, 1)
+                    case 0 {
+                      // DIV_ROUND_UP
+                      _pointer_ := _divRoundUp(_pointer_)
+                    }
+                    default {
+                      // LT
+                      _pointer_ := _lt(_pointer_)
+                    }
+                  }
+                  default {
+                    switch and(action, 1)
+                    case 0 {
+                      // EQ
+                      _pointer_ := _eq(_pointer_)
+                    }
+                    default {
+                      // LTEQ
+                      _pointer_ := _lteq(_pointer_)
+                    }
+                  }
+                }
+              }
+            }
+            default {
+              switch and(action, 8)
+              case 0 {
+                switch and(action, 4)
+                case 0 {
+                  switch and(action, 2)
+                  case 0 {
+                    switch and(action, 1)
+                    case 0 {
+                      // ISZERO
+                      _pointer_ := _iszero(_pointer_)
+                    }
+                    default {
+                      // AND
+                      _pointer_ := _and(_pointer_)
+                    }
+                  }
+                  default {
+                    switch and(action, 1)
+                    case 0 {
+                      // OR
+                      _pointer_ := _or(_pointer_)
+                    }
+                    default {
+                      // XOR
+                      _pointer_ := _xor(_pointer_)
+                    }
+                  }
+                }
+                default {
+                  switch and(action, 2)
+                  case 0 {
+                    switch and(action, 1)
+                    case 0 {
+                      // JUMPDEST does nothing.
+                    }
+                    default {
+                      // JUMP
+                      _pointer_ := _jump(_pointer_)
+                    }
+                  }
+                  default {
+                    switch and(action, 1)
+                    case 0 {
+                      // READ_TRANSIENT_BALANCE
+                      _pointer_ := _readTransientBalance(_pointer_)
+                    }
+                    default {
+                      // READ_BALANCE_OF_NATIVE
+                      _pointer_ := _readBalanceOfNative(_pointer_)
+                    }
+                  }
+                }
+              }
+              default {
+                switch and(action, 4)
+                case 0 {
+                  switch and(action, 2)
+                  case 0 {
+                    switch and(action, 1)
+                    case 0 {
+                      // READ_BALANCE_OF_ERC20
+                      _pointer_ := _readBalanceOfERC20(_pointer_)
+                    }
+                    default {
+                      // READ_BALANCE_OF_MULTITOKEN
+                      _pointer_ := _readBalanceOfMultiToken(_pointer_)
+                    }
+                  }
+                  default {
+                    switch and(action, 1)
+                    case 0 {
+                      // READ_ALLOWANCE_ERC20
+                      _pointer_ := _readAllowanceERC20(_pointer_)
+                    }
+                    default {
+                      // READ_ALLOWANCE_PERMIT2
+                      _pointer_ := _readAllowancePermit2(_permit2_, _pointer_)
+                    }
+                  }
+                }
+                default {
+                  switch and(action, 2)
+                  case 0 {
+                    switch and(action, 1)
+                    case 0 {
+                      // READ_ALLOWANCE_ERC6909
+                      _pointer_ := _readAllowanceERC6909(_pointer_)
+                    }
+                    default {
+                      // READ_IS_OPERATOR_ERC6909
+                      _pointer_ := _readIsOperatorERC6909(_pointer_)
+                    }
+                  }
+                  default {
+                    switch and(action, 1)
+                    case 0 {
+                      // READ_IS_APPROVED_FOR_ALL_ERC1155
+                      _pointer_ := _readIsApprovedForAllERC1155(_pointer_)
+                    }
+                    default {
+                      // READ_DOUBLE_BALANCE
+                      _pointer_ := _readDoubleBalance(_pointer_)
+                    }
+                  }
+                }
+              }
+            }
+          }
+          default {
+            switch and(action, 16)
+            case 0 {
+              switch and(action, 8)
+              case 0 {
+                switch and(action, 4)
+                case 0 {
+                  switch and(action, 2)
+                  case 0 {
+                    switch and(action, 1)
+                    case 0 {
+                      // WRAP_NATIVE
+                      _pointer_ := _wrapNative(_weth9_, _pointer_)
+                    }
+                    default {
+                      // UNWRAP_NATIVE
+                      _pointer_ := _unwrapNative(_weth9_, _pointer_)
+                    }
+                  }
+                  default {
+                    switch and(action, 1)
+                    case 0 {
+                      // PERMIT_PERMIT2
+                      _pointer_ := _permitPermit2(_permit2_, _pointer_)
+                    }
+                    default {
+                      // PERMIT_BATCH_PERMIT2
+                      _pointer_ := _permitBatchPermit2(_permit2_, _pointer_)
+                    }
+                  }
+                }
+                default {
+                  switch and(action, 2)
+                  case 0 {
+                    switch and(action, 1)
+                    case 0 {
+                      // TRANSFER_NATIVE
+                      _pointer_ := _transferNative(_pointer_)
+                    }
+                    default {
+                      // TRANSFER_FROM_PAYER_ERC20
+                      _pointer_ := _transferFromPayerERC20(_payer_, _pointer_)
+                    }
+                  }
+                  default {
+                    switch and(action, 1)
+                    case 0 {
+                      // TRANSFER_FROM_PAYER_PERMIT2
+                      _pointer_ := _transferFromPayerPermit2(_permit2_, _payer_, _pointer_)
+                    }
+                    default {
+                      // TRANSFER_FROM_PAYER_ERC6909
+                      _pointer_ := _transferFromPayerERC6909(_payer_, _pointer_)
+                    }
+                  }
+                }
+              }
+              default {
+                switch and(action, 4)
+                case 0 {
+                  switch and(action, 2)
+                  case 0 {
+                    switch and(action, 1)
+                    case 0 {
+                      // SAFE_TRANSFER_FROM_PAYER_ERC1155
+                      _pointer_ := _safeTransferFromPayerERC1155(_payer_, _pointer_)
+                    }
+                    default {
+                      // CLEAR
+                      _pointer_ := _clear(_pointer_)
+                    }
+                  }
+                  default {
+                    switch and(action, 1)
+                    case 0 {
+                      // TAKE_TOKEN
+                      _pointer_ := _takeToken(_pointer_)
+                    }
+                    default {
+                      // TAKE_ERC6909
+                      _pointer_ := _takeERC6909(_pointer_)
+                    }
+                  }
+                }
+                default {
+                  switch and(action, 2)
+                  case 0 {
+                    switch and(action, 1)
+                    case 0 {
+                      // TAKE_ERC1155
+                      _pointer_ := _takeERC1155(_pointer_)
+                    }
+                    default {
+                      // SYNC_TOKEN
+                      _pointer_ := _syncToken(_pointer_)
+                    }
+                  }
+                  default {
+                    switch and(action, 1)
+                    case 0 {
+                      // SYNC_MULTITOKEN
+                      _pointer_ := _syncMultiToken(_pointer_)
+                    }
+                    default {
+                      // SETTLE
+                      _pointer_ := _settle(_pointer_)
+                    }
+                  }
+                }
+              }
+            }
+            default {
+              switch and(action, 8)
+              case 0 {
+                switch and(action, 4)
+                case 0 {
+                  switch and(action, 2)
+                  case 0 {
+                    switch and(action, 1)
+                    case 0 {
+                      // TRANSFER_TRANSIENT_BALANCE
+                      _pointer_ := _transferTransientBalanceFrom(address(), _pointer_)
+                    }
+                    default {
+                      // TRANSFER_TRANSIENT_BALANCE_FROM_PAYER
+                      _pointer_ := _transferTransientBalanceFrom(_payer_, _pointer_)
+                    }
+                  }
+                  default {
+                    switch and(action, 1)
+                    case 0 {
+                      // MODIFY_SINGLE_BALANCE
+                      _pointer_ := _modifySingleBalance(_payer_, _pointer_)
+                    }
+                    default {
+                      // MODIFY_DOUBLE_BALANCE
+                      _pointer_ := _modifyDoubleBalance(_payer_, _pointer_)
+                    }
+                  }
+                }
+                default {
+                  switch and(action, 2)
+                  case 0 {
+                    switch and(action, 1)
+                    case 0 {
+                      // SWAP
+                      _pointer_ := _swap(caller(), _pointer_)
+                    }
+                    default {
+                      // MODIFY_POSITION
+                      _pointer_ := _modifyPosition(_pointer_)
+                    }
+                  }
+                  default {
+                    switch and(action, 1)
+                    case 0 {
+                      // DONATE
+                      _pointer_ := _donate(_pointer_)
+                    }
+                    default {
+                      // QUOTE_SWAP
+                      _pointer_ := _swap(_quoter_, _pointer_)
+                    }
+                  }
+                }
+              }
+              default {
+                switch and(action, 4)
+                case 0 {
+                  switch and(action, 2)
+                  case 0 {
+                    switch and(action, 1)
+                    case 0 {
+                      // QUOTE_MODIFY_POSITION
+                      _pointer_ := _quoteModifyPosition(_quoter_, _pointer_)
+                    }
+                    default {
+                      // QUOTE_DONATE
+                      _pointer_ := _quoteDonate(_quoter_, _pointer_)
+                    }
+                  }
+                  default {
+                    switch and(action, 1)
+                    case 0 {
+                      // QUOTER_TRANSIENT_ACCESS
+                      _pointer_ := _quoterTransientAccess(_quoter_, _pointer_)
+                    }
+                    default {
+                      // REVERT
+                      returndatacopy(0, 0, returndatasize())
+                      revert(0, returndatasize())
+                    }
+                  }
+                }
+                default {
+                  switch and(action, 2)
+                  case 0 {
+                    switch and(action, 1)
+                    case 0 {
+                      // ADDRESS_TABLE
+                      _pointer_ := _addressTable(_pointer_)
+                    }
+                    default {
+                      // SYNC_TOKEN_REF
+                      _pointer_ := _syncTokenRef(_pointer_)
+                    }
+                  }
+                  default {
+                    switch and(action, 1)
+                    case 0 {
+                      // TRANSFER_FROM_PAYER_ERC20_REF
+                      _pointer_ := _transferFromPayerERC20Ref(_payer_, _pointer_)
+                    }
+                    default {
+                      // TAKE_TOKEN_REF
+                      _pointer_ := _takeTokenRef(_pointer_)
+                    }
+                  }
+                }
+              }
+            }
+          }
         }
       }
     }
@@ -2562,7 +3301,7 @@ contract Operator is IOperator, IUnlockCallback, TransientAccess {
           revert(0, returndatasize())
         }
       }
-      return(0, 0)
+      return(384, _returnDataSize_)
     }
   }
 
@@ -6,6 +6,12 @@ interface IOperator {
   /// @notice A sequence of compactly encoded instructions from the following
   /// list can be given to the operator contract to be executed in order.
   ///
+  /// Every 'uint8' slot below from 0 to 247 is a transient storage slot of the
+  /// operator which can be read back through 'transientAccess'. Slots from
+  /// 248 to 255 are registers in memory instead which are cheaper to access,
+  /// start at zero in every 'unlockCallback', and can only be read back
+  /// through 'RETURN_SLOTS'.
+  ///
   /// @param PUSH0 Clears a given transient storage slot of the operator. This
   /// action and its input should be encoded as follows:
   ///
@@ -1510,6 +1516,224 @@ interface IOperator {
   /// @param transientSlot The transient storage slot to be read.
   /// @param resultSlot The transient storage slot that will host 'result'.
   ///
+  ///
+  /// @param ADDRESS_TABLE Declares a table of addresses which the '_REF'
+  /// actions below refer to by their one-byte index, so that an address which
+  /// is repeated in 'data' is only encoded once. Throws unless this is the
+  /// first action of 'data'. This action and its inputs should be encoded as
+  /// follows:
+  ///
+  /// 'abi.encodePacked(
+  ///    Action Action.ADDRESS_TABLE,
+  ///    uint8 numberOfAddresses,
+  ///    address address[0],
+  ///    address address[1],
+  ///    ...
+  ///    address address[numberOfAddresses - 1]
+  ///  )'
+  ///
+  /// @param numberOfAddresses The number of addresses in the table.
+  ///
+  ///
+  /// @param SYNC_TOKEN_REF Same as 'SYNC_TOKEN' with 'token' being the
+  /// address at index 'tokenRef' of the address table. Throws if there is no
+  /// such address. This action should be encoded as follows:
+  ///
+  /// 'abi.encodePacked(Action Action.SYNC_TOKEN_REF, uint8 tokenRef)'
+  ///
+  ///
+  /// @param TRANSFER_FROM_PAYER_ERC20_REF Same as 'TRANSFER_FROM_PAYER_ERC20'
+  /// with 'token' and 'to' being the addresses at indices 'tokenRef' and
+  /// 'toRef' of the address table. Throws if there is no such address. This
+  /// action and its inputs should be encoded as follows:
+  ///
+  /// 'abi.encodePacked(
+  ///    Action Action.TRANSFER_FROM_PAYER_ERC20_REF,
+  ///    uint8 tokenRef,
+  ///    uint8 amountSlot,
+  ///    uint8 toRef,
+  ///    uint8 successSlot,
+  ///    uint8 resultSlot,
+  ///  )'
+  ///
+  ///
+  /// @param TAKE_TOKEN_REF Same as 'TAKE_TOKEN' with 'token' and 'to' being
+  /// the addresses at indices 'tokenRef' and 'toRef' of the address table.
+  /// Throws if there is no such address. This action and its inputs should be
+  /// encoded as follows:
+  ///
+  /// 'abi.encodePacked(
+  ///    Action Action.TAKE_TOKEN_REF,
+  ///    uint8 tokenRef,
+  ///    uint8 toRef,
+  ///    uint8 amountSlot,
+  ///    uint8 successSlot
+  ///  )'
+  ///
+  ///
+  /// @param SETTLE_NET_ERC20 Settles the signed 'amount' of an ERC-20 'token'
+  /// between the payer and nofeeswap, where 'amount := tload(amountSlot)' is
+  /// as returned by 'SWAP', 'MODIFY_POSITION' or 'DONATE'. If 'amount' is
+  /// negative, invokes:
+  ///
+  /// 'INofeeswap(nofeeswap).take(token, payer, -amount)'
+  ///
+  /// If 'amount' is positive, invokes:
+  ///
+  /// 'INofeeswap(nofeeswap).sync(token)'
+  /// 'IERC20(token).transferFrom(payer, nofeeswap, amount)'
+  /// 'INofeeswap(nofeeswap).settle()'
+  ///
+  /// and stores 'success' in the transient storage slot 'successSlot', which
+  /// is the success of the take, or of both the transfer and the settlement,
+  /// and is true if 'amount' is zero. If 'transferFrom' returns data, the
+  /// transfer succeeds only if it returns 'true'. 'settle' is not invoked if
+  /// the transfer fails. Throws if 'amount' is 'type(int256).min'. This action
+  /// and its inputs should be encoded as follows:
+  ///
+  /// 'abi.encodePacked(
+  ///    Action Action.SETTLE_NET_ERC20,
+  ///    address token,
+  ///    uint8 amountSlot,
+  ///    uint8 successSlot
+  ///  )'
+  ///
+  /// @param token The ERC-20 token to be settled.
+  /// @param amountSlot The transient storage slot hosting the signed amount
+  /// owed by the payer.
+  /// @return successSlot The transient storage slot which will host 'success'.
+  ///
+  ///
+  /// @param SWAP_ROUTE Performs a chain of swaps, where every hop 'k' invokes:
+  ///
+  /// 'INofeeswap(nofeeswap).swap(
+  ///    poolId[k],
+  ///    amountSpecified[k],
+  ///    limit[k],
+  ///    zeroForOne[k],
+  ///    ""
+  /// )'.
+  ///
+  /// where
+  ///
+  /// 'amountSpecified[0] := tload(amountSpecifiedSlot)'
+  /// 'amountSpecified[k] := -outgoing[k - 1]'
+  /// 'limit[k] := X59.wrap(int256(uint256(limitOffsetted[k]))) + 
+  ///              getLogOffsetFromPoolId(poolId[k]) - 
+  ///              sixteenX59'
+  ///
+  /// and 'outgoing[k]' is the negative amount returned by hop 'k', i.e., the
+  /// output of each hop is given to the next one as its exact input. The
+  /// incoming amount of the first hop and the outgoing amount of every hop
+  /// are stored in 'amountInSlot' and 'amountOutSlot[k]', respectively,
+  /// except for slots equal to zero which are not written. The route stops at
+  /// the first hop that fails and 'success' is stored in 'successSlot'. This
+  /// action and its inputs should be encoded as follows:
+  ///
+  /// 'abi.encodePacked(
+  ///    Action Action.SWAP_ROUTE,
+  ///    uint8 amountSpecifiedSlot,
+  ///    uint8 successSlot,
+  ///    uint8 amountInSlot,
+  ///    uint8 numberOfHops,
+  ///    abi.encodePacked(
+  ///      abi.encodePacked(
+  ///        uint256 poolId[0],
+  ///        uint64 limitOffsetted[0],
+  ///        uint8 zeroForOne[0],
+  ///        uint8 amountOutSlot[0]
+  ///      ),
+  ///
+  ///      .
+  ///      .
+  ///      .
+  ///
+  ///      abi.encodePacked(
+  ///        uint256 poolId[numberOfHops - 1],
+  ///        uint64 limitOffsetted[numberOfHops - 1],
+  ///        uint8 zeroForOne[numberOfHops - 1],
+  ///        uint8 amountOutSlot[numberOfHops - 1]
+  ///      )
+  ///    )
+  ///  )'
+  ///
+  /// If a hop does not consume all of its input, e.g., because its limit is
+  /// reached, the remainder is left as a balance of the payer in nofeeswap.
+  ///
+  /// @param amountSpecifiedSlot The transient storage slot hosting the amount
+  /// specified for the first hop, as in 'SWAP'.
+  /// @return successSlot The transient storage slot which will host 'success'.
+  /// @return amountInSlot The transient storage slot which will host the
+  /// amount given to the first pool.
+  /// @param numberOfHops The number of pools in the route.
+  /// @param poolId The pool identifier of each hop.
+  /// @param limitOffsetted The offsetted price limit of each hop, as in
+  /// 'SWAP'.
+  /// @param zeroForOne The direction of each hop, as in 'SWAP'.
+  /// @return amountOutSlot The transient storage slot which will host the
+  /// amount taken from each pool, which is negative.
+  ///
+  ///
+  /// @param CALL_BLOCK Pushes the byte after this action on the return stack
+  /// and jumps to the operation at byte 'destination', so that a block of
+  /// actions, e.g., the settlement of a token, can be encoded once and run
+  /// several times. The return stack holds up to 16 return addresses. Throws
+  /// if the return stack is full or if 'destination' refers to anything but a
+  /// 'JUMPDEST'. This action and its inputs should be encoded as follows:
+  ///
+  /// 'abi.encodePacked(
+  ///     Action Action.CALL_BLOCK,
+  ///     uint16 destination
+  ///  )'
+  ///
+  /// @param destination The start of the block which must be a 'JUMPDEST'.
+  ///
+  ///
+  /// @param RETURN_BLOCK Pops the latest return address from the return stack
+  /// and continues from there. If the return stack is empty, the sequence
+  /// ends, which allows the blocks to be placed after the main sequence.
+  /// Encoded as:
+  ///
+  /// 'abi.encodePacked(Action Action.RETURN_BLOCK)'
+  ///
+  ///
+  /// @param LOOP If 'tload(counterSlot)' is nonzero, decrements it and jumps
+  /// to the operation at byte 'destination' unless the decremented counter is
+  /// zero. A block which ends with 'LOOP' is therefore run 'counter' times,
+  /// and once if 'counter' is zero, since the counter is only checked after
+  /// the block. To skip the block for a zero counter, it should be preceded by
+  /// an 'ISZERO' of the counter and a 'JUMP' past the 'LOOP'. Throws if the
+  /// counter is negative or if 'destination' refers to anything but a
+  /// 'JUMPDEST'. This action and its inputs should be encoded as follows:
+  ///
+  /// 'abi.encodePacked(
+  ///     Action Action.LOOP,
+  ///     uint16 destination,
+  ///     uint8 counterSlot
+  ///  )'
+  ///
+  /// @param destination The start of the loop which must be a 'JUMPDEST'.
+  /// @param counterSlot The transient storage slot containing the counter.
+  ///
+  ///
+  /// @param RETURN_SLOTS Ends the sequence and returns the values of the given
+  /// slots as 'abi.encode(bytes)' from 'unlockCallback', which 'nofeeswap'
+  /// passes back to the caller of 'unlock'. The values are packed as 32-byte
+  /// words in the order of 'slots', so that the results of a sequence, e.g.,
+  /// the amounts of a swap, can be read through a single 'eth_call' without
+  /// sending a transaction. Registers may be returned as well. Without this
+  /// action, 'unlockCallback' returns nothing. This action and its inputs
+  /// should be encoded as follows:
+  ///
+  /// 'abi.encodePacked(
+  ///     Action Action.RETURN_SLOTS,
+  ///     uint8 numberOfSlots,
+  ///     uint8[] slots
+  ///  )'
+  ///
+  /// @param numberOfSlots The number of slots to be returned.
+  /// @param slots The slots whose values are returned.
+  ///
   enum Action {
     PUSH0,
     PUSH10,
@@ -1570,7 +1794,17 @@ interface IOperator {
     QUOTE_SWAP,
     QUOTE_MODIFY_POSITION,
     QUOTE_DONATE,
-    QUOTER_TRANSIENT_ACCESS
+    QUOTER_TRANSIENT_ACCESS,
+    ADDRESS_TABLE,
+    SYNC_TOKEN_REF,
+    TRANSFER_FROM_PAYER_ERC20_REF,
+    TAKE_TOKEN_REF,
+    SETTLE_NET_ERC20,
+    SWAP_ROUTE,
+    CALL_BLOCK,
+    RETURN_BLOCK,
+    LOOP,
+    RETURN_SLOTS
   }
 
   /// @notice Nofeeswap contract address.
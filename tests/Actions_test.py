@@ -0,0 +1,86 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+import pytest
+from eth_abi.packed import encode_packed
+from Nofee import logTest, Action, Swap, PermitBatchPermit2, Push32, Revert, SyncToken, classes, SWAP, REVERT
+
+token = '0x' + '1' * 40
+owner = '0x' + '2' * 40
+
+def test_classes(request, worker_id):
+    logTest(request, worker_id)
+
+    assert classes[SWAP] is Swap
+    assert Swap.opcode == SWAP
+    assert Swap.name == 'SWAP'
+    assert classes[REVERT] is Revert
+    assert all(cls.opcode == opcode for opcode, cls in classes.items())
+    # Byte counts are derived and so are not arguments.
+    assert 'hookDataBytesCount' not in Swap.arguments
+    with pytest.raises(AttributeError):
+        Push32(1, 2).other = 3
+
+def test_constructor(request, worker_id):
+    logTest(request, worker_id)
+
+    swap = Swap(1, 2, 3, 1, 4, 5, 6, 7, b'hook')
+    assert swap == Swap(
+        poolId = 1,
+        amountSpecifiedSlot = 2,
+        limitOffsetted = 3,
+        zeroForOne = 1,
+        crossThresholdSlot = 4,
+        successSlot = 5,
+        amount0Slot = 6,
+        amount1Slot = 7,
+        hookData = b'hook'
+    )
+    assert swap.hookDataBytesCount == 4
+    assert swap.fields['hookDataBytesCount'] == 4
+    assert swap != Swap(1, 2, 3, 1, 4, 5, 6, 7, b'')
+    assert repr(Push32(-1, 2)) == 'Push32(value=-1, valueSlot=2)'
+    with pytest.raises(TypeError, match = 'missing'):
+        Swap(1, 2)
+    with pytest.raises(TypeError, match = 'no field'):
+        Push32(1, 2, hookData = b'')
+    with pytest.raises(TypeError, match = 'takes'):
+        SyncToken(token, token)
+
+def test_bytes(request, worker_id):
+    logTest(request, worker_id)
+
+    swap = Swap(1, 2, 3, 1, 4, 5, 6, 7, b'hook')
+    data = swap.to_bytes()
+    assert data == encode_packed(*swap.packed())
+    assert len(swap) == len(data) == 53
+    assert Swap.from_bytes(data) == swap
+    assert Action.from_bytes(data) == swap
+
+    permit = PermitBatchPermit2(owner, 10, owner, 1, [(token, 2, 3, 4), (token, 5, 6, 7)], b'\x01' * 65)
+    data = permit.to_bytes()
+    assert permit.numberOfPermissions == 2
+    assert permit.signatureByteCount == 65
+    assert len(permit) == len(data)
+    assert Action.from_bytes(data) == permit
+
+    with pytest.raises(ValueError, match = 'Not a SWAP'):
+        Swap.from_bytes(Revert().to_bytes())
+    with pytest.raises(ValueError, match = 'Malformed'):
+        Action.from_bytes(data[:-1])
+    with pytest.raises(ValueError, match = 'Malformed'):
+        Action.from_bytes(data + b'\x00')
+
+def test_validate(request, worker_id):
+    logTest(request, worker_id)
+
+    assert Push32(1 << 254, 0).validate() == Push32(1 << 254, 0)
+    with pytest.raises(ValueError, match = 'Push32'):
+        Push32(1 << 255, 0).validate()
+    with pytest.raises(ValueError):
+        Push32(0, 256).validate()
+    with pytest.raises(ValueError, match = 'Invalid address'):
+        SyncToken(token[:-1]).validate()
+    # The byte count of 'hookData' is a 'uint16'.
+    with pytest.raises(ValueError):
+        Swap(1, 2, 3, 1, 4, 5, 6, 7, bytes(1 << 16)).validate()
+    with pytest.raises(ValueError, match = 'Invalid entry'):
+        PermitBatchPermit2(owner, 10, owner, 1, [(token, 2, 3)], b'').validate()
@@ -0,0 +1,280 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+import pytest
+from eth_abi.packed import encode_packed
+from Nofee import logTest, Assembler, Field, Template, Add, Swap, Revert, optimize, tabulate, offsetLimit, decodeActions, CALL_BLOCK, PUSH32, NEG, LT, ISZERO, JUMPDEST, JUMP, REVERT, SYNC_TOKEN, swapActions, collectActions, swapTemplate, swapFill
+
+deadline = 2 ** 32 - 1
+
+def test_forwardJump(request, worker_id):
+    logTest(request, worker_id)
+
+    assembler = Assembler()
+    assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, 1, 1])
+    assembler.jump('end', 1)
+    assembler.action(['uint8'], [REVERT])
+    assembler.label('end')
+
+    sequence = [0] * 4
+    sequence[0] = encode_packed(['uint8', 'int256', 'uint8'], [PUSH32, 1, 1])
+    sequence[2] = encode_packed(['uint8'], [REVERT])
+    sequence[3] = encode_packed(['uint8'], [JUMPDEST])
+    sequence[1] = encode_packed(['uint8', 'uint16', 'uint8'], [JUMP, len(sequence[0]) + 4 + len(sequence[2]), 1])
+
+    assert assembler.assemble(deadline) == encode_packed(['uint32'] + ['bytes'] * len(sequence), [deadline] + sequence)
+
+def test_backwardJump(request, worker_id):
+    logTest(request, worker_id)
+
+    assembler = Assembler()
+    assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, 1, 1])
+    assembler.label('loop')
+    assembler.action(['uint8', 'uint8', 'uint8'], [ISZERO, 1, 1])
+    assembler.jump('loop', 1)
+
+    sequence = [
+        encode_packed(['uint8', 'int256', 'uint8'], [PUSH32, 1, 1]),
+        encode_packed(['uint8'], [JUMPDEST]),
+        encode_packed(['uint8', 'uint8', 'uint8'], [ISZERO, 1, 1]),
+        encode_packed(['uint8', 'uint16', 'uint8'], [JUMP, 34, 1])
+    ]
+
+    assert assembler.assemble(deadline) == encode_packed(['uint32'] + ['bytes'] * len(sequence), [deadline] + sequence)
+    assert assembler.assemble(deadline) == assembler.assemble(deadline)
+
+def test_labelErrors(request, worker_id):
+    logTest(request, worker_id)
+
+    assembler = Assembler()
+    assembler.label('label')
+    with pytest.raises(ValueError):
+        assembler.label('label')
+
+    assembler.jump('missing', 1)
+    with pytest.raises(ValueError):
+        assembler.assemble(deadline)
+
+    assembler = Assembler()
+    assembler.action(['bytes'], [bytes(1 << 16)])
+    assembler.label('far')
+    assembler.jump('far', 1)
+    with pytest.raises(ValueError):
+        assembler.assemble(deadline)
+
+def test_slotReuse(request, worker_id):
+    logTest(request, worker_id)
+
+    assembler = Assembler()
+    a = assembler.slot()
+    b = assembler.slot()
+    c = assembler.slot()
+    assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, 1, a])
+    assembler.action(['uint8', 'uint8', 'uint8'], [NEG, a, b])
+    assembler.action(['uint8', 'uint8', 'uint8'], [NEG, b, c])
+    assembler.action(['uint8', 'uint8', 'uint8'], [ISZERO, c, c])
+
+    allocation = assembler.allocate()
+    assert allocation[a] != allocation[b]
+    assert allocation[b] != allocation[c]
+    assert allocation[a] == allocation[c]
+    assert len(set(allocation.values())) == 2
+
+def test_slotZero(request, worker_id):
+    logTest(request, worker_id)
+
+    assembler = Assembler().reserve(1)
+    a = assembler.slot()
+    assembler.action(['uint8', 'uint8', 'uint8', 'uint8'], [LT, assembler.zero, a, a])
+    b = assembler.slot()
+    assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, 1, b])
+    assembler.action(['uint8', 'uint8', 'uint8', 'uint8'], [LT, assembler.zero, b, b])
+
+    allocation = assembler.allocate()
+    assert 1 not in allocation.values()
+    assert allocation[assembler.zero] not in [allocation[a], allocation[b]]
+
+def test_slotLoop(request, worker_id):
+    logTest(request, worker_id)
+
+    assembler = Assembler()
+    a = assembler.slot()
+    b = assembler.slot()
+    c = assembler.slot()
+    assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, 1, a])
+    assembler.label('loop')
+    assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, 1, b])
+    assembler.action(['uint8', 'uint8', 'uint8'], [NEG, b, b])
+    assembler.action(['uint8', 'uint8', 'uint8'], [ISZERO, a, c])
+    assembler.jump('loop', c)
+
+    # 'a' is read in every iteration and 'b' is written in every iteration.
+    allocation = assembler.allocate()
+    assert len(set(allocation.values())) == 3
+
+def test_slotExhaustion(request, worker_id):
+    logTest(request, worker_id)
+
+    assembler = Assembler()
+    slots = [assembler.slot() for k in range(256)]
+    for slot in slots:
+        assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, 1, slot])
+    assembler.action(['uint8'] * 256, [ISZERO] + slots[:255])
+    with pytest.raises(ValueError):
+        assembler.assemble(deadline)
+
+def test_slotRegisters(request, worker_id):
+    logTest(request, worker_id)
+
+    assembler = Assembler().reserve(248)
+    a = assembler.slot()
+    registers = [assembler.register() for k in range(8)]
+    for slot in [a] + registers:
+        assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, 1, slot])
+    assembler.action(['uint8'] * 10, [ISZERO] + [a] + registers)
+    b = assembler.register()
+    assembler.action(['uint8', 'uint8', 'uint8'], [NEG, registers[0], b])
+
+    # Seven registers remain once 248 is reserved, so the last one spills to
+    # transient storage, and a register is reused once it is free again.
+    allocation = assembler.allocate()
+    assert allocation[a] < 248
+    assert sorted(allocation[slot] for slot in registers[:7]) == list(range(249, 256))
+    assert allocation[registers[7]] < 248
+    assert allocation[b] >= 249
+    assert allocation[b] != allocation[registers[0]]
+
+def test_blocks(request, worker_id):
+    logTest(request, worker_id)
+
+    # Swaps in many pools of the same pair, each of which is checked and
+    # added to the totals, either inline or by a shared block.
+    def batch(shared, pools):
+        assembler = Assembler()
+        amountSlot, successSlot, amount0Slot, amount1Slot, total0Slot, total1Slot = [assembler.register() for k in range(6)]
+        assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, 10, amountSlot])
+        for k in range(pools):
+            assembler.action(Swap(k, amountSlot, 1 << 63, 1, assembler.zero, successSlot, amount0Slot, amount1Slot, b''))
+            if shared:
+                assembler.call('check')
+            else:
+                assembler.jump(('checked', k), successSlot)
+                assembler.action(Revert())
+                assembler.label(('checked', k))
+                assembler.action(Add(total0Slot, amount0Slot, total0Slot))
+                assembler.action(Add(total1Slot, amount1Slot, total1Slot))
+        if shared:
+            assembler.ret()
+            assembler.label('check')
+            assembler.jump('checked', successSlot)
+            assembler.action(Revert())
+            assembler.label('checked')
+            assembler.action(Add(total0Slot, amount0Slot, total0Slot))
+            assembler.action(Add(total1Slot, amount1Slot, total1Slot))
+            assembler.ret()
+        return assembler
+
+    # Each pool takes the 3 bytes of a call instead of the 14 of the checks,
+    # at the cost of the 17 bytes of the block and the returns.
+    for pools in [5, 50]:
+        assert len(batch(False, pools)) - len(batch(True, pools)) == 11 * pools - 17
+
+    # The amounts are written in the main sequence and read in the block, so
+    # they are live across every call and are not shared with the totals.
+    assembler = batch(True, 3)
+    allocation = assembler.allocate()
+    assert len(set(allocation.values())) == len(allocation) == 7
+
+    # 'optimize' keeps the block and its calls.
+    deadline_, actions = decodeActions(optimize(assembler).assemble(deadline))
+    calls = [action for action in actions if action.opcode == CALL_BLOCK]
+    assert len(calls) == 3
+    assert len({action.destination for action in calls}) == 1
+
+def test_slotComposition(request, worker_id):
+    logTest(request, worker_id)
+
+    class Account:
+        def __init__(self, address):
+            self.address = address
+
+    nofeeswap, token0, token1, payer = [Account('0x' + str(k) * 40) for k in range(1, 5)]
+
+    assembler = Assembler()
+    swapActions(assembler, nofeeswap, token0, token1, payer, 1 << 188, 10, 0, 1, b'')
+    swapActions(assembler, nofeeswap, token0, token1, None, 1 << 188, -10, 0, 0, b'')
+    collectActions(assembler, token0, token1, 1, 2, payer, 3, 4)
+
+    ranges = assembler.liveRanges()
+    allocation = assembler.allocate()
+    for slot, (first, last) in ranges.items():
+        for other, (_first, _last) in ranges.items():
+            if slot is not other and first <= _last and _first <= last:
+                assert allocation[slot] != allocation[other]
+    assert len(set(allocation.values())) <= 16
+    assembler.assemble(deadline)
+
+def test_template(request, worker_id):
+    logTest(request, worker_id)
+
+    token = '0x' + '1' * 40
+    assembler = Assembler()
+    assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, Field('value', 1), 1])
+    assembler.jump('end', 1)
+    assembler.action(['uint8', 'uint16', 'bytes'], [JUMPDEST, 2, Field('data', b'ab')])
+    assembler.action(['uint8', 'address'], [SYNC_TOKEN, Field('token', token)])
+    assembler.label('end')
+    assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, Field('value', 1), 2])
+    template = Template(assembler, deadline)
+    assert template.data == assembler.assemble(deadline)
+
+    def rebuild(value, data, token):
+        assembler = Assembler()
+        assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, value, 1])
+        assembler.jump('end', 1)
+        assembler.action(['uint8', 'uint16', 'bytes'], [JUMPDEST, len(data), data])
+        assembler.action(['uint8', 'address'], [SYNC_TOKEN, token])
+        assembler.label('end')
+        assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, value, 2])
+        return assembler.assemble(deadline)
+
+    other = '0x' + '2' * 40
+    assert template.fill(value = -7) == rebuild(-7, b'ab', token)
+    assert template.fill(data = b'cd', token = other) == rebuild(1, b'cd', other)
+    assert template.fill(value = 3, data = b'longer data') == rebuild(3, b'longer data', token)
+    assert template.fill(data = b'') == rebuild(1, b'', token)
+    assert template.fill(deadline = 5)[:4] == (5).to_bytes(4, 'big')
+    # The template itself is left intact.
+    assert template.data == assembler.assemble(deadline)
+
+    with pytest.raises(ValueError, match = 'Byte count'):
+        template.fill(data = bytes(1 << 16))
+    with pytest.raises(ValueError, match = 'Jump destination'):
+        template.fill(data = bytes((1 << 16) - 1))
+
+def test_swapTemplate(request, worker_id):
+    logTest(request, worker_id)
+
+    class Account:
+        def __init__(self, address):
+            self.address = address
+
+    nofeeswap, token0, token1, payer = [Account('0x' + str(k) * 40) for k in range(1, 5)]
+
+    template = swapTemplate(nofeeswap, token0, token1, payer, deadline)
+    for poolId, amountSpecified, limit, zeroForOne, hookData in [
+        (1 << 188, -10, 0, 1, b''),
+        ((3 << 180) + 7, 1 << 200, - (1 << 70), 0, b'hook'),
+        ((255 << 180) + 1, - (1 << 255), 1 << 70, 2, bytes(range(200))),
+    ]:
+        assert swapFill(template, poolId, amountSpecified, limit, zeroForOne, hookData) == Template(tabulate(optimize(swapActions(
+            Assembler(),
+            nofeeswap,
+            token0,
+            token1,
+            payer,
+            Field('poolId', poolId),
+            Field('amountSpecified', amountSpecified),
+            Field('limit', offsetLimit(poolId, limit)),
+            Field('zeroForOne', zeroForOne),
+            Field('hookData', hookData)
+        ))), deadline).data
+
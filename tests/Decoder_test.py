@@ -0,0 +1,118 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+import pytest
+import io
+import random
+from eth_utils import to_checksum_address
+from Nofee import logTest, classes, Revert, Decoder, decodeActions, decodeStream, encodeActions, disassemble, fieldSize, JUMP, JUMPDEST, SWAP, PERMIT_BATCH_PERMIT2, swapSequence, mintSequence, burnSequence, donateSequence, collectSequence, routeSequence
+
+deadline = 2 ** 32 - 1
+
+class Account:
+    def __init__(self, address):
+        self.address = address
+
+nofeeswap, token0, token1, payer = [Account('0x' + str(k) * 40) for k in range(1, 5)]
+poolId = 1 << 188
+
+def randomValue(rng, type):
+    if type == 'address':
+        return to_checksum_address(rng.getrandbits(160).to_bytes(20, 'big'))
+    if type.startswith('bytes'):
+        return rng.getrandbits(8 * fieldSize(type)).to_bytes(fieldSize(type), 'big')
+    bits = 8 * fieldSize(type)
+    if type.startswith('int'):
+        return rng.randrange(- (1 << (bits - 1)), 1 << (bits - 1))
+    return rng.getrandbits(bits)
+
+def randomAction(rng, opcode):
+    cls = classes[opcode]
+    fields = {}
+    for field in cls.layout:
+        if field[0] in cls.counts:
+            fields[field[0]] = rng.randrange(0, 70)
+        elif len(field) == 2:
+            fields[field[0]] = randomValue(rng, field[1])
+        elif field[1] == 'bytes':
+            fields[field[0]] = bytes(rng.getrandbits(8) for k in range(fields[field[2]]))
+        else:
+            fields[field[0]] = [
+                tuple(randomValue(rng, type) for name, type in field[1]) for k in range(fields[field[2]])
+            ]
+    return cls(**{name: fields[name] for name in cls.arguments})
+
+@pytest.mark.parametrize('opcode', sorted(classes))
+def test_roundTrip(opcode, request, worker_id):
+    logTest(request, worker_id)
+
+    rng = random.Random(opcode)
+    actions = [randomAction(rng, opcode) for k in range(5)]
+    data = encodeActions(deadline, actions)
+    assert decodeActions(data) == (deadline, actions)
+    assert sum(len(action) for action in actions) == len(data) - 4
+    assert encodeActions(*decodeActions(data)) == data
+
+def test_sequences(request, worker_id):
+    logTest(request, worker_id)
+
+    for data in [
+        swapSequence(nofeeswap, token0, token1, payer, poolId, -10, 0, 1, b'hook', deadline),
+        mintSequence(nofeeswap, token0, token1, 1, poolId, 0, 100, 10, b'\x00' * 300, deadline),
+        burnSequence(token0, token1, payer, 1, poolId, 0, 100, 10, b'', deadline),
+        donateSequence(nofeeswap, token0, token1, poolId, 10, b'data', deadline),
+        collectSequence(token0, token1, 1, 2, payer, 3, 4, deadline),
+        routeSequence(nofeeswap, [token0, token1, token0], [(poolId, 0, 1), (poolId, 0, 0)], 10, deadline),
+    ]:
+        result, actions = decodeActions(data)
+        assert result == deadline
+        assert encodeActions(deadline, actions) == data
+        offsets = {action.offset for action in actions if action.opcode == JUMPDEST}
+        for action in actions:
+            if action.opcode == JUMP:
+                assert action.destination in offsets
+
+    data = swapSequence(nofeeswap, token0, token1, payer, poolId, -10, 0, 1, b'hook', deadline)
+    swap = [action for action in decodeActions(data)[1] if action.opcode == SWAP][0]
+    assert swap.poolId == poolId
+    assert swap.hookData == b'hook'
+
+@pytest.mark.parametrize('chunkSize', [1, 3, 64, 1 << 16])
+def test_stream(chunkSize, request, worker_id):
+    logTest(request, worker_id)
+
+    rng = random.Random(chunkSize)
+    actions = [randomAction(rng, rng.choice(sorted(classes))) for k in range(500)]
+    data = encodeActions(deadline, actions)
+
+    decoder = Decoder()
+    streamed = []
+    for k in range(0, len(data), chunkSize):
+        streamed += list(decoder.feed(data[k:k + chunkSize]))
+        assert len(decoder.buffer) < 1 << 17
+    decoder.close()
+    assert decoder.deadline == deadline
+    assert streamed == actions
+    assert [action.offset for action in streamed] == [sum(len(action) for action in actions[:k]) for k in range(len(actions))]
+
+    assert list(decodeStream(io.BytesIO(data), chunkSize)) == actions
+
+def test_malformed(request, worker_id):
+    logTest(request, worker_id)
+
+    data = encodeActions(deadline, [randomAction(random.Random(), PERMIT_BATCH_PERMIT2)])
+    with pytest.raises(ValueError, match = 'Truncated'):
+        decodeActions(data[:-1])
+    with pytest.raises(ValueError, match = 'Truncated'):
+        decodeActions(data[:3])
+    with pytest.raises(ValueError, match = 'Unknown opcode 70 at offset 1'):
+        decodeActions(encodeActions(deadline, [Revert()]) + bytes([70]))
+
+def test_disassemble(request, worker_id):
+    logTest(request, worker_id)
+
+    data = swapSequence(nofeeswap, token0, token1, payer, poolId, -10, 0, 1, b'hook', deadline)
+    lines = disassemble(data).split('\n')
+    assert lines[0] == 'deadline ' + str(deadline)
+    assert len(lines) == len(decodeActions(data)[1]) + 1
+    destinations = {line.split('destination=')[1][:4] for line in lines if ' JUMP ' in line}
+    assert destinations <= {line[:4] for line in lines if line.endswith(' JUMPDEST')}
+    assert any(' SWAP poolId=' + hex(poolId) in line and 'hookData=0x686f6f6b' in line for line in lines)
@@ -0,0 +1,109 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+import pytest
+from brownie import accounts, Nofeeswap, NofeeswapDelegatee, Operator, MockPayer, Deployer, MockQuoter
+from eth_abi import encode
+from Nofee import logTest, address0, classes, dispatched, depth, accesses, schedule, AddressTable, Push10, Jumpdest, CallBlock, ReturnBlock, PUSH10, PUSH16, PUSH32, DIV, DIV_ROUND_DOWN, DIV_ROUND_UP, REVERT, ADDRESS_TABLE, CALL_BLOCK, RETURN_BLOCK, RETURN_SLOTS
+
+@pytest.fixture(scope="module", autouse=True)
+def deployment(module_isolation):
+    root = accounts[0]
+    deployer = Deployer.deploy(root, {'from': root})
+    # 'permit2' and 'weth9' are left without code, so that calls to them
+    # succeed without any effect.
+    permit2 = deployer.addressOf(1)
+    weth9 = deployer.addressOf(2)
+    delegatee = deployer.addressOf(3)
+    nofeeswap = deployer.addressOf(4)
+    deployer.create3(
+        3,
+        NofeeswapDelegatee.bytecode + encode(
+            ['address'],
+            [nofeeswap]
+        ).hex(),
+        {'from': root}
+    )
+    deployer.create3(
+        4,
+        Nofeeswap.bytecode + encode(
+            ['address', 'address'],
+            [delegatee, root.address]
+        ).hex(),
+        {'from': root}
+    )
+    nofeeswap = Nofeeswap.at(nofeeswap)
+    payer = MockPayer.deploy({'from': root})
+    quoter = MockQuoter.deploy({'from': root})
+    operator = Operator.deploy(nofeeswap, permit2, weth9, quoter, {'from': root})
+
+    deadline = 2 ** 32 - 1
+
+    return nofeeswap, operator, payer, deadline
+
+def zeroAction(opcode):
+    # The action of 'opcode' with every field set to zero, except for the
+    # divisor of the divisions which is read from slot 1. None of these
+    # actions revert, as the calls they make only record their failure, and
+    # references resolve to the first address of the table.
+    cls = classes[opcode]
+    values = {}
+    for field in cls.layout:
+        if field[0] in cls.counts:
+            continue
+        if len(field) == 3:
+            values[field[0]] = b'' if field[1] == 'bytes' else []
+        elif field[1] == 'address':
+            values[field[0]] = address0
+        elif field[1].startswith('bytes'):
+            values[field[0]] = bytes(int(field[1][5:]))
+        else:
+            values[field[0]] = 0
+    if opcode in [DIV, DIV_ROUND_DOWN, DIV_ROUND_UP]:
+        values['value1Slot'] = 1
+    return cls(**values)
+
+def gasUsed(deployment, actions):
+    nofeeswap, operator, payer, deadline = deployment
+    data = deadline.to_bytes(4, 'big') + b''.join(action.to_bytes() for action in actions)
+    tx = payer.call(nofeeswap, 0, operator, [], nofeeswap.unlock.encode_input(operator, data))
+    calldata = bytes.fromhex(tx.input[2:])
+    return tx.gas_used - sum(4 if byte == 0 else 16 for byte in calldata)
+
+def marginalGas(deployment, opcode):
+    # The gas of the action on top of a minimal sequence, excluding calldata.
+    # The address table can only be the first action. 'CALL_BLOCK' needs a
+    # block to call, whose 'JUMPDEST' and 'RETURN_BLOCK' are counted as well.
+    prefix = [AddressTable([(address0,)]), Push10(1, 1)]
+    if opcode == ADDRESS_TABLE:
+        return gasUsed(deployment, prefix) - gasUsed(deployment, prefix[1:])
+    if opcode == CALL_BLOCK:
+        block = [Jumpdest(), ReturnBlock()]
+        destination = sum(len(action.to_bytes()) for action in prefix) + 3
+        return gasUsed(deployment, prefix + [CallBlock(destination)] + block) - gasUsed(deployment, prefix + block)
+    return gasUsed(deployment, prefix + [zeroAction(opcode)]) - gasUsed(deployment, prefix)
+
+def test_dispatch(deployment, request, worker_id):
+    logTest(request, worker_id)
+
+    # Every opcode is measured within this test, so that the comparisons
+    # below do not depend on how the tests are distributed among workers.
+    benchmark = {opcode: marginalGas(deployment, opcode) for opcode in dispatched if opcode != REVERT}
+    for opcode in sorted(benchmark):
+        print(classes[opcode].name, depth[opcode], benchmark[opcode])
+
+    # The pushes differ only in the width of the value. With the former
+    # linear 'switch', 'PUSH32' was 58 comparisons behind 'PUSH10'.
+    pushes = [benchmark[opcode] for opcode in [PUSH10, PUSH16, PUSH32]]
+    assert max(pushes) - min(pushes) < 50
+
+    # Across every opcode which touches no account, what is left after its
+    # slot accesses is the dispatch and the work of the action itself. The
+    # dispatch takes seven comparisons below 64 and fewer from 64 onwards,
+    # while the former linear 'switch' spread these opcodes over more than a
+    # thousand gas. The actions which end the sequence or call a block are
+    # excluded.
+    residuals = [
+        benchmark[opcode] - schedule['tload'] * accesses[opcode][0] - schedule['tstore'] * accesses[opcode][1]
+        for opcode in benchmark
+        if accesses[opcode][2] is None and opcode not in [ADDRESS_TABLE, CALL_BLOCK, RETURN_BLOCK, RETURN_SLOTS]
+    ]
+    assert max(residuals) - min(residuals) < 400
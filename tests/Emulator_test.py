@@ -0,0 +1,601 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+import pytest
+import random
+from eth_abi.packed import encode_packed
+from eth_utils import to_checksum_address
+from Nofee import logTest, Assembler, Push32, Add, SyncToken, classes, written, optimize, tabulate, AddressTable, SyncTokenRef, TakeTokenRef, SettleNetERC20, SwapRoute, ReturnSlots, Emulator, Mock, OperatorRevert, decodeResult, twosComplement, PUSH0, PUSH10, PUSH16, PUSH32, NEG, ADD, SUB, MIN, MAX, MUL, DIV, DIV_ROUND_DOWN, DIV_ROUND_UP, LT, EQ, LTEQ, ISZERO, AND, OR, XOR, JUMP, REVERT, TAKE_TOKEN, JUMPDEST, ADDRESS_TABLE, CALL_BLOCK, RETURN_BLOCK, LOOP, swapSequence, routeSequence, mintSequence, burnSequence, donateSequence, collectSequence, mintActions, swapTemplate, swapFill
+
+deadline = 2 ** 32 - 1
+
+nofeeswap = '0x' + '1' * 40
+operator = '0x' + '2' * 40
+payer = '0x' + '3' * 40
+token0 = '0x' + '4' * 40
+token1 = '0x' + '5' * 40
+
+class Account:
+    def __init__(self, address):
+        self.address = address
+
+class Recorder(Mock):
+    def __init__(self, results = {}):
+        self.calls = []
+        self.results = results
+
+    def call(self, target, signature, arguments, value):
+        self.calls += [(target, signature, arguments, value)]
+        return self.results.get(signature, (True, b''))
+
+def emulate(data, results = {}):
+    return Emulator(Recorder(results), nofeeswap, operator, payer).run(data)
+
+def sequence(*actions):
+    return encode_packed(['uint32'], [deadline]) + b''.join(encode_packed(types, values) for types, values in actions)
+
+def reference(opcode, value0, value1):
+    # Signed 256-bit semantics of the arithmetic actions or 'None' on revert.
+    if opcode == ADD:
+        result = value0 + value1
+    elif opcode == SUB:
+        result = value0 - value1
+    elif opcode == MUL:
+        # The overflow check of the operator, 'sdiv(result, value0) == value1',
+        # does not catch '-1 * type(int256).min' which wraps around.
+        if (value0, value1) == (-1, - (1 << 255)):
+            return value1
+        result = value0 * value1
+    elif opcode in [DIV, DIV_ROUND_DOWN, DIV_ROUND_UP]:
+        if value1 == 0:
+            return None
+        quotient = abs(value0) // abs(value1)
+        exact = quotient * abs(value1) == abs(value0)
+        if (value0 < 0) != (value1 < 0):
+            quotient = - quotient
+            if opcode == DIV_ROUND_DOWN and not exact:
+                quotient -= 1
+        elif opcode == DIV_ROUND_UP and not exact:
+            quotient += 1
+        result = quotient
+    elif opcode == MIN:
+        result = min(value0, value1)
+    elif opcode == MAX:
+        result = max(value0, value1)
+    elif opcode == LT:
+        result = int(value0 < value1)
+    elif opcode == EQ:
+        result = int(value0 == value1)
+    elif opcode == LTEQ:
+        result = int(value0 <= value1)
+    elif opcode == AND:
+        result = value0 & value1
+    elif opcode == OR:
+        result = value0 | value1
+    elif opcode == XOR:
+        result = value0 ^ value1
+    if not - (1 << 255) <= result < (1 << 255):
+        return None
+    return result
+
+edges = [0, 1, -1, 2, -2, 7, -7, (1 << 255) - 1, - (1 << 255), (1 << 128), - (1 << 128) - 3]
+
+@pytest.mark.parametrize('opcode', [ADD, SUB, MUL, DIV, DIV_ROUND_DOWN, DIV_ROUND_UP, MIN, MAX, LT, EQ, LTEQ, AND, OR, XOR])
+def test_arithmetic(opcode, request, worker_id):
+    logTest(request, worker_id)
+
+    generator = random.Random(opcode)
+    pairs = [(value0, value1) for value0 in edges for value1 in edges]
+    pairs += [(generator.randrange(- (1 << 255), 1 << 255), generator.randrange(- (1 << 130), 1 << 130)) for k in range(200)]
+    for value0, value1 in pairs:
+        data = sequence(
+            (['uint8', 'int256', 'uint8'], [PUSH32, value0, 1]),
+            (['uint8', 'int256', 'uint8'], [PUSH32, value1, 2]),
+            (['uint8', 'uint8', 'uint8', 'uint8'], [opcode, 1, 2, 3]),
+        )
+        expected = reference(opcode, value0, value1)
+        if expected is None:
+            with pytest.raises(OperatorRevert) as error:
+                emulate(data)
+            assert error.value.reason == 'SafeMathError'
+        else:
+            assert emulate(data).tload(3) == twosComplement(expected)
+
+@pytest.mark.parametrize('value', edges)
+def test_unary(value, request, worker_id):
+    logTest(request, worker_id)
+
+    data = sequence(
+        (['uint8', 'int256', 'uint8'], [PUSH32, value, 1]),
+        (['uint8', 'uint8', 'uint8'], [ISZERO, 1, 2]),
+        (['uint8', 'uint8', 'uint8'], [NEG, 1, 3]),
+    )
+    if value == - (1 << 255):
+        with pytest.raises(OperatorRevert):
+            emulate(data)
+    else:
+        emulator = emulate(data)
+        assert emulator.tload(2) == int(value == 0)
+        assert emulator.tload(3) == twosComplement(- value)
+
+def test_push(request, worker_id):
+    logTest(request, worker_id)
+
+    emulator = emulate(sequence(
+        (['uint8', 'int80', 'uint8'], [PUSH10, - (1 << 79), 1]),
+        (['uint8', 'int128', 'uint8'], [PUSH16, (1 << 127) - 1, 2]),
+        (['uint8', 'int256', 'uint8'], [PUSH32, -1, 3]),
+        (['uint8', 'uint8'], [PUSH0, 3]),
+    ))
+    assert emulator.slots == {1: twosComplement(- (1 << 79)), 2: (1 << 127) - 1, 3: 0}
+
+def test_registers(request, worker_id):
+    logTest(request, worker_id)
+
+    emulator = emulate(sequence(
+        (['uint8', 'int256', 'uint8'], [PUSH32, 7, 1]),
+        (['uint8', 'int256', 'uint8'], [PUSH32, 8, 255]),
+        (['uint8', 'uint8', 'uint8', 'uint8'], [ADD, 1, 255, 248]),
+    ))
+    assert emulator.slots == {1: 7}
+    assert emulator.tload(248) == 15
+    # Registers start from zero in every run while transient slots persist.
+    emulator.run(sequence((['uint8', 'uint8', 'uint8', 'uint8'], [ADD, 1, 248, 2])))
+    assert emulator.slots == {1: 7, 2: 7}
+    assert emulator.registers == {}
+
+def test_jump(request, worker_id):
+    logTest(request, worker_id)
+
+    # Counts down from 5 to 0 in a loop.
+    assembler = Assembler().reserve(1, 2, 3)
+    assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, 5, 1])
+    assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, 1, 2])
+    assembler.label('loop')
+    assembler.action(['uint8', 'uint8', 'uint8', 'uint8'], [SUB, 1, 2, 1])
+    assembler.action(['uint8', 'uint8', 'uint8', 'uint8'], [ADD, 3, 2, 3])
+    assembler.jump('loop', 1)
+    emulator = emulate(assembler.assemble(deadline))
+    assert (emulator.tload(1), emulator.tload(3)) == (0, 5)
+
+    data = sequence(
+        (['uint8', 'int256', 'uint8'], [PUSH32, 1, 1]),
+        (['uint8', 'uint16', 'uint8'], [JUMP, 0, 1]),
+    )
+    with pytest.raises(OperatorRevert) as error:
+        emulate(data)
+    assert error.value.reason == 'InvalidJumpDestination'
+
+def test_blocks(request, worker_id):
+    logTest(request, worker_id)
+
+    # The block adds slot 1 to slot 2 and is called twice. The final 'ret'
+    # ends the main sequence.
+    assembler = Assembler().reserve(1, 2, 3)
+    assembler.action(Push32(3, 1))
+    assembler.call('add')
+    assembler.call('add')
+    assembler.action(Push32(1, 3))
+    assembler.ret()
+    assembler.label('add')
+    assembler.action(Add(1, 2, 2))
+    assembler.ret()
+    emulator = emulate(assembler.assemble(deadline))
+    assert emulator.slots == {1: 3, 2: 6, 3: 1}
+
+    # A block which calls itself overflows the return stack of 16.
+    assembler = Assembler().reserve(1)
+    assembler.action(Push32(1, 1))
+    assembler.label('self')
+    assembler.action(Add(1, 1, 1))
+    assembler.call('self')
+    with pytest.raises(OperatorRevert) as error:
+        emulate(assembler.assemble(deadline))
+    assert error.value.reason == 'ReturnStackOverflow'
+
+    with pytest.raises(OperatorRevert) as error:
+        emulate(sequence((['uint8', 'uint16'], [CALL_BLOCK, 0])))
+    assert error.value.reason == 'InvalidJumpDestination'
+
+@pytest.mark.parametrize('counter', [0, 1, 5])
+def test_loop(counter, request, worker_id):
+    logTest(request, worker_id)
+
+    # The body runs 'counter' times, and at least once without the check of
+    # 'Assembler.loop' on entry.
+    for guarded in [True, False]:
+        assembler = Assembler().reserve(1, 2, 3)
+        assembler.action(Push32(counter, 1))
+        if guarded:
+            assembler.loop('body', 1)
+        else:
+            assembler.label('body')
+        assembler.action(Push32(1, 3))
+        assembler.action(Add(2, 3, 2))
+        if guarded:
+            assembler.endLoop('body')
+        else:
+            assembler.branch(['uint8', 'uint16', 'uint8'], [LOOP, 0, 1], 'body')
+        emulator = emulate(assembler.assemble(deadline))
+        assert (emulator.tload(1), emulator.tload(2)) == (0, counter if guarded else max(counter, 1))
+
+    with pytest.raises(OperatorRevert) as error:
+        emulate(sequence((['uint8', 'int256', 'uint8'], [PUSH32, -1, 1]), (['uint8', 'uint16', 'uint8'], [LOOP, 0, 1])))
+    assert error.value.reason == 'SafeMathError'
+
+def test_revert(request, worker_id):
+    logTest(request, worker_id)
+
+    emulator = Emulator(Recorder({'take(address,address,uint256)': (False, b'reason')}), nofeeswap, operator, payer)
+    emulator.run(sequence((['uint8', 'int256', 'uint8'], [PUSH32, 1, 1])))
+    data = sequence(
+        (['uint8', 'int256', 'uint8'], [PUSH32, 2, 1]),
+        (['uint8', 'address', 'address', 'uint8', 'uint8'], [TAKE_TOKEN, token0, payer, 1, 2]),
+        (['uint8'], [REVERT]),
+    )
+    with pytest.raises(OperatorRevert) as error:
+        emulator.run(data)
+    assert (error.value.reason, error.value.data) == ('Revert', b'reason')
+    assert emulator.slots == {1: 1}
+
+    with pytest.raises(OperatorRevert) as error:
+        emulator.run(encode_packed(['uint32'], [10]), timestamp = 11)
+    assert error.value.reason == 'DeadlinePassed'
+
+def test_swapSequence(request, worker_id):
+    logTest(request, worker_id)
+
+    # With the caller of 'nofeeswap.unlock' as 'payer', the explicit and the
+    # net settlements make the same calls.
+    for amount0, amount1, settler in [(100, -90, Account(payer)), (-90, 100, Account(payer)), (100, -90, None), (-90, 100, None)]:
+        mock = Recorder({'swap(uint256,int256,int256,uint256,bytes)': (True, Mock.words(amount0, amount1))})
+        emulator = Emulator(mock, nofeeswap, operator, payer)
+        poolId = (3 << 180) + 7
+        emulator.run(swapSequence(Account(nofeeswap), Account(token0), Account(token1), settler, poolId, 100, -5, 1, b'hook', deadline))
+
+        assert mock.calls[0] == (emulator.nofeeswap, 'swap(uint256,int256,int256,uint256,bytes)', (poolId, 100, -5, 1, b'hook'), 0)
+        signatures = [signature for target, signature, arguments, value in mock.calls]
+        if amount0 > 0:
+            assert signatures == ['swap(uint256,int256,int256,uint256,bytes)', 'sync(address)', 'transferFrom(address,address,uint256)', 'settle()', 'take(address,address,uint256)']
+            assert mock.calls[2][2][2] == amount0
+            assert mock.calls[4][2][2] == - amount1
+        else:
+            assert signatures == ['swap(uint256,int256,int256,uint256,bytes)', 'take(address,address,uint256)', 'sync(address)', 'transferFrom(address,address,uint256)', 'settle()']
+            assert mock.calls[1][2][2] == - amount0
+            assert mock.calls[3][2][2] == amount1
+
+    # Another 'payer' receives the output while the input is still pulled from
+    # the caller of 'nofeeswap.unlock'.
+    receiver = '0x' + '9' * 40
+    mock = Recorder({'swap(uint256,int256,int256,uint256,bytes)': (True, Mock.words(100, -90))})
+    Emulator(mock, nofeeswap, operator, payer).run(swapSequence(Account(nofeeswap), Account(token0), Account(token1), Account(receiver), poolId, 100, -5, 1, b'', deadline))
+    assert mock.calls[2][2] == (to_checksum_address(payer), to_checksum_address(nofeeswap), 100)
+    assert mock.calls[4][2] == (to_checksum_address(token1), to_checksum_address(receiver), 90)
+
+    # A filled template makes the same calls as the sequence.
+    template = swapTemplate(Account(nofeeswap), Account(token0), Account(token1), Account(payer), deadline)
+    for amountSpecified, limit, hookData in [(100, -5, b'hook'), (- (1 << 100), 1 << 62, b''), (1, 0, bytes(300))]:
+        calls = []
+        for data in [
+            swapSequence(Account(nofeeswap), Account(token0), Account(token1), Account(payer), poolId, amountSpecified, limit, 1, hookData, deadline),
+            swapFill(template, poolId, amountSpecified, limit, 1, hookData),
+        ]:
+            mock = Recorder({'swap(uint256,int256,int256,uint256,bytes)': (True, Mock.words(90, -100))})
+            Emulator(mock, nofeeswap, operator, payer).run(data)
+            calls += [mock.calls]
+        assert calls[0] == calls[1]
+
+    mock = Recorder({'swap(uint256,int256,int256,uint256,bytes)': (False, b'failed')})
+    with pytest.raises(OperatorRevert) as error:
+        Emulator(mock, nofeeswap, operator, payer).run(
+            swapSequence(Account(nofeeswap), Account(token0), Account(token1), Account(payer), 0, 100, 0, 1, b'', deadline)
+        )
+    assert error.value.data == b'failed'
+
+    # The net settled sequence reverts if either token fails to settle.
+    for signature in ['transferFrom(address,address,uint256)', 'settle()', 'take(address,address,uint256)']:
+        mock = Recorder({'swap(uint256,int256,int256,uint256,bytes)': (True, Mock.words(100, -90)), signature: (False, b'')})
+        with pytest.raises(OperatorRevert):
+            Emulator(mock, nofeeswap, operator, payer).run(
+                swapSequence(Account(nofeeswap), Account(token0), Account(token1), None, 0, 100, 0, 1, b'', deadline)
+            )
+
+class Pools(Recorder):
+    # Every pool gives out twice the exact input that it is specified, and
+    # the swaps numbered in 'failures' fail.
+    def __init__(self, failures = ()):
+        super().__init__()
+        self.failures = failures
+
+    def call(self, target, signature, arguments, value):
+        if signature != 'swap(uint256,int256,int256,uint256,bytes)':
+            return super().call(target, signature, arguments, value)
+        self.calls += [(target, signature, arguments, value)]
+        if len(self.calls) in self.failures:
+            return (False, b'failed')
+        poolId, amountSpecified, limit, zeroForOne, hookData = arguments
+        if zeroForOne == 1:
+            return (True, Mock.words(amountSpecified, - 2 * amountSpecified))
+        return (True, Mock.words(- 2 * amountSpecified, amountSpecified))
+
+def test_swapRoute(request, worker_id):
+    logTest(request, worker_id)
+
+    # The output of every hop is the exact input of the next one.
+    route = [((3 << 180) + 1, -5, 1), (2, 0, 0), (3, 0, 1)]
+    tokens = [Account(token) for token in [token0, token1, payer, token0]]
+    mock = Pools()
+    Emulator(mock, nofeeswap, operator, payer).run(routeSequence(Account(nofeeswap), tokens, route, 10, deadline))
+    swaps = [arguments for target, signature, arguments, value in mock.calls if signature.startswith('swap')]
+    assert swaps == [((3 << 180) + 1, 10, -5, 1, b''), (2, 20, 0, 0, b''), (3, 40, 0, 1, b'')]
+    signatures = [signature for target, signature, arguments, value in mock.calls[3:]]
+    assert signatures == ['sync(address)', 'transferFrom(address,address,uint256)', 'settle()', 'take(address,address,uint256)']
+    assert mock.calls[4][2][2] == 10
+    assert mock.calls[6][2] == (to_checksum_address(token0), to_checksum_address(payer), 80)
+
+    # Only the amounts with nonzero slots are written and the route stops at
+    # the first hop that fails.
+    hops = [(1, 1 << 63, 1, 3), (2, 1 << 63, 0, 0), (3, 1 << 63, 1, 4)]
+    for failures, slots in [((), {1: 10, 2: 1, 3: twosComplement(-20), 4: twosComplement(-80), 5: 10}), ((2,), {1: 10, 2: 0, 3: twosComplement(-20), 5: 10})]:
+        emulator = Emulator(Pools(failures), nofeeswap, operator, payer)
+        emulator.run(sequence((['uint8', 'int256', 'uint8'], [PUSH32, 10, 1]), SwapRoute(1, 2, 5, hops).packed()))
+        assert emulator.slots == slots
+        assert len(emulator.mock.calls) == 3 - len(failures)
+
+def test_returnSlots(request, worker_id):
+    logTest(request, worker_id)
+
+    # The slots are returned in order, registers included, and the sequence
+    # ends there.
+    emulator = emulate(sequence(
+        (['uint8', 'int256', 'uint8'], [PUSH32, -3, 1]),
+        (['uint8', 'int256', 'uint8'], [PUSH32, 1 << 200, 250]),
+        ReturnSlots([(250,), (1,), (2,), (1,)]).packed(),
+        (['uint8', 'uint8'], [PUSH0, 1]),
+    ))
+    assert decodeResult(emulator.result) == [1 << 200, -3, 0, -3]
+    assert emulator.tload(1) == twosComplement(-3)
+    assert emulate(sequence((['uint8', 'uint8'], [PUSH0, 1]))).result == b''
+
+    # The swap sequences return their amounts after making the same calls.
+    calls = []
+    for returnAmounts in [False, True]:
+        mock = Recorder({'swap(uint256,int256,int256,uint256,bytes)': (True, Mock.words(100, -90))})
+        emulator = Emulator(mock, nofeeswap, operator, payer)
+        emulator.run(swapSequence(Account(nofeeswap), Account(token0), Account(token1), Account(payer), 7, 100, -5, 1, b'', deadline, returnAmounts))
+        calls += [mock.calls]
+    assert calls[0] == calls[1]
+    assert decodeResult(emulator.result) == [100, -90]
+
+    route = [(1, 0, 1), (2, 0, 0)]
+    tokens = [Account(token) for token in [token0, token1, token0]]
+    emulator = Emulator(Pools(), nofeeswap, operator, payer)
+    emulator.run(routeSequence(Account(nofeeswap), tokens, route, 10, deadline, True))
+    assert decodeResult(emulator.result) == [10, -40]
+
+    with pytest.raises(ValueError, match = 'Malformed'):
+        decodeResult(bytes(33))
+
+def test_addressTable(request, worker_id):
+    logTest(request, worker_id)
+
+    # The references resolve to the same calls as the addresses.
+    assembler = optimize(mintActions(Assembler(), Account(nofeeswap), Account(token0), Account(token1), 5, 1 << 188, -100, 100, 1000, b''))
+    calls = []
+    for candidate in [assembler, tabulate(assembler)]:
+        mock = Recorder({'modifyPosition(uint256,int256,int256,int256,bytes)': (True, Mock.words(10, 20))})
+        Emulator(mock, nofeeswap, operator, payer).run(candidate.assemble(deadline))
+        calls += [mock.calls]
+    assert calls[0] == calls[1]
+
+    table = AddressTable([(token0,), (payer,)])
+    emulator = emulate(sequence(table.packed(), TakeTokenRef(0, 1, 0, 1).packed()))
+    assert emulator.mock.calls == [(emulator.nofeeswap, 'take(address,address,uint256)', (to_checksum_address(token0), to_checksum_address(payer), 0), 0)]
+
+    for data, reason in [
+        (sequence(SyncTokenRef(0).packed()), 'InvalidAddressReference'),
+        (sequence(table.packed(), SyncTokenRef(2).packed()), 'InvalidAddressReference'),
+        (sequence(SyncTokenRef(0).packed(), table.packed()), 'InvalidAddressReference'),
+        (sequence((['uint8', 'uint8'], [PUSH0, 1]), table.packed()), 'InvalidAddressTable'),
+    ]:
+        with pytest.raises(OperatorRevert) as error:
+            emulate(data)
+        assert error.value.reason == reason
+
+def test_settleNet(request, worker_id):
+    logTest(request, worker_id)
+
+    def settle(amount, results = {}):
+        emulator = emulate(sequence((['uint8', 'int256', 'uint8'], [PUSH32, amount, 1]), SettleNetERC20(token0, 1, 2).packed()), results)
+        return emulator.mock.calls, emulator.tload(2)
+
+    # Nothing is owed.
+    assert settle(0) == ([], 1)
+
+    calls, success = settle(-7)
+    assert calls == [(to_checksum_address(nofeeswap), 'take(address,address,uint256)', (to_checksum_address(token0), to_checksum_address(payer), 7), 0)]
+    assert success == 1
+
+    calls, success = settle(7)
+    assert [signature for target, signature, arguments, value in calls] == ['sync(address)', 'transferFrom(address,address,uint256)', 'settle()']
+    assert calls[1] == (to_checksum_address(token0), 'transferFrom(address,address,uint256)', (to_checksum_address(payer), to_checksum_address(nofeeswap), 7), 0)
+    assert success == 1
+
+    # Either a failed transfer or a failed settlement is recorded. Nothing is
+    # settled after a failed transfer.
+    calls, success = settle(7, {'transferFrom(address,address,uint256)': (False, b'')})
+    assert [signature for target, signature, arguments, value in calls] == ['sync(address)', 'transferFrom(address,address,uint256)']
+    assert success == 0
+    assert settle(7, {'settle()': (False, b'')})[1] == 0
+    assert settle(-7, {'take(address,address,uint256)': (False, b'')})[1] == 0
+
+    # A token which returns data has to return 'true'.
+    assert settle(7, {'transferFrom(address,address,uint256)': (True, Mock.words(1))})[1] == 1
+    calls, success = settle(7, {'transferFrom(address,address,uint256)': (True, Mock.words(0))})
+    assert 'settle()' not in [signature for target, signature, arguments, value in calls]
+    assert success == 0
+    assert settle(7, {'transferFrom(address,address,uint256)': (True, b'\x01')})[1] == 0
+
+    with pytest.raises(OperatorRevert) as error:
+        settle(- (1 << 255))
+    assert error.value.reason == 'SafeMathError'
+
+def test_mintSequence(request, worker_id):
+    logTest(request, worker_id)
+
+    mock = Recorder({'modifyPosition(uint256,int256,int256,int256,bytes)': (True, Mock.words(10, 20))})
+    emulator = Emulator(mock, nofeeswap, operator, payer)
+    poolId = (255 << 180) + 7
+    emulator.run(mintSequence(Account(nofeeswap), Account(token0), Account(token1), 5, poolId, -100, 100, 1000, b'', deadline))
+
+    assert mock.calls[0][2] == (poolId, -100, 100, 1000, b'')
+    assert [(arguments[-1], target) for target, signature, arguments, value in mock.calls if signature.startswith('transferFrom')] == [
+        (10, to_checksum_address(token0)), (20, to_checksum_address(token1))
+    ]
+    assert mock.calls[-1][1:3] == ('modifyBalance(address,uint256,int256)', (emulator.payer, 5, 1000))
+
+def test_sequenceEncodings(request, worker_id):
+    logTest(request, worker_id)
+
+    # Every builder makes the same calls and returns the same result whether
+    # its actions are encoded as written or optimized.
+    swap = {'swap(uint256,int256,int256,uint256,bytes)': (True, Mock.words(100, -90))}
+    modify = {'modifyPosition(uint256,int256,int256,int256,bytes)': (True, Mock.words(10, 20))}
+    burn = {'modifyPosition(uint256,int256,int256,int256,bytes)': (True, Mock.words(-10, -20))}
+    donate = {'donate(uint256,uint256,bytes)': (True, Mock.words(10, 20))}
+    tokens = [Account(token) for token in [token0, token1, payer, token0]]
+    route = [((3 << 180) + 1, -5, 1), (2, 0, 0), (3, 0, 1)]
+    for build, mock in [
+        (lambda optimized: swapSequence(Account(nofeeswap), Account(token0), Account(token1), Account(payer), 7, 100, -5, 1, b'hook', deadline, True, optimized), lambda: Recorder(swap)),
+        (lambda optimized: swapSequence(Account(nofeeswap), Account(token0), Account(token1), None, 7, -100, 5, 0, b'', deadline, True, optimized), lambda: Recorder(swap)),
+        (lambda optimized: mintSequence(Account(nofeeswap), Account(token0), Account(token1), 5, 1 << 188, -100, 100, 1000, b'', deadline, optimized), lambda: Recorder(modify)),
+        (lambda optimized: burnSequence(Account(token0), Account(token1), Account(payer), 5, 1 << 188, -100, 100, 1000, b'', deadline, optimized), lambda: Recorder(burn)),
+        (lambda optimized: donateSequence(Account(nofeeswap), Account(token0), Account(token1), 1 << 188, 1000, b'data', deadline, optimized), lambda: Recorder(donate)),
+        (lambda optimized: collectSequence(Account(token0), Account(token1), 1, 2, Account(payer), -3, -4, deadline, optimized), Recorder),
+        (lambda optimized: routeSequence(Account(nofeeswap), tokens, route, 10, deadline, True, optimized), Pools),
+    ]:
+        runs = []
+        for optimized in [False, True]:
+            emulator = Emulator(mock(), nofeeswap, operator, payer)
+            emulator.run(build(optimized))
+            runs += [(emulator.mock.calls, emulator.result)]
+        assert runs[0] == runs[1]
+        assert build(True) != build(False)
+
+@pytest.mark.parametrize('seed', range(200))
+def test_optimizerEquivalence(seed, request, worker_id):
+    logTest(request, worker_id)
+
+    # Random arithmetic over a few slots is emulated before and after
+    # optimization. Every slot is observed through 'TAKE_TOKEN'. Slots are
+    # written before being read since the allocator may reuse their numbers.
+    generator = random.Random(seed)
+    assembler = Assembler()
+    registers = [assembler.slot() for k in range(4)]
+    for register in registers:
+        assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, generator.randrange(-8, 8), register])
+    opcodes = [NEG, ISZERO, ADD, SUB, MIN, MAX, MUL, LT, EQ, LTEQ, AND, OR, XOR]
+    for k in range(30):
+        choice = generator.random()
+        if choice < 0.3:
+            value = generator.choice([0, 1, -1, 3, (1 << 100), - (1 << 200), (1 << 255) - 1])
+            assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, value, generator.choice(registers)])
+        elif choice < 0.9:
+            opcode = generator.choice(opcodes)
+            if opcode in [NEG, ISZERO]:
+                assembler.action(['uint8', 'uint8', 'uint8'], [opcode, generator.choice(registers), generator.choice(registers)])
+            else:
+                assembler.action(['uint8', 'uint8', 'uint8', 'uint8'], [opcode] + [generator.choice(registers) for j in range(3)])
+        else:
+            assembler.action(['uint8', 'address', 'address', 'uint8', 'uint8'], [TAKE_TOKEN, token0, payer, generator.choice(registers), assembler.slot()])
+    for register in registers:
+        assembler.action(['uint8', 'address', 'address', 'uint8', 'uint8'], [TAKE_TOKEN, token0, payer, register, assembler.slot()])
+
+    outcomes = []
+    for candidate in [assembler, optimize(assembler)]:
+        mock = Recorder()
+        try:
+            Emulator(mock, nofeeswap, operator, payer).run(candidate.assemble(deadline))
+            outcomes += [('success', mock.calls)]
+        except OperatorRevert as error:
+            outcomes += [(error.reason, mock.calls)]
+    assert outcomes[0] == outcomes[1]
+
+def opcodeSequence(opcode):
+    # A sequence around the action of 'opcode' in which every slot that it
+    # reads is pushed beforehand and only the slots that it writes are
+    # returned, so that a push which the optimizer drops by mistake changes
+    # the calls of the action rather than the result.
+    assembler = Assembler()
+    assembler.action(AddressTable([(token0,), (payer,)]))
+    pushed = []
+    returned = []
+
+    def slot(name):
+        slot = assembler.slot()
+        if name not in written[opcode] or opcode == LOOP:
+            pushed.append(slot)
+        if name in written[opcode]:
+            returned.append(slot)
+        return slot
+
+    def value(name, type):
+        if type == 'uint8' and name.endswith('Slot'):
+            return slot(name)
+        if type == 'address':
+            return token0
+        if type == 'bytes':
+            return b''
+        if type.startswith('bytes'):
+            return bytes(int(type[5:]))
+        return 0 if name.endswith('Ref') else 1
+
+    cls = classes[opcode]
+    fields = {}
+    for field in cls.layout:
+        if field[0] in cls.counts:
+            continue
+        if len(field) == 2 or field[1] == 'bytes':
+            fields[field[0]] = value(field[0], field[1])
+        else:
+            fields[field[0]] = [tuple(value(name, type) for name, type in field[1])]
+    action = cls(**fields)
+    for k, slot in enumerate(pushed):
+        assembler.action(Push32(5 + k, slot))
+
+    if opcode == JUMPDEST:
+        assembler.label('here')
+    elif opcode == JUMP:
+        assembler.jump('end', action.conditionSlot)
+        assembler.action(SyncToken(token1))
+        assembler.label('end')
+    elif opcode == LOOP:
+        assembler.loop('top', action.counterSlot)
+        assembler.action(SyncToken(token1))
+        assembler.endLoop('top')
+    elif opcode in [CALL_BLOCK, RETURN_BLOCK]:
+        assembler.call('block')
+        assembler.action(ReturnSlots([(slot,) for slot in returned]))
+        assembler.label('block')
+        assembler.action(SyncToken(token1))
+        assembler.ret()
+        return assembler
+    elif opcode != ADDRESS_TABLE:
+        assembler.action(action)
+    assembler.action(ReturnSlots([(slot,) for slot in returned]))
+    return assembler
+
+@pytest.mark.parametrize('opcode', sorted(classes))
+def test_optimizerOpcodes(opcode, request, worker_id):
+    logTest(request, worker_id)
+
+    # The calls, the result and the revert reason of every action are the
+    # same before and after optimization.
+    assembler = opcodeSequence(opcode)
+    outcomes = []
+    for candidate in [assembler, optimize(assembler)]:
+        mock = Recorder()
+        try:
+            emulator = Emulator(mock, nofeeswap, operator, payer).run(candidate.assemble(deadline))
+            outcomes += [('success', mock.calls, emulator.result)]
+        except OperatorRevert as error:
+            outcomes += [(error.reason, mock.calls, None)]
+    assert outcomes[0] == outcomes[1]
@@ -0,0 +1,151 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+import pytest
+import random
+from eth_abi.packed import encode_packed
+from Nofee import logTest, Assembler, GasModel, Push32, Neg, Swap, SwapRoute, optimize, schedule, depth, dispatched, PUSH10, PUSH32, READ_IS_APPROVED_FOR_ALL_ERC1155, REVERT, SYNC_TOKEN, TAKE_TOKEN, SETTLE_NET_ERC20, SWAP_ROUTE, LOOP, RETURN_SLOTS, swapActions, swapSequence, routeSequence, mintSequence, donateSequence, collectSequence
+
+deadline = 2 ** 32 - 1
+
+class Account:
+    def __init__(self, address):
+        self.address = address
+
+nofeeswap, token0, token1, payer = [Account('0x' + str(k) * 40) for k in range(1, 5)]
+poolId = 1 << 188
+
+def sequence(*actions):
+    return encode_packed(['uint32'], [deadline]) + b''.join(encode_packed(types, values) for types, values in actions)
+
+def test_dispatch(request, worker_id):
+    logTest(request, worker_id)
+
+    model = GasModel({'case': 22})
+    # Every opcode below 64 takes six comparisons of the tree to dispatch,
+    # seven with 'lt(action, 64)', whether it is common, e.g., 'PUSH10', or
+    # not, e.g., 'PUSH32'. The opcodes from 64 onwards are checked against
+    # unknown opcodes instead.
+    assert {depth[opcode] for opcode in dispatched if opcode < 64} == {6}
+    assert depth[PUSH10] == depth[PUSH32] == depth[READ_IS_APPROVED_FOR_ALL_ERC1155] == depth[REVERT] == 6
+    assert depth[SETTLE_NET_ERC20] == depth[SWAP_ROUTE] == 4
+    assert depth[LOOP] == depth[RETURN_SLOTS] == 3
+    first = model.features(sequence((['uint8', 'int80', 'uint8'], [PUSH10, 1, 1])))
+    last = model.features(sequence((['uint8', 'int256', 'uint8'], [PUSH32, 1, 1])))
+    assert first['case'] == last['case'] == 6
+    assert first['tstore'] == last['tstore'] == 1
+    # Only the calldata differs.
+    assert model.estimate(sequence((['uint8', 'int256', 'uint8'], [PUSH32, 0, 1]))) - model.estimate(sequence((['uint8', 'int80', 'uint8'], [PUSH10, 0, 1]))) == 32 * schedule['zeroByte']
+
+def test_accounts(request, worker_id):
+    logTest(request, worker_id)
+
+    model = GasModel()
+    sync = (['uint8', 'address'], [SYNC_TOKEN, token0.address])
+    take = (['uint8', 'address', 'address', 'uint8', 'uint8'], [TAKE_TOKEN, token0.address, payer.address, 1, 2])
+    features = model.features(sequence(sync, sync, take))
+    assert features['call'] == 3
+    assert features['sync(address)'] == 2
+    assert features['take(address,address,uint256)'] == 1
+    # Only the nofeeswap calls are made, which is warm from the start.
+    assert 'coldAccount' not in features
+
+    data = swapSequence(nofeeswap, token0, token1, payer, poolId, -10, 0, 1, b'\x01' * 33, deadline)
+    features = model.features(data)
+    assert features['swap(uint256,int256,int256,uint256,bytes)'] == 1
+    assert features['word'] == 2
+    # Both tokens may be transferred from the payer.
+    assert features['coldAccount'] == 2
+    assert GasModel(warm = [token0.address, token1.address]).features(data).get('coldAccount', 0) == 0
+
+def test_optimized(request, worker_id):
+    logTest(request, worker_id)
+
+    model = GasModel({'base': 50000, 'action': 40, 'case': 22, 'byte': 3})
+    assembler = swapActions(Assembler(), nofeeswap, token0, token1, None, poolId, -10, 0, 1, b'')
+    original = assembler.assemble(deadline)
+    optimized = optimize(assembler).assemble(deadline)
+    assert model.estimate(optimized) < model.estimate(original)
+    assert model.cheapest([original, optimized]) == optimized
+
+def test_registers(request, worker_id):
+    logTest(request, worker_id)
+
+    # The same swap with its slots in registers and, as every register is
+    # reserved, in transient storage.
+    model = GasModel()
+    registers = optimize(swapActions(Assembler(), nofeeswap, token0, token1, None, poolId, -10, 0, 1, b'')).assemble(deadline)
+    transient = optimize(swapActions(Assembler().reserve(*range(248, 256)), nofeeswap, token0, token1, None, poolId, -10, 0, 1, b'')).assemble(deadline)
+    features = model.features(registers)
+    assert features['register'] == 15
+    assert features['tload'] == features['tstore'] == 0
+    assert model.features(transient).get('register', 0) == 0
+    assert model.estimate(transient) - model.estimate(registers) > 15 * 90
+
+    # Returning the amounts reads both registers and copies two words.
+    returned = model.features(optimize(swapActions(Assembler(), nofeeswap, token0, token1, None, poolId, -10, 0, 1, b'', True)).assemble(deadline))
+    assert {name: returned[name] - features.get(name, 0) for name in ['action', 'register', 'word']} == {'action': 1, 'register': 2, 'word': 2}
+
+def test_route(request, worker_id):
+    logTest(request, worker_id)
+
+    model = GasModel({'action': 40, 'case': 22, 'byte': 3})
+    route = [(poolId, 0, 1), (poolId + 1, 0, 0), (poolId + 2, 0, 1)]
+    features = model.features(routeSequence(nofeeswap, [token0, token1, payer, token0], route, 10, deadline, optimized = True))
+    assert features['swap(uint256,int256,int256,uint256,bytes)'] == 3
+    # The output slots of the intermediate hops are zero and are not written.
+    assert features['register'] == 14
+    assert features['tload'] == features['tstore'] == 0
+
+    # The same chain of swaps with every output negated into the input of the
+    # next one.
+    assembler = Assembler()
+    amountSlot, successSlot, amount0Slot, amount1Slot = [assembler.register() for k in range(4)]
+    assembler.action(Push32(10, amountSlot))
+    for poolId_, limit, zeroForOne in route:
+        assembler.action(Swap(poolId_, amountSlot, 1 << 63, zeroForOne, assembler.zero, successSlot, amount0Slot, amount1Slot, b''))
+        assembler.action(Neg(amount1Slot if zeroForOne else amount0Slot, amountSlot))
+    chain = assembler.assemble(deadline)
+
+    assembler = Assembler()
+    amountSlot, successSlot = [assembler.register() for k in range(2)]
+    assembler.action(Push32(10, amountSlot))
+    assembler.action(SwapRoute(amountSlot, successSlot, 0, [(poolId_, 1 << 63, zeroForOne, 0) for poolId_, limit, zeroForOne in route]))
+    single = assembler.assemble(deadline)
+    assert len(single) < len(chain)
+    assert model.estimate(single) < model.estimate(chain)
+    assert model.features(single)['swap(uint256,int256,int256,uint256,bytes)'] == 3
+
+def test_calibrate(request, worker_id):
+    logTest(request, worker_id)
+
+    truth = GasModel({
+        'base': 61234,
+        'action': 41,
+        'case': 22,
+        'byte': 3,
+        'swap(uint256,int256,int256,uint256,bytes)': 45000,
+        'modifyPosition(uint256,int256,int256,int256,bytes)': 90000,
+        'donate(uint256,uint256,bytes)': 30000,
+        'sync(address)': 2500,
+        'settle()': 5000,
+        'take(address,address,uint256)': 9000,
+        'transferFrom(address,address,uint256)': 12000,
+        'modifyBalance(address,uint256,int256)': 7000,
+        'modifyBalance(address,uint256,uint256,int256,int256)': 9000,
+    })
+    rng = random.Random(0)
+    samples = []
+    for k in range(60):
+        hookData = bytes(rng.randrange(0, 100))
+        data = rng.choice([
+            lambda: swapSequence(nofeeswap, token0, token1, payer, poolId, rng.randrange(-1 << 100, 1 << 100), rng.randrange(-1 << 60, 1 << 60), rng.randrange(0, 3), hookData, deadline),
+            lambda: mintSequence(nofeeswap, token0, token1, rng.getrandbits(256), poolId, rng.randrange(0, 1 << 60), rng.randrange(0, 1 << 60), rng.randrange(1, 1 << 100), hookData, deadline),
+            lambda: donateSequence(nofeeswap, token0, token1, poolId, rng.randrange(1, 1 << 100), hookData, deadline),
+            lambda: collectSequence(token0, token1, rng.getrandbits(256), rng.getrandbits(256), payer, rng.randrange(1, 1 << 100), rng.randrange(1, 1 << 100), deadline),
+        ])()
+        samples += [(data, truth.estimate(data) + rng.randrange(-20, 20))]
+
+    model = GasModel().calibrate(samples[:40])
+    for data, gasUsed in samples[40:]:
+        assert abs(model.estimate(data) - gasUsed) < 200
+    # The weights of the gas schedule are not fitted.
+    assert model.weights['tload'] == 100
@@ -0,0 +1,61 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+import os
+import sys
+import subprocess
+import pytest
+import inspect
+import importlib
+import Nofee
+from Nofee import logTest
+
+heavyModules = ['sympy', 'mpmath', 'eth_abi']
+
+def importTime(statement):
+    # Runs 'statement' in a fresh interpreter and returns the time it takes
+    # together with the heavy modules that it loads.
+    script = '\n'.join([
+        'import sys, time',
+        'start = time.perf_counter()',
+        statement,
+        'print(time.perf_counter() - start)',
+        'print(" ".join([module for module in ' + repr(heavyModules) + ' if module in sys.modules]))'
+    ])
+    output = subprocess.run(
+        [sys.executable, '-c', script],
+        cwd = os.path.dirname(os.path.abspath(__file__)),
+        capture_output = True,
+        text = True,
+        check = True
+    ).stdout.split('\n')
+    return float(output[0]), output[1].split()
+
+@pytest.mark.parametrize('statement, loaded', [
+    ['from Nofee import PUSH32, JUMPDEST, JUMP, REVERT, address0', []],
+    ['from Nofee import logTest, X59, X63', []],
+    ['from Nofee import keccak, toInt, encodeKernelCompact, encodeCurve, getPoolId', ['eth_abi']],
+    ['from Nofee import mintSequence, burnSequence, swapSequence', ['eth_abi']],
+    ['from Nofee import dataGeneration, Pool, checkPool', heavyModules]
+])
+def test_importTime(statement, loaded, request, worker_id):
+    logTest(request, worker_id)
+
+    elapsed, _loaded = importTime(statement)
+    print(statement, '->', str(round(1000 * elapsed)) + 'ms')
+    assert _loaded == loaded
+
+def test_owners(request, worker_id):
+    logTest(request, worker_id)
+
+    # Sympy's 'And', as imported by 'reference', does not shadow the action.
+    assert Nofee.And is importlib.import_module('Nofee.actions').And
+    with pytest.raises(AttributeError):
+        Nofee.Piecewise
+
+    # Every class and function is found in the submodule that defines it.
+    for submodule in Nofee.submodules:
+        module = importlib.import_module('Nofee.' + submodule)
+        for name in dir(module):
+            value = getattr(module, name)
+            if not name.startswith('_') and (inspect.isclass(value) or inspect.isroutine(value)) and value.__module__ == module.__name__:
+                assert getattr(Nofee, name) is value
+                assert name in dir(Nofee)
@@ -0,0 +1,239 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+import pytest
+from sympy import Integer, floor, exp
+from Nofee import logTest, X63, dataGeneration, getBoundaries, amend, outgoing, incoming, segmentIntegral, floorIntegral, outgoingInterval, getCurveIndex, getMaxIntegrals, getMaxIntegralsCacheInfo, clearMaxIntegralsCache, compileKernel, encodeKernel, getFunctionFromKernel, intervalIntegrals, intervalGrowths, setIntegralEngine
+
+initializations, swaps, kernelsValid, kernelsInvalid = dataGeneration(1000)
+
+@pytest.mark.parametrize('n', range(0, len(swaps['kernel']), 5))
+def test_integralEngine(n, request, worker_id):
+    logTest(request, worker_id)
+
+    kernel = swaps['kernel'][n]
+    curve = swaps['curve'][n]
+    target = swaps['target'][n]
+    lower, upper = getBoundaries(curve)
+    current = curve[-1]
+
+    ranges = [(current, upper), (lower, current)]
+    ranges += [(target, upper)] if current <= target else [(lower, target)]
+
+    for qMin, qMax in ranges:
+        for integral in [outgoing, incoming]:
+            sympyResult = integral(curve, kernel, qMin, qMax, 'sympy')
+            for engine in ['mpmath', 'integer', 'adaptive']:
+                result = integral(curve, kernel, qMin, qMax, engine)
+                assert type(sympyResult) == type(result)
+                assert sympyResult == result
+
+@pytest.mark.parametrize('kernel', kernelsValid[::20])
+def test_integralEngineFullInterval(kernel, request, worker_id):
+    logTest(request, worker_id)
+
+    lower = X63
+    upper = X63 + kernel[-1][0]
+
+    for curve in [[upper, lower], [lower, upper]]:
+        for integral in [outgoing, incoming]:
+            sympyResult = integral(curve, kernel, lower, upper, 'sympy')
+            assert sympyResult == integral(curve, kernel, lower, upper, 'mpmath')
+            assert sympyResult == integral(curve, kernel, lower, upper, 'integer')
+            assert sympyResult == integral(curve, kernel, lower, upper, 'adaptive')
+
+@pytest.mark.parametrize('kernel', kernelsValid[::20])
+def test_getMaxIntegralsEngine(kernel, request, worker_id):
+    logTest(request, worker_id)
+
+    sympyResult = getMaxIntegrals(kernel, 'sympy')
+    for engine in ['mpmath', 'integer', 'adaptive']:
+        assert sympyResult == getMaxIntegrals(kernel, engine)
+
+def test_getMaxIntegralsCache(request, worker_id):
+    logTest(request, worker_id)
+
+    kernel = kernelsValid[0]
+    clearMaxIntegralsCache()
+
+    outgoingMax, incomingMax = getMaxIntegrals(kernel)
+    info = getMaxIntegralsCacheInfo()
+    assert (info.hits, info.misses) == (0, 1)
+
+    assert getMaxIntegrals([list(point) for point in kernel]) == (outgoingMax, incomingMax)
+    assert getMaxIntegrals(tuple(tuple(point) for point in kernel)) == (outgoingMax, incomingMax)
+    info = getMaxIntegralsCacheInfo()
+    assert (info.hits, info.misses) == (2, 1)
+
+    getMaxIntegrals(kernelsValid[1])
+    info = getMaxIntegralsCacheInfo()
+    assert (info.hits, info.misses, info.currsize) == (2, 2, 2)
+
+@pytest.mark.parametrize('n', range(0, len(swaps['kernel']), 20))
+def test_provenFloor(n, monkeypatch, request, worker_id):
+    logTest(request, worker_id)
+
+    import Nofee.reference
+    kernel = compileKernel(swaps['kernel'][n])
+    curve = swaps['curve'][n]
+    lower, upper = getBoundaries(curve)
+    ii = next(ii for ii in range(len(kernel) - 1) if kernel.breakpoints[ii] < kernel.breakpoints[ii + 1])
+    b0 = lower + kernel.breakpoints[ii]
+    b1 = lower + kernel.breakpoints[ii + 1]
+    middle = (b0 + b1) // 2
+    segment = lambda limit0, limit1, engine: segmentIntegral(kernel.c[ii], kernel.c[ii + 1], b0, b1, limit0, limit1, -1, engine)
+
+    for engine in ['integer', 'adaptive']:
+        # Zero, but not term by term, and settled without any evaluation.
+        monkeypatch.setitem(Nofee.reference.quotients, engine, None)
+        assert floorIntegral(segment(b0, middle, engine) + segment(middle, b1, engine) - segment(b0, b1, engine), engine) == 0
+        monkeypatch.undo()
+
+        # The precision keeps escalating beyond the last rung.
+        monkeypatch.setattr(Nofee.reference, 'adaptivePrecisions', [64])
+        assert floorIntegral(segment(b0, middle, engine) + segment(middle, b1, engine), engine) == floorIntegral(segment(b0, b1, 'sympy'), 'sympy')
+        for integral in [outgoing, incoming]:
+            assert integral(curve, kernel, lower, upper, engine) == integral(curve, kernel, lower, upper, 'sympy')
+        monkeypatch.undo()
+
+@pytest.mark.parametrize('n', range(0, len(swaps['kernel']), 5))
+def test_curveIndex(n, request, worker_id):
+    logTest(request, worker_id)
+
+    kernel = swaps['kernel'][n]
+    curve = swaps['curve'][n]
+    lower, upper = getBoundaries(curve)
+
+    points = sorted(set(curve + [swaps['target'][n], (lower + upper) // 2, lower + 1, upper - 1]))
+    for engine in ['adaptive', 'integer']:
+        index = getCurveIndex(curve, kernel, engine)
+        for qMin in points:
+            for qMax in points:
+                if qMin <= qMax:
+                    assert index.outgoing(qMin, qMax) == outgoing(curve, kernel, qMin, qMax, engine)
+                    assert index.incoming(qMin, qMax) == incoming(curve, kernel, qMin, qMax, engine)
+
+    assert getCurveIndex(curve, kernel, 'integer') is index
+    assert getCurveIndex(amend(curve, swaps['target'][n]), kernel, 'integer') is not index
+
+@pytest.mark.parametrize('kernel', kernelsValid)
+def test_intervalTemplate(kernel, request, worker_id):
+    logTest(request, worker_id)
+
+    spacing = kernel[-1][0]
+    for lower in [1, X63 - spacing, X63 - spacing // 2, X63, (1 << 64) - 1 - spacing]:
+        upper = lower + spacing
+        if lower <= 0 or (1 << 64) <= upper:
+            continue
+        for engine in ['mpmath', 'integer', 'adaptive']:
+            assert outgoingInterval(kernel, lower, upper, True, engine) == outgoing([upper, lower], kernel, lower, upper, engine)
+            assert outgoingInterval(kernel, lower, upper, False, engine) == outgoing([lower, upper], kernel, lower, upper, engine)
+
+@pytest.mark.parametrize('n', range(0, len(swaps['kernel']), 20))
+def test_compiledKernel(n, request, worker_id):
+    logTest(request, worker_id)
+
+    kernel = swaps['kernel'][n]
+    curve = swaps['curve'][n]
+    lower, upper = getBoundaries(curve)
+    compiled = compileKernel(kernel)
+
+    assert compileKernel(compiled) is compiled
+    assert compileKernel([list(point) for point in kernel]) is compiled
+    assert [list(point) for point in compiled] == [list(point) for point in kernel]
+    assert encodeKernel(compiled) == encodeKernel(kernel)
+    assert getFunctionFromKernel(compiled) == getFunctionFromKernel(kernel)
+    assert getMaxIntegrals(compiled) == getMaxIntegrals(kernel)
+    for engine in ['mpmath', 'integer', 'adaptive']:
+        assert outgoing(curve, compiled, lower, upper, engine) == outgoing(curve, kernel, lower, upper, engine)
+        assert incoming(curve, compiled, lower, upper, engine) == incoming(curve, kernel, lower, upper, engine)
+
+@pytest.mark.parametrize('n', range(0, len(swaps['kernel']), 20))
+def test_intervalIntegrals(n, request, worker_id):
+    logTest(request, worker_id)
+
+    kernel = swaps['kernel'][n]
+    curve = swaps['curve'][n]
+    lower, upper = getBoundaries(curve)
+    spacing = upper - lower
+    index = getCurveIndex(curve, kernel)
+
+    logPrices = [logPrice for logPrice in range(lower - 8 * spacing, upper + 8 * spacing, spacing) if 0 < logPrice and logPrice + spacing < (1 << 64)]
+    integrals0, integrals1 = intervalIntegrals(curve, kernel, logPrices)
+
+    for ii, logPrice in enumerate(logPrices):
+        if upper <= logPrice:
+            integral0, integral1 = outgoingInterval(kernel, logPrice, logPrice + spacing, True), 0
+        elif logPrice + spacing <= lower:
+            integral0, integral1 = 0, outgoingInterval(kernel, logPrice, logPrice + spacing, False)
+        else:
+            integral0, integral1 = index.outgoing(curve[-1], upper), index.outgoing(lower, curve[-1])
+        assert integrals0[ii] == integral0
+        assert integrals1[ii] == integral1
+
+@pytest.mark.parametrize('n', range(0, len(swaps['kernel']), 20))
+def test_intervalGrowths(n, request, worker_id):
+    logTest(request, worker_id)
+
+    lower, upper = getBoundaries(swaps['curve'][n])
+    spacing = upper - lower
+
+    def default(logPrice):
+        if logPrice <= lower:
+            return (2 ** 208) * exp(+ Integer(logPrice - X63) / (2 ** 60)) / (1 - exp(- Integer(spacing) / (2 ** 60)))
+        else:
+            return (2 ** 208) * exp(- Integer(logPrice - X63) / (2 ** 60)) / (1 - exp(- Integer(spacing) / (2 ** 60)))
+
+    logPrices = [lower - 2 * spacing, lower - spacing, lower + spacing, lower + 2 * spacing]
+    multipliers = {logPrice: 0 for logPrice in range(lower - 2 * spacing, lower + 4 * spacing, spacing)}
+    multipliers[lower - spacing] = floor(3 * default(lower - spacing) / 2)
+    multipliers[lower + 2 * spacing] = floor(default(lower + 2 * spacing) / 3)
+    values = {logPrice: growthMultiplier if growthMultiplier != 0 else default(logPrice) for logPrice, growthMultiplier in multipliers.items()}
+
+    for engine in [None, 'integer', 'adaptive']:
+        growths = intervalGrowths(lower, upper, logPrices, multipliers, engine)
+        for logPrice, growth in zip(logPrices, growths):
+            if logPrice < lower:
+                assert growth == floor(((values[logPrice + spacing] - values[logPrice]) * exp(- Integer(logPrice + spacing - X63) / (2 ** 60))) / (2 ** 97))
+            else:
+                assert growth == floor(((values[logPrice] - values[logPrice + spacing]) * exp(+ Integer(logPrice - X63) / (2 ** 60))) / (2 ** 97))
+
+    # Between default multipliers, the growth is exactly '2 ** 111'.
+    logPrices = [lower - 2 * spacing, upper + spacing]
+    multipliers = {logPrice: 0 for logPrice in [lower - 2 * spacing, lower - spacing, upper + spacing, upper + 2 * spacing]}
+    for engine in ['integer', 'adaptive']:
+        assert intervalGrowths(lower, upper, logPrices, multipliers, engine) == [2 ** 111, 2 ** 111]
+
+def test_intervalGrowthsEngine(monkeypatch, request, worker_id):
+    logTest(request, worker_id)
+
+    import Nofee.reference
+    # The engine set by 'setIntegralEngine' reaches the growths of 'checkPool'
+    # unless another one is given.
+    proven = []
+    monkeypatch.setattr(Nofee.reference, 'integralEngine', Nofee.reference.integralEngine)
+    monkeypatch.setattr(Nofee.reference, 'provenGrowths', lambda lower, upper, logPrices, multipliers, engine: proven.append(engine) or [])
+
+    lower, upper = getBoundaries(swaps['curve'][0])
+    spacing = upper - lower
+    logPrices = [lower - spacing, lower + spacing]
+    multipliers = {logPrice: 0 for logPrice in range(lower - spacing, lower + 3 * spacing, spacing)}
+    for engine in ['sympy', 'mpmath', 'integer', 'adaptive']:
+        setIntegralEngine(engine)
+        proven.clear()
+        growths = intervalGrowths(lower, upper, logPrices, multipliers)
+        assert proven == ([engine] if engine in ['integer', 'adaptive'] else [])
+        assert (growths == []) == (engine in ['integer', 'adaptive'])
+
+    proven.clear()
+    assert len(intervalGrowths(lower, upper, logPrices, multipliers, 'mpmath')) == 2
+    assert proven == []
+
+def test_dataGenerationCache(tmp_path, monkeypatch, request, worker_id):
+    logTest(request, worker_id)
+
+    import Nofee.reference
+    monkeypatch.setattr(Nofee.reference, 'dataCacheDirectory', str(tmp_path))
+    generated = dataGeneration(1000)
+    assert generated == (initializations, swaps, kernelsValid, kernelsInvalid)
+    assert len(list(tmp_path.iterdir())) == 1
+    assert dataGeneration(1000) == generated
+    assert len(list(tmp_path.iterdir())) == 1
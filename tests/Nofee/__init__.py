@@ -0,0 +1,48 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+# The Python side of the tests is split into the following submodules:
+#
+#   'constants'  flags, memory layout, opcodes and fixed-point scales,
+#   'logs'       'logTest',
+#   'encoders'   hashing and encoding helpers (sha3, eth_abi),
+#   'actions'    a class per operator action, generated from 'layouts',
+#   'assembler'  'Assembler' with labels, jumps and slot allocation, and
+#                'Template' for patching assembled sequences (eth_abi),
+#   'optimizer'  'optimize', a peephole pass over assembled sequences,
+#   'emulator'   'Emulator', a Python model of 'Operator.unlockCallback',
+#   'decoder'    'decodeActions', 'Decoder' and 'disassemble' for operator payloads,
+#                and 'decodeResult' for what they return,
+#   'gas'        'GasModel', a static gas estimate of operator payloads,
+#   'sequences'  builders of the operator action sequences (eth_abi),
+#   'reference'  the reference model of the pool (sympy, mpmath).
+#
+# A submodule is only imported once one of its names is requested, e.g.,
+# 'from Nofee import PUSH32' does not pay for sympy or eth_abi.
+import inspect
+import importlib
+
+submodules = ['constants', 'logs', 'encoders', 'actions', 'assembler', 'optimizer', 'emulator', 'decoder', 'gas', 'sequences', 'reference']
+
+def owns(module, value):
+    # A class or function belongs to the submodule that defines it, so that a
+    # name which a submodule merely imports, e.g., sympy's 'And' in
+    # 'reference', is not exported and cannot shadow one of ours, e.g., the
+    # action 'And'. Other values are found in the first submodule which has
+    # them, which is where they are defined as every submodule only imports
+    # from those before it.
+    if inspect.isclass(value) or inspect.isroutine(value):
+        return value.__module__ == module.__name__
+    return True
+
+def __getattr__(name):
+    for submodule in submodules:
+        module = importlib.import_module('.' + submodule, __name__)
+        if hasattr(module, name) and owns(module, getattr(module, name)):
+            return getattr(module, name)
+    raise AttributeError("module '" + __name__ + "' has no attribute '" + name + "'")
+
+def __dir__():
+    names = list(globals())
+    for submodule in submodules:
+        module = importlib.import_module('.' + submodule, __name__)
+        names += [name for name in dir(module) if owns(module, getattr(module, name))]
+    return sorted(set(names))
@@ -0,0 +1,493 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+from functools import lru_cache
+from eth_utils import to_checksum_address
+from .constants import PUSH0, PUSH10, PUSH16, PUSH32, NEG, ADD, SUB, MIN, MAX, MUL, DIV, DIV_ROUND_DOWN, DIV_ROUND_UP, LT, EQ, LTEQ, ISZERO, AND, OR, XOR, JUMPDEST, JUMP, READ_TRANSIENT_BALANCE, READ_BALANCE_OF_NATIVE, READ_BALANCE_OF_ERC20, READ_BALANCE_OF_MULTITOKEN, READ_ALLOWANCE_ERC20, READ_ALLOWANCE_PERMIT2, READ_ALLOWANCE_ERC6909, READ_IS_OPERATOR_ERC6909, READ_IS_APPROVED_FOR_ALL_ERC1155, READ_DOUBLE_BALANCE, WRAP_NATIVE, UNWRAP_NATIVE, PERMIT_PERMIT2, PERMIT_BATCH_PERMIT2, TRANSFER_NATIVE, TRANSFER_FROM_PAYER_ERC20, TRANSFER_FROM_PAYER_PERMIT2, TRANSFER_FROM_PAYER_ERC6909, SAFE_TRANSFER_FROM_PAYER_ERC1155, CLEAR, TAKE_TOKEN, TAKE_ERC6909, TAKE_ERC1155, SYNC_TOKEN, SYNC_MULTITOKEN, SETTLE, TRANSFER_TRANSIENT_BALANCE, TRANSFER_TRANSIENT_BALANCE_FROM_PAYER, MODIFY_SINGLE_BALANCE, MODIFY_DOUBLE_BALANCE, SWAP, MODIFY_POSITION, DONATE, QUOTE_SWAP, QUOTE_MODIFY_POSITION, QUOTE_DONATE, QUOTER_TRANSIENT_ACCESS, REVERT, ADDRESS_TABLE, SYNC_TOKEN_REF, TRANSFER_FROM_PAYER_ERC20_REF, TAKE_TOKEN_REF, SETTLE_NET_ERC20, SWAP_ROUTE, CALL_BLOCK, RETURN_BLOCK, LOOP, RETURN_SLOTS
+
+# The packed layout of every action as consumed by 'Operator.unlockCallback',
+# excluding the opcode itself. A field is either '(name, type)' or, for the
+# variable-length parts, '(name, 'bytes', count)' and '(name, fields, count)'
+# where 'count' is the name of an earlier field holding the number of bytes
+# or of repetitions of 'fields'.
+swapLayout = [
+    ('poolId', 'uint256'),
+    ('amountSpecifiedSlot', 'uint8'),
+    ('limitOffsetted', 'uint64'),
+    ('zeroForOne', 'uint8'),
+    ('crossThresholdSlot', 'uint8'),
+    ('successSlot', 'uint8'),
+    ('amount0Slot', 'uint8'),
+    ('amount1Slot', 'uint8'),
+    ('hookDataBytesCount', 'uint16'),
+    ('hookData', 'bytes', 'hookDataBytesCount'),
+]
+
+modifyPositionLayout = [
+    ('poolId', 'uint256'),
+    ('qMinOffsetted', 'uint64'),
+    ('qMaxOffsetted', 'uint64'),
+    ('sharesSlot', 'uint8'),
+    ('successSlot', 'uint8'),
+    ('amount0Slot', 'uint8'),
+    ('amount1Slot', 'uint8'),
+    ('hookDataBytesCount', 'uint16'),
+    ('hookData', 'bytes', 'hookDataBytesCount'),
+]
+
+donateLayout = [
+    ('poolId', 'uint256'),
+    ('sharesSlot', 'uint8'),
+    ('successSlot', 'uint8'),
+    ('amount0Slot', 'uint8'),
+    ('amount1Slot', 'uint8'),
+    ('hookDataBytesCount', 'uint16'),
+    ('hookData', 'bytes', 'hookDataBytesCount'),
+]
+
+readApprovalLayout = [
+    ('token', 'address'),
+    ('owner', 'address'),
+    ('spender', 'address'),
+    ('successSlot', 'uint8'),
+    ('resultSlot', 'uint8'),
+]
+
+transferTransientBalanceLayout = [
+    ('tag', 'uint256'),
+    ('receiver', 'address'),
+    ('amountSlot', 'uint8'),
+    ('successSlot', 'uint8'),
+]
+
+binaryLayout = [('value0Slot', 'uint8'), ('value1Slot', 'uint8'), ('resultSlot', 'uint8')]
+
+layouts = {
+    PUSH0: ('PUSH0', [('valueSlot', 'uint8')]),
+    PUSH10: ('PUSH10', [('value', 'int80'), ('valueSlot', 'uint8')]),
+    PUSH16: ('PUSH16', [('value', 'int128'), ('valueSlot', 'uint8')]),
+    PUSH32: ('PUSH32', [('value', 'int256'), ('valueSlot', 'uint8')]),
+    NEG: ('NEG', [('valueSlot', 'uint8'), ('resultSlot', 'uint8')]),
+    ADD: ('ADD', binaryLayout),
+    SUB: ('SUB', binaryLayout),
+    MIN: ('MIN', binaryLayout),
+    MAX: ('MAX', binaryLayout),
+    MUL: ('MUL', binaryLayout),
+    DIV: ('DIV', binaryLayout),
+    DIV_ROUND_DOWN: ('DIV_ROUND_DOWN', binaryLayout),
+    DIV_ROUND_UP: ('DIV_ROUND_UP', binaryLayout),
+    LT: ('LT', binaryLayout),
+    EQ: ('EQ', binaryLayout),
+    LTEQ: ('LTEQ', binaryLayout),
+    ISZERO: ('ISZERO', [('valueSlot', 'uint8'), ('resultSlot', 'uint8')]),
+    AND: ('AND', binaryLayout),
+    OR: ('OR', binaryLayout),
+    XOR: ('XOR', binaryLayout),
+    JUMPDEST: ('JUMPDEST', []),
+    JUMP: ('JUMP', [('destination', 'uint16'), ('conditionSlot', 'uint8')]),
+    READ_TRANSIENT_BALANCE: ('READ_TRANSIENT_BALANCE', [
+        ('tag', 'uint256'),
+        ('owner', 'address'),
+        ('resultSlot', 'uint8'),
+    ]),
+    READ_BALANCE_OF_NATIVE: ('READ_BALANCE_OF_NATIVE', [('owner', 'address'), ('resultSlot', 'uint8')]),
+    READ_BALANCE_OF_ERC20: ('READ_BALANCE_OF_ERC20', [
+        ('token', 'address'),
+        ('owner', 'address'),
+        ('successSlot', 'uint8'),
+        ('resultSlot', 'uint8'),
+    ]),
+    READ_BALANCE_OF_MULTITOKEN: ('READ_BALANCE_OF_MULTITOKEN', [
+        ('token', 'address'),
+        ('id', 'uint256'),
+        ('owner', 'address'),
+        ('successSlot', 'uint8'),
+        ('resultSlot', 'uint8'),
+    ]),
+    READ_ALLOWANCE_ERC20: ('READ_ALLOWANCE_ERC20', readApprovalLayout),
+    READ_ALLOWANCE_PERMIT2: ('READ_ALLOWANCE_PERMIT2', [
+        ('token', 'address'),
+        ('owner', 'address'),
+        ('spender', 'address'),
+        ('resultSlot', 'uint8'),
+    ]),
+    READ_ALLOWANCE_ERC6909: ('READ_ALLOWANCE_ERC6909', [
+        ('token', 'address'),
+        ('id', 'uint256'),
+        ('owner', 'address'),
+        ('spender', 'address'),
+        ('successSlot', 'uint8'),
+        ('resultSlot', 'uint8'),
+    ]),
+    READ_IS_OPERATOR_ERC6909: ('READ_IS_OPERATOR_ERC6909', readApprovalLayout),
+    READ_IS_APPROVED_FOR_ALL_ERC1155: ('READ_IS_APPROVED_FOR_ALL_ERC1155', readApprovalLayout),
+    READ_DOUBLE_BALANCE: ('READ_DOUBLE_BALANCE', [
+        ('tag0', 'uint256'),
+        ('tag1', 'uint256'),
+        ('owner', 'address'),
+        ('value0Slot', 'uint8'),
+        ('value1Slot', 'uint8'),
+    ]),
+    WRAP_NATIVE: ('WRAP_NATIVE', [('valueSlot', 'uint8'), ('successSlot', 'uint8')]),
+    UNWRAP_NATIVE: ('UNWRAP_NATIVE', [('amountSlot', 'uint8'), ('successSlot', 'uint8')]),
+    PERMIT_PERMIT2: ('PERMIT_PERMIT2', [
+        ('owner', 'address'),
+        ('nonce', 'uint48'),
+        ('amountSlot', 'uint8'),
+        ('token', 'address'),
+        ('expiration', 'uint48'),
+        ('signatureDeadline', 'uint48'),
+        ('spender', 'address'),
+        ('successSlot', 'uint8'),
+        ('signatureByteCount', 'uint8'),
+        ('signature', 'bytes', 'signatureByteCount'),
+    ]),
+    PERMIT_BATCH_PERMIT2: ('PERMIT_BATCH_PERMIT2', [
+        ('owner', 'address'),
+        ('signatureDeadline', 'uint48'),
+        ('signatureByteCount', 'uint8'),
+        ('spender', 'address'),
+        ('successSlot', 'uint8'),
+        ('numberOfPermissions', 'uint8'),
+        ('permissions', [
+            ('token', 'address'),
+            ('amountSlot', 'uint8'),
+            ('expiration', 'uint40'),
+            ('nonce', 'uint48'),
+        ], 'numberOfPermissions'),
+        ('signature', 'bytes', 'signatureByteCount'),
+    ]),
+    TRANSFER_NATIVE: ('TRANSFER_NATIVE', [('to', 'address'), ('amountSlot', 'uint8'), ('successSlot', 'uint8')]),
+    TRANSFER_FROM_PAYER_ERC20: ('TRANSFER_FROM_PAYER_ERC20', [
+        ('token', 'address'),
+        ('amountSlot', 'uint8'),
+        ('to', 'address'),
+        ('successSlot', 'uint8'),
+        ('resultSlot', 'uint8'),
+    ]),
+    TRANSFER_FROM_PAYER_PERMIT2: ('TRANSFER_FROM_PAYER_PERMIT2', [
+        ('to', 'address'),
+        ('amountSlot', 'uint8'),
+        ('token', 'address'),
+        ('successSlot', 'uint8'),
+    ]),
+    TRANSFER_FROM_PAYER_ERC6909: ('TRANSFER_FROM_PAYER_ERC6909', [
+        ('token', 'address'),
+        ('id', 'uint256'),
+        ('to', 'address'),
+        ('amountSlot', 'uint8'),
+        ('successSlot', 'uint8'),
+        ('resultSlot', 'uint8'),
+    ]),
+    SAFE_TRANSFER_FROM_PAYER_ERC1155: ('SAFE_TRANSFER_FROM_PAYER_ERC1155', [
+        ('token', 'address'),
+        ('id', 'uint256'),
+        ('to', 'address'),
+        ('amountSlot', 'uint8'),
+        ('successSlot', 'uint8'),
+        ('dataByteCount', 'uint24'),
+        ('data', 'bytes', 'dataByteCount'),
+    ]),
+    CLEAR: ('CLEAR', [('tag', 'uint256'), ('amountSlot', 'uint8'), ('successSlot', 'uint8')]),
+    TAKE_TOKEN: ('TAKE_TOKEN', [
+        ('token', 'address'),
+        ('to', 'address'),
+        ('amountSlot', 'uint8'),
+        ('successSlot', 'uint8'),
+    ]),
+    TAKE_ERC6909: ('TAKE_ERC6909', [
+        ('token', 'address'),
+        ('id', 'uint256'),
+        ('to', 'address'),
+        ('amountSlot', 'uint8'),
+        ('successSlot', 'uint8'),
+    ]),
+    TAKE_ERC1155: ('TAKE_ERC1155', [
+        ('token', 'address'),
+        ('id', 'uint256'),
+        ('to', 'address'),
+        ('amountSlot', 'uint8'),
+        ('successSlot', 'uint8'),
+        ('dataByteCount', 'uint24'),
+        ('data', 'bytes', 'dataByteCount'),
+    ]),
+    SYNC_TOKEN: ('SYNC_TOKEN', [('token', 'address')]),
+    SYNC_MULTITOKEN: ('SYNC_MULTITOKEN', [('token', 'address'), ('id', 'uint256')]),
+    SETTLE: ('SETTLE', [('valueSlot', 'uint8'), ('successSlot', 'uint8'), ('resultSlot', 'uint8')]),
+    TRANSFER_TRANSIENT_BALANCE: ('TRANSFER_TRANSIENT_BALANCE', transferTransientBalanceLayout),
+    TRANSFER_TRANSIENT_BALANCE_FROM_PAYER: ('TRANSFER_TRANSIENT_BALANCE_FROM_PAYER', transferTransientBalanceLayout),
+    MODIFY_SINGLE_BALANCE: ('MODIFY_SINGLE_BALANCE', [
+        ('tag', 'uint256'),
+        ('amountSlot', 'uint8'),
+        ('successSlot', 'uint8'),
+    ]),
+    MODIFY_DOUBLE_BALANCE: ('MODIFY_DOUBLE_BALANCE', [
+        ('tag0', 'uint256'),
+        ('tag1', 'uint256'),
+        ('amount0Slot', 'uint8'),
+        ('amount1Slot', 'uint8'),
+        ('successSlot', 'uint8'),
+    ]),
+    SWAP: ('SWAP', swapLayout),
+    MODIFY_POSITION: ('MODIFY_POSITION', modifyPositionLayout),
+    DONATE: ('DONATE', donateLayout),
+    QUOTE_SWAP: ('QUOTE_SWAP', swapLayout),
+    QUOTE_MODIFY_POSITION: ('QUOTE_MODIFY_POSITION', modifyPositionLayout),
+    QUOTE_DONATE: ('QUOTE_DONATE', donateLayout),
+    QUOTER_TRANSIENT_ACCESS: ('QUOTER_TRANSIENT_ACCESS', [('transientSlot', 'bytes32'), ('resultSlot', 'uint8')]),
+    REVERT: ('REVERT', []),
+    ADDRESS_TABLE: ('ADDRESS_TABLE', [
+        ('numberOfAddresses', 'uint8'),
+        ('addresses', [('address', 'address')], 'numberOfAddresses'),
+    ]),
+    SYNC_TOKEN_REF: ('SYNC_TOKEN_REF', [('tokenRef', 'uint8')]),
+    TRANSFER_FROM_PAYER_ERC20_REF: ('TRANSFER_FROM_PAYER_ERC20_REF', [
+        ('tokenRef', 'uint8'),
+        ('amountSlot', 'uint8'),
+        ('toRef', 'uint8'),
+        ('successSlot', 'uint8'),
+        ('resultSlot', 'uint8'),
+    ]),
+    TAKE_TOKEN_REF: ('TAKE_TOKEN_REF', [
+        ('tokenRef', 'uint8'),
+        ('toRef', 'uint8'),
+        ('amountSlot', 'uint8'),
+        ('successSlot', 'uint8'),
+    ]),
+    SETTLE_NET_ERC20: ('SETTLE_NET_ERC20', [('token', 'address'), ('amountSlot', 'uint8'), ('successSlot', 'uint8')]),
+    SWAP_ROUTE: ('SWAP_ROUTE', [
+        ('amountSpecifiedSlot', 'uint8'),
+        ('successSlot', 'uint8'),
+        ('amountInSlot', 'uint8'),
+        ('numberOfHops', 'uint8'),
+        ('hops', [
+            ('poolId', 'uint256'),
+            ('limitOffsetted', 'uint64'),
+            ('zeroForOne', 'uint8'),
+            ('amountOutSlot', 'uint8'),
+        ], 'numberOfHops'),
+    ]),
+    CALL_BLOCK: ('CALL_BLOCK', [('destination', 'uint16')]),
+    RETURN_BLOCK: ('RETURN_BLOCK', []),
+    LOOP: ('LOOP', [('destination', 'uint16'), ('counterSlot', 'uint8')]),
+    RETURN_SLOTS: ('RETURN_SLOTS', [
+        ('numberOfSlots', 'uint8'),
+        ('slots', [('valueSlot', 'uint8')], 'numberOfSlots'),
+    ]),
+}
+
+# The slot fields, i.e., the 'uint8' fields whose names end with 'Slot', that
+# each action writes, its other slot fields being read, except for the
+# counter of 'LOOP' which is both read and written.
+written = {opcode: ('successSlot', 'resultSlot') for opcode in layouts}
+for opcode in [PUSH0, PUSH10, PUSH16, PUSH32]:
+    written[opcode] = ('valueSlot',)
+written[READ_DOUBLE_BALANCE] = ('value0Slot', 'value1Slot')
+for opcode in [SWAP, MODIFY_POSITION, DONATE, QUOTE_SWAP, QUOTE_MODIFY_POSITION, QUOTE_DONATE]:
+    written[opcode] = ('successSlot', 'amount0Slot', 'amount1Slot')
+written[SWAP_ROUTE] = ('successSlot', 'amountInSlot', 'amountOutSlot')
+written[LOOP] = ('counterSlot',)
+
+def fieldSize(type):
+    if type == 'address':
+        return 20
+    if type.startswith('bytes'):
+        return int(type[5:])
+    return int(type.lstrip('uint')) // 8
+
+@lru_cache(maxsize = None)
+def toAddress(value):
+    return to_checksum_address(value.to_bytes(20, 'big'))
+
+def encodeField(type, size, value):
+    if type == 'address':
+        if not isinstance(value, str) or len(value) != 42:
+            raise ValueError('Invalid address: ' + repr(value))
+        return bytes.fromhex(value[2:])
+    if type == 'bytes' or type.startswith('bytes'):
+        value = bytes(value)
+        if type != 'bytes' and len(value) != size:
+            raise ValueError('Invalid ' + type + ': ' + repr(value))
+        return value
+    return value.to_bytes(size, 'big', signed = type.startswith('int'))
+
+def decodeField(type, view, pointer, size):
+    end = pointer + size
+    if type == 'address':
+        return toAddress(int.from_bytes(view[pointer:end], 'big'))
+    if type.startswith('bytes'):
+        return bytes(view[pointer:end])
+    return int.from_bytes(view[pointer:end], 'big', signed = type.startswith('int'))
+
+class Action:
+    # The base class of the actions which are generated below from 'layouts',
+    # one class per opcode, e.g., 'Swap' and 'PermitBatchPermit2'. The fields
+    # are the '__slots__' of each class and are given to the constructor in
+    # the order of the layout, positionally or by name. The byte counts of
+    # variable-length fields, e.g., 'hookDataBytesCount', are not stored but
+    # derived from the length of the field that they describe. The entries
+    # of 'permissions' are '(token, amountSlot, expiration, nonce)' tuples
+    # and those of 'addresses' are '(address,)' tuples.
+    #
+    # Fields may hold a 'Slot' or a 'Field' when the action is given to
+    # 'Assembler.action', which encodes it through 'packed'. Otherwise,
+    # 'to_bytes' encodes it without 'eth_abi'. 'offset' is the position of
+    # the opcode relative to the first action when the action is decoded.
+    __slots__ = ('offset',)
+
+    opcode = None
+    name = None
+    layout = []
+    arguments = ()
+    counts = {}
+
+    def __init__(self, *args, **kwargs):
+        if len(args) > len(self.arguments):
+            raise TypeError(type(self).__name__ + ' takes ' + str(len(self.arguments)) + ' fields')
+        for name, value in zip(self.arguments, args):
+            setattr(self, name, value)
+        for name, value in kwargs.items():
+            if name not in self.arguments:
+                raise TypeError(type(self).__name__ + ' has no field ' + repr(name))
+            setattr(self, name, value)
+        for name in self.arguments:
+            if not hasattr(self, name):
+                raise TypeError(type(self).__name__ + ' is missing field ' + repr(name))
+        self.offset = None
+
+    @property
+    def fields(self):
+        # Every field of the layout, including the byte counts.
+        return {field[0]: getattr(self, field[0]) for field in self.layout}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(getattr(self, name) == getattr(other, name) for name in self.arguments)
+
+    def __repr__(self):
+        return type(self).__name__ + '(' + ', '.join(name + '=' + repr(getattr(self, name)) for name in self.arguments) + ')'
+
+    def __len__(self):
+        length = 1
+        for field in self.layout:
+            if len(field) == 2:
+                length += fieldSize(field[1])
+            elif field[1] == 'bytes':
+                length += len(getattr(self, field[0]))
+            else:
+                length += len(getattr(self, field[0])) * sum(fieldSize(type) for name, type in field[1])
+        return length
+
+    def packed(self):
+        # The '(types, values)' pair which 'encode_packed' and
+        # 'Assembler.action' accept.
+        types, values = ['uint8'], [self.opcode]
+        for field in self.layout:
+            if len(field) == 2 or field[1] == 'bytes':
+                types += [field[1]]
+                values += [getattr(self, field[0])]
+            else:
+                for entry in getattr(self, field[0]):
+                    types += [type for name, type in field[1]]
+                    values += list(entry)
+        return types, values
+
+    def to_bytes(self):
+        result = bytearray([self.opcode])
+        try:
+            for field in self.layout:
+                value = getattr(self, field[0])
+                if len(field) == 2:
+                    result += encodeField(field[1], fieldSize(field[1]), value)
+                elif field[1] == 'bytes':
+                    result += encodeField('bytes', None, value)
+                else:
+                    for entry in value:
+                        if len(entry) != len(field[1]):
+                            raise ValueError('Invalid entry of ' + field[0] + ': ' + repr(entry))
+                        for (name, kind), item in zip(field[1], entry):
+                            result += encodeField(kind, fieldSize(kind), item)
+        except (OverflowError, TypeError, AttributeError) as error:
+            raise ValueError(self.__class__.__name__ + ': ' + str(error)) from None
+        return bytes(result)
+
+    def validate(self):
+        # Raises 'ValueError' if a field does not fit its width, including
+        # the byte counts. Returns the action.
+        self.to_bytes()
+        return self
+
+    @classmethod
+    def decode(cls, view, pointer, offset = None):
+        # Decodes the action whose opcode is at 'view[pointer]' and returns it
+        # along with the pointer past it, or 'None' if 'view' ends before the
+        # action does.
+        if cls is Action:
+            if view[pointer] not in classes:
+                raise ValueError('Unknown opcode ' + str(view[pointer]) + ' at offset ' + str(offset))
+            cls = classes[view[pointer]]
+        elif view[pointer] != cls.opcode:
+            raise ValueError('Not a ' + cls.name + ' action at offset ' + str(offset))
+        action = cls.__new__(cls)
+        counts = {}
+        pointer += 1
+        for field in cls.layout:
+            if len(field) == 2:
+                size = fieldSize(field[1])
+                if pointer + size > len(view):
+                    return None
+                value = decodeField(field[1], view, pointer, size)
+                pointer += size
+                if field[0] in cls.counts:
+                    counts[field[0]] = value
+                    continue
+            elif field[1] == 'bytes':
+                size = counts[field[2]]
+                if pointer + size > len(view):
+                    return None
+                value = bytes(view[pointer:pointer + size])
+                pointer += size
+            else:
+                sizes = [fieldSize(type) for name, type in field[1]]
+                if pointer + sum(sizes) * counts[field[2]] > len(view):
+                    return None
+                value = []
+                for k in range(counts[field[2]]):
+                    entry = []
+                    for (name, type), size in zip(field[1], sizes):
+                        entry += [decodeField(type, view, pointer, size)]
+                        pointer += size
+                    value += [tuple(entry)]
+            setattr(action, field[0], value)
+        action.offset = offset
+        return action, pointer
+
+    @classmethod
+    def from_bytes(cls, data):
+        # The inverse of 'to_bytes'. 'Action.from_bytes' accepts any opcode.
+        with memoryview(bytes(data)) as view:
+            if len(view) == 0:
+                raise ValueError('Empty action')
+            result = cls.decode(view, 0)
+            if result is None or result[1] != len(view):
+                raise ValueError('Malformed action')
+        return result[0]
+
+def className(name):
+    return ''.join(word if word.startswith('ERC') else word.capitalize() for word in name.split('_'))
+
+def count(target):
+    return property(lambda self: len(getattr(self, target)))
+
+def define(opcode, name, layout):
+    counts = {field[2]: field[0] for field in layout if len(field) == 3}
+    arguments = tuple(field[0] for field in layout if field[0] not in counts)
+    return type(className(name), (Action,), {
+        '__slots__': arguments,
+        'opcode': opcode,
+        'name': name,
+        'layout': layout,
+        'arguments': arguments,
+        'counts': counts,
+        **{name: count(target) for name, target in counts.items()},
+    })
+
+classes = {opcode: define(opcode, name, layout) for opcode, (name, layout) in layouts.items()}
+globals().update({cls.__name__: cls for cls in classes.values()})
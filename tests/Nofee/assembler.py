@@ -0,0 +1,311 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+from heapq import heappush, heappop
+from eth_abi.packed import encode_packed
+from .actions import Action
+from .constants import ISZERO, JUMPDEST, JUMP, CALL_BLOCK, RETURN_BLOCK, LOOP, FIRST_REGISTER
+
+class Slot:
+    # A transient storage slot whose number is assigned by 'Assembler'. A slot
+    # with 'zero == True' is read without being written first and is therefore
+    # mapped to a slot that no other action of the sequence touches. A slot
+    # with 'memory == True' is mapped to a register in memory, if one is free,
+    # which is cheaper but can only be read back through 'RETURN_SLOTS'.
+    __slots__ = ('zero', 'memory')
+
+    def __init__(self, zero = False, memory = False):
+        self.zero = zero
+        self.memory = memory
+
+class Field:
+    # A named value of an action which 'Template' overwrites after assembly.
+    # 'value' is encoded in its place when the sequence is assembled.
+    __slots__ = ('name', 'value')
+
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+    def __len__(self):
+        return len(self.value)
+
+def packedSize(type, value):
+    if isinstance(value, Field):
+        value = value.value
+    if type == 'bytes':
+        return len(value)
+    if type == 'address':
+        return 20
+    if type == 'bool':
+        return 1
+    if type.startswith('bytes'):
+        return int(type[5:])
+    return int(type.lstrip('uint')) // 8
+
+class Assembler:
+    # Builds the 'uint32 deadline' followed by the packed actions which are
+    # consumed by 'Operator.unlockCallback'. A 'JUMP', 'CALL_BLOCK' or 'LOOP'
+    # refers to a label rather than a byte offset and each label is placed as a
+    # 'JUMPDEST'. 'uint8' fields may hold a 'Slot' instead of a slot number.
+    # Offsets are recorded while the actions are appended and every jump and
+    # slot is patched once in 'assemble', which makes the whole process linear
+    # in the size of the sequence. The actions are also kept in 'program' as
+    # '(types, values, name)' where 'name' is the label of a 'JUMPDEST' or the
+    # destination of a branch which allows 'optimize' to rewrite the sequence.
+    # The offset, type and name of every 'Field' are kept in 'fields' for
+    # 'Template'.
+    def __init__(self):
+        self.actions = bytearray()
+        self.program = []
+        self.count = 0
+        self.labels = {}
+        self.counters = {}
+        self.jumps = []
+        self.slots = []
+        self.fields = []
+        self.reserved = set()
+        self.zero = Slot(zero = True, memory = True)
+
+    def __len__(self):
+        return len(self.actions)
+
+    def slot(self):
+        return Slot()
+
+    def register(self):
+        # A slot for an intermediate value which no one reads back, e.g., an
+        # amount or a success flag.
+        return Slot(memory = True)
+
+    def reserve(self, *numbers):
+        # Excludes slot numbers which are used literally from the allocation.
+        self.reserved.update(numbers)
+        return self
+
+    def action(self, types, values = None, name = None):
+        # 'types' may also be an 'Action', in which case 'values' is omitted.
+        typed = types if isinstance(types, Action) else None
+        if typed is not None:
+            types, values = typed.packed()
+        self.program += [(list(types), list(values), name)]
+        if any(isinstance(value, (Slot, Field)) for value in values):
+            offset = len(self.actions)
+            previous = None
+            _values = []
+            for type, value in zip(types, values):
+                if isinstance(value, Slot):
+                    self.slots += [(offset, value, self.count)]
+                    value = 0
+                if isinstance(value, Field):
+                    # The byte count of a 'bytes' field is the value before it.
+                    self.fields += [(offset, type, value.name, previous if type == 'bytes' else None)]
+                    value = value.value
+                _values += [value]
+                previous = (offset, type)
+                offset += packedSize(type, value)
+            values = _values
+        elif typed is not None:
+            self.actions += typed.to_bytes()
+            self.count += 1
+            return self
+        self.actions += encode_packed(types, values)
+        self.count += 1
+        return self
+
+    def label(self, name):
+        if name in self.labels:
+            raise ValueError('Duplicate label: ' + str(name))
+        self.labels[name] = (len(self.actions), self.count)
+        return self.action(['uint8'], [JUMPDEST], name)
+
+    def branch(self, types, values, name):
+        # The two bytes after the opcode are reserved for the destination.
+        self.jumps += [(len(self.actions) + 1, name, self.count)]
+        return self.action(types, values, name)
+
+    def jump(self, name, conditionSlot):
+        return self.branch(['uint8', 'uint16', 'uint8'], [JUMP, 0, conditionSlot], name)
+
+    def call(self, name):
+        # Runs the block at label 'name' up to its 'RETURN_BLOCK'. Blocks are
+        # placed after a final 'ret' of the main sequence, which ends it.
+        return self.branch(['uint8', 'uint16'], [CALL_BLOCK, 0], name)
+
+    def ret(self):
+        return self.action(['uint8'], [RETURN_BLOCK])
+
+    def loop(self, name, counterSlot):
+        # Opens a loop at label 'name' whose body, up to 'endLoop(name)', runs
+        # as many times as the counter in 'counterSlot', which is decremented
+        # down to zero. 'LOOP' only checks the counter after the body, which
+        # therefore runs once for a zero counter. Hence, a zero counter jumps
+        # past the body here.
+        self.counters[name] = counterSlot
+        skipSlot = self.register()
+        self.action(['uint8', 'uint8', 'uint8'], [ISZERO, counterSlot, skipSlot])
+        self.jump((name, 'endLoop'), skipSlot)
+        return self.label(name)
+
+    def endLoop(self, name):
+        self.branch(['uint8', 'uint16', 'uint8'], [LOOP, 0, self.counters[name]], name)
+        return self.label((name, 'endLoop'))
+
+    def liveRanges(self):
+        # The span between the first and the last action that refer to each
+        # slot, extended over every loop that it intersects. A block may run
+        # from any of its calls, so a call is treated as a loop over the span
+        # from the call, or the block if it comes first, to the end of the
+        # sequence.
+        ranges = {}
+        for position, slot, index in self.slots:
+            first, last = ranges.get(slot, (index, index))
+            ranges[slot] = (min(first, index), max(last, index))
+
+        loops = []
+        for position, name, index in self.jumps:
+            if name not in self.labels:
+                continue
+            label = self.labels[name][1]
+            if self.program[index][1][0] == CALL_BLOCK:
+                loops += [(min(label, index), self.count - 1)]
+            elif label < index:
+                loops += [(label, index)]
+
+        changed = len(loops) > 0
+        while changed:
+            changed = False
+            for slot, (first, last) in ranges.items():
+                for begin, end in loops:
+                    if first <= end and begin <= last and (begin < first or last < end):
+                        first, last = min(first, begin), max(last, end)
+                        ranges[slot] = (first, last)
+                        changed = True
+        return ranges
+
+    def allocate(self):
+        # Linear scan over the live ranges, where a slot number is reused once
+        # the range of its previous holder has ended. Two ranges that share an
+        # action never share a number. Memory slots take a register while any
+        # is free and a transient slot otherwise.
+        ranges = self.liveRanges()
+        free = [number for number in range(1, FIRST_REGISTER) if number not in self.reserved]
+        registers = [number for number in range(FIRST_REGISTER, 256) if number not in self.reserved]
+
+        def take(memory):
+            pool = registers if memory and len(registers) > 0 else free
+            if len(pool) == 0:
+                raise ValueError('Out of transient slots')
+            return heappop(pool)
+
+        allocation = {}
+        zeros = [slot for slot in ranges if slot.zero]
+        if len(zeros) > 0:
+            number = take(all(slot.memory for slot in zeros))
+            for slot in zeros:
+                allocation[slot] = number
+
+        active = []
+        order = sorted([slot for slot in ranges if not slot.zero], key = lambda slot: ranges[slot][0])
+        for k, slot in enumerate(order):
+            first, last = ranges[slot]
+            while len(active) > 0 and active[0][0] < first:
+                number = heappop(active)[2]
+                heappush(registers if number >= FIRST_REGISTER else free, number)
+            allocation[slot] = take(slot.memory)
+            heappush(active, (last, k, allocation[slot]))
+        return allocation
+
+    def assemble(self, deadline):
+        actions = bytearray(self.actions)
+        for position, name, index in self.jumps:
+            if name not in self.labels:
+                raise ValueError('Undefined label: ' + str(name))
+            destination = self.labels[name][0]
+            if destination >= (1 << 16):
+                raise ValueError('Jump destination out of range: ' + str(name))
+            actions[position:position + 2] = destination.to_bytes(2, 'big')
+        allocation = self.allocate()
+        for position, slot, index in self.slots:
+            actions[position] = allocation[slot]
+        return encode_packed(['uint32'], [deadline]) + bytes(actions)
+
+class Template:
+    # A sequence which is encoded once and then filled with new values of its
+    # fields. 'assembler' holds actions with 'Field' values which are located
+    # in the assembled bytes. 'fill' writes the new values into a copy of the
+    # bytes through a 'memoryview'. The jump destinations are only recomputed
+    # when a 'bytes' field changes length, in which case its byte count is
+    # rewritten as well. A name may be shared by several fields, except for
+    # 'bytes' fields, and 'deadline' is a field of every template. 'optimize'
+    # does not treat fields as constants, e.g., a 'PUSH32' of a 'Field' is not
+    # narrowed.
+    def __init__(self, assembler, deadline):
+        self.data = assembler.assemble(deadline)
+        self.fields = {'deadline': [(-4, 'uint32', None)]}
+        for offset, type, name, count in assembler.fields:
+            self.fields.setdefault(name, []).append((offset, type, count))
+        self.jumps = [(position, assembler.labels[name][0]) for position, name, index in assembler.jumps]
+
+    def fill(self, **values):
+        # Returns the bytes of the sequence with the given fields replaced.
+        # The other fields keep the values that the template was built with.
+        fields = self.fields
+        data = self.data
+        resized = [
+            (fields[name][0][0], len(value) - len(self._read(name)), name)
+            for name, value in values.items() if fields[name][0][1] == 'bytes' and len(value) != len(self._read(name))
+        ]
+        if len(resized) > 0:
+            fields, data = self._resize(sorted(resized), values)
+
+        data = bytearray(data)
+        with memoryview(data) as view:
+            for name, value in values.items():
+                for offset, type, count in fields[name]:
+                    offset += 4
+                    if type == 'bytes':
+                        view[offset:offset + len(value)] = value
+                    elif type == 'address':
+                        view[offset:offset + 20] = bytes.fromhex(value[2:])
+                    else:
+                        size = packedSize(type, 0)
+                        view[offset:offset + size] = value.to_bytes(size, 'big', signed = type.startswith('int'))
+        return bytes(data)
+
+    def _read(self, name):
+        offset, type, count = self.fields[name][0]
+        length = int.from_bytes(self.data[count[0] + 4:count[0] + 4 + packedSize(count[1], 0)], 'big')
+        return self.data[offset + 4:offset + 4 + length]
+
+    def _resize(self, resized, values):
+        # Splices the 'bytes' fields which change length into the data and
+        # shifts every offset and jump destination after them.
+        def shift(offset):
+            return offset + sum(delta for start, delta, name in resized if start < offset)
+
+        data = bytearray()
+        position = 0
+        for start, delta, name in resized:
+            old = len(self._read(name))
+            data += self.data[position:start + 4] + bytes(old + delta)
+            position = start + 4 + old
+        data += self.data[position:]
+
+        fields = {
+            name: [(shift(offset) if offset >= 0 else offset, type, count) for offset, type, count in entries]
+            for name, entries in self.fields.items()
+        }
+        with memoryview(data) as view:
+            for start, delta, name in resized:
+                offset, type, count = fields[name][0]
+                countOffset = shift(count[0]) + 4
+                size = packedSize(count[1], 0)
+                if len(values[name]) >= (1 << (8 * size)):
+                    raise ValueError('Byte count out of range: ' + str(name))
+                view[countOffset:countOffset + size] = len(values[name]).to_bytes(size, 'big')
+            for position, destination in self.jumps:
+                destination = shift(destination)
+                if destination >= (1 << 16):
+                    raise ValueError('Jump destination out of range: ' + str(destination))
+                position = shift(position) + 4
+                view[position:position + 2] = destination.to_bytes(2, 'big')
+        return fields, data
@@ -0,0 +1,199 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+minLogStep = (1 << 59) >> 27
+minLogSpacing = (1 << 59) >> 19
+thirtyTwoX59 = 1 << 64
+
+isPreInitialize = 1 << 160
+isPostInitialize = 1 << 161
+isPreMint = 1 << 162
+isMidMint = 1 << 163
+isPostMint = 1 << 164
+isPreBurn = 1 << 165
+isMidBurn = 1 << 166
+isPostBurn = 1 << 167
+isPreSwap = 1 << 168
+isMidSwap = 1 << 169
+isPostSwap = 1 << 170
+isPreDonate = 1 << 171
+isMidDonate = 1 << 172
+isPostDonate = 1 << 173
+isPreModifyKernel = 1 << 174
+isMidModifyKernel = 1 << 175
+isPostModifyKernel = 1 << 176
+isMutableKernel = 1 << 177
+isMutablePoolGrowthPortion = 1 << 178
+isDonateAllowed = 1 << 179
+
+_freeMemoryPointer_ = 64
+_blank_ = 96
+_hookSelector_ = 128
+_hookInputHeader_ = 132
+_hookInputByteCount_ = 164
+_msgSender_ = 196
+_poolId_ = 216
+_swapInput_ = 248
+_crossThreshold_ = 248
+_amountSpecified_ = 264
+_logPriceLimit_ = 296
+_logPriceLimitOffsetted_ = 328
+_swapParams_ = 336
+_zeroForOne_ = 336
+_exactInput_ = 337
+_integralLimit_ = 338
+_integralLimitInterval_ = 365
+_amount0_ = 392
+_amount1_ = 424
+_back_ = 456
+_next_ = 518
+_backGrowthMultiplier_ = 580
+_nextGrowthMultiplier_ = 612
+_interval_ = 644
+_direction_ = 644
+_indexCurve_ = 645
+_indexKernelTotal_ = 647
+_indexKernelForward_ = 649
+_logPriceLimitOffsettedWithinInterval_ = 651
+_current_ = 659
+_origin_ = 721
+_begin_ = 783
+_end_ = 845
+_target_ = 907
+_overshoot_ = 969
+_total0_ = 1033
+_total1_ = 1097
+_forward0_ = 1161
+_forward1_ = 1225
+_incomingCurrentToTarget_ = 1287
+_currentToTarget_ = 1314
+_currentToOrigin_ = 1341
+_currentToOvershoot_ = 1368
+_targetToOvershoot_ = 1395
+_originToOvershoot_ = 1422
+_accruedParams_ = 1449
+_accrued0_ = 1449
+_accrued1_ = 1481
+_poolRatio0_ = 1513
+_poolRatio1_ = 1516
+_pointers_ = 1519
+_kernel_ = 1519
+_curve_ = 1551
+_hookData_ = 1583
+_kernelLength_ = 1615
+_curveLength_ = 1617
+_hookDataByteCount_ = 1619
+_dynamicParams_ = 1621
+_staticParamsStoragePointer_ = 1653
+_logPriceCurrent_ = 1655
+_sharesTotal_ = 1663
+_growth_ = 1679
+_integral0_ = 1695
+_integral1_ = 1722
+_deploymentCreationCode_ = 1749
+_staticParams_ = 1760
+_tag0_ = 1760
+_tag1_ = 1792
+_sqrtOffset_ = 1824
+_sqrtInverseOffset_ = 1856
+_spacing_ = 1888
+_outgoingMax_ = 1950
+_outgoingMaxModularInverse_ = 1977
+_incomingMax_ = 2009
+_poolGrowthPortion_ = 2036
+_maxPoolGrowthPortion_ = 2042
+_protocolGrowthPortion_ = 2048
+_pendingKernelLength_ = 2054
+_endOfStaticParams_ = 2056
+_modifyPositionInput_ = 248
+_logPriceMinOffsetted_ = 248
+_logPriceMaxOffsetted_ = 256
+_shares_ = 264
+_logPriceMin_ = 296
+_logPriceMax_ = 328
+_positionAmount0_ = 360
+_positionAmount1_ = 392
+_endOfModifyPosition_ = 424
+
+PUSH0 = 0
+PUSH10 = 1
+PUSH16 = 2
+PUSH32 = 3
+NEG = 4
+ADD = 5
+SUB = 6
+MIN = 7
+MAX = 8
+MUL = 9
+DIV = 10
+DIV_ROUND_DOWN = 11
+DIV_ROUND_UP = 12
+LT = 13
+EQ = 14
+LTEQ = 15
+ISZERO = 16
+AND = 17
+OR = 18
+XOR = 19
+JUMPDEST = 20
+JUMP = 21
+READ_TRANSIENT_BALANCE = 22
+READ_BALANCE_OF_NATIVE = 23
+READ_BALANCE_OF_ERC20 = 24
+READ_BALANCE_OF_MULTITOKEN = 25
+READ_ALLOWANCE_ERC20 = 26
+READ_ALLOWANCE_PERMIT2 = 27
+READ_ALLOWANCE_ERC6909 = 28
+READ_IS_OPERATOR_ERC6909 = 29
+READ_IS_APPROVED_FOR_ALL_ERC1155 = 30
+READ_DOUBLE_BALANCE = 31
+WRAP_NATIVE = 32
+UNWRAP_NATIVE = 33
+PERMIT_PERMIT2 = 34
+PERMIT_BATCH_PERMIT2 = 35
+TRANSFER_NATIVE = 36
+TRANSFER_FROM_PAYER_ERC20 = 37
+TRANSFER_FROM_PAYER_PERMIT2 = 38
+TRANSFER_FROM_PAYER_ERC6909 = 39
+SAFE_TRANSFER_FROM_PAYER_ERC1155 = 40
+CLEAR = 41
+TAKE_TOKEN = 42
+TAKE_ERC6909 = 43
+TAKE_ERC1155 = 44
+SYNC_TOKEN = 45
+SYNC_MULTITOKEN = 46
+SETTLE = 47
+TRANSFER_TRANSIENT_BALANCE = 48
+TRANSFER_TRANSIENT_BALANCE_FROM_PAYER = 49
+MODIFY_SINGLE_BALANCE = 50
+MODIFY_DOUBLE_BALANCE = 51
+SWAP = 52
+MODIFY_POSITION = 53
+DONATE = 54
+QUOTE_SWAP = 55
+QUOTE_MODIFY_POSITION = 56
+QUOTE_DONATE = 57
+QUOTER_TRANSIENT_ACCESS = 58
+REVERT = 59
+ADDRESS_TABLE = 60
+SYNC_TOKEN_REF = 61
+TRANSFER_FROM_PAYER_ERC20_REF = 62
+TAKE_TOKEN_REF = 63
+SETTLE_NET_ERC20 = 64
+SWAP_ROUTE = 65
+CALL_BLOCK = 66
+RETURN_BLOCK = 67
+LOOP = 68
+RETURN_SLOTS = 69
+
+# Slots from 'FIRST_REGISTER' onwards are registers in the memory of the
+# operator rather than transient storage slots.
+FIRST_REGISTER = 248
+
+X15 = 2**15
+X59 = 2**59
+X63 = 2**63
+X60 = 2**60
+X64 = 2**64
+X216 = 2**216
+X256 = 2**256
+
+address0 = '0x0000000000000000000000000000000000000000'
@@ -0,0 +1,92 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+from .actions import Action
+
+class Decoder:
+    # Decodes the 'data' of 'nofeeswap.unlock' incrementally. Chunks of any
+    # size are given to 'feed' which yields every action that is complete so
+    # far and keeps the remainder for the next chunk. 'deadline' is set once
+    # the first four bytes arrive. 'close' raises if the data ends within an
+    # action. An unknown opcode raises 'ValueError' since the operator reverts
+    # on it and the rest of the data has no meaning.
+    def __init__(self):
+        self.buffer = bytearray()
+        self.offset = 0
+        self.deadline = None
+
+    def feed(self, chunk):
+        self.buffer += chunk
+        if self.deadline is None:
+            if len(self.buffer) < 4:
+                return
+            self.deadline = int.from_bytes(self.buffer[0:4], 'big')
+            del self.buffer[0:4]
+        pointer = 0
+        with memoryview(self.buffer) as view:
+            while pointer < len(view):
+                result = Action.decode(view, pointer, self.offset + pointer)
+                if result is None:
+                    break
+                action, pointer = result
+                yield action
+        del self.buffer[0:pointer]
+        self.offset += pointer
+
+    def close(self):
+        if self.deadline is None or len(self.buffer) > 0:
+            raise ValueError('Truncated action at offset ' + str(self.offset))
+
+def decodeStream(stream, chunkSize = 1 << 16):
+    # Yields the actions read from the binary file-like 'stream' one chunk at
+    # a time so that arbitrarily large payloads are decoded in constant
+    # memory.
+    decoder = Decoder()
+    while True:
+        chunk = stream.read(chunkSize)
+        if not chunk:
+            break
+        yield from decoder.feed(chunk)
+    decoder.close()
+
+def decodeActions(data):
+    # Returns the deadline and the list of actions of 'data'.
+    decoder = Decoder()
+    actions = list(decoder.feed(data))
+    decoder.close()
+    return decoder.deadline, actions
+
+def encodeActions(deadline, actions):
+    # The inverse of 'decodeActions'.
+    result = bytearray(deadline.to_bytes(4, 'big'))
+    for action in actions:
+        result += action.to_bytes()
+    return bytes(result)
+
+def decodeResult(result):
+    # The signed values of the slots of 'RETURN_SLOTS' from the 'bytes' that
+    # 'nofeeswap.unlock' returns, e.g., through an 'eth_call'.
+    result = bytes(result)
+    if len(result) % 32 != 0:
+        raise ValueError('Malformed result of ' + str(len(result)) + ' bytes')
+    return [
+        int.from_bytes(result[k:k + 32], 'big', signed = True) for k in range(0, len(result), 32)
+    ]
+
+def disassemble(data):
+    # A listing of 'data' with one action per line, preceded by its offset.
+    # Offsets, and the destinations of jumps, are in hexadecimal.
+    deadline, actions = decodeActions(data)
+    lines = ['deadline ' + str(deadline)]
+    for action in actions:
+        operands = []
+        fields = action.fields
+        for field in action.layout:
+            value = fields[field[0]]
+            if field[0] == 'destination':
+                value = '{:04x}'.format(value)
+            elif isinstance(value, bytes):
+                value = '0x' + value.hex()
+            elif field[1] == 'uint256':
+                value = hex(value)
+            operands += [field[0] + '=' + str(value)]
+        lines += [' '.join(['{:04x}'.format(action.offset), action.name] + operands)]
+    return '\n'.join(lines)
@@ -0,0 +1,947 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+from sha3 import keccak_256
+from eth_utils import to_checksum_address
+from .actions import toAddress
+from .constants import X256, FIRST_REGISTER, PUSH0, PUSH10, PUSH16, PUSH32, NEG, ADD, SUB, MIN, MAX, MUL, DIV, DIV_ROUND_DOWN, DIV_ROUND_UP, LT, EQ, LTEQ, ISZERO, AND, OR, XOR, JUMPDEST, JUMP, READ_TRANSIENT_BALANCE, READ_BALANCE_OF_NATIVE, READ_BALANCE_OF_ERC20, READ_BALANCE_OF_MULTITOKEN, READ_ALLOWANCE_ERC20, READ_ALLOWANCE_PERMIT2, READ_ALLOWANCE_ERC6909, READ_IS_OPERATOR_ERC6909, READ_IS_APPROVED_FOR_ALL_ERC1155, READ_DOUBLE_BALANCE, WRAP_NATIVE, UNWRAP_NATIVE, PERMIT_PERMIT2, PERMIT_BATCH_PERMIT2, TRANSFER_NATIVE, TRANSFER_FROM_PAYER_ERC20, TRANSFER_FROM_PAYER_PERMIT2, TRANSFER_FROM_PAYER_ERC6909, SAFE_TRANSFER_FROM_PAYER_ERC1155, CLEAR, TAKE_TOKEN, TAKE_ERC6909, TAKE_ERC1155, SYNC_TOKEN, SYNC_MULTITOKEN, SETTLE, TRANSFER_TRANSIENT_BALANCE, TRANSFER_TRANSIENT_BALANCE_FROM_PAYER, MODIFY_SINGLE_BALANCE, MODIFY_DOUBLE_BALANCE, SWAP, MODIFY_POSITION, DONATE, QUOTE_SWAP, QUOTE_MODIFY_POSITION, QUOTE_DONATE, QUOTER_TRANSIENT_ACCESS, ADDRESS_TABLE, SYNC_TOKEN_REF, TRANSFER_FROM_PAYER_ERC20_REF, TAKE_TOKEN_REF, SETTLE_NET_ERC20, SWAP_ROUTE, CALL_BLOCK, RETURN_BLOCK, LOOP, RETURN_SLOTS
+
+X255 = 1 << 255
+X128 = 1 << 128
+X160 = 1 << 160
+mask256 = X256 - 1
+
+class OperatorRevert(Exception):
+    # Raised when the emulated 'unlockCallback' reverts. 'reason' is either
+    # the name of the custom error of the operator or 'Revert' when the revert
+    # data of the latest call is bubbled up, in which case it is in 'data'.
+    def __init__(self, reason, data = b''):
+        super().__init__(reason)
+        self.reason = reason
+        self.data = data
+
+class Mock:
+    # The contracts that the operator interacts with. 'call' receives the
+    # address being called, the Solidity signature of the function, its
+    # arguments and the attached native value and returns the success flag
+    # and the return data of the call. The value transfers of
+    # 'TRANSFER_NATIVE' and the final refund use the empty signature. 'balance'
+    # serves 'READ_BALANCE_OF_NATIVE' and the final refund to the payer.
+    #
+    # 'MODIFY_POSITION' and 'DONATE' are dispatched by nofeeswap to its
+    # delegatee. The mock receives the dispatched 'modifyPosition' and
+    # 'donate' rather than 'dispatch(bytes)'.
+    #
+    # By default, every call succeeds with no return data and every balance
+    # is zero.
+    def call(self, target, signature, arguments, value):
+        return True, b''
+
+    def balance(self, owner):
+        return 0
+
+    @staticmethod
+    def words(*values):
+        # The return data of a call which returns the given 256-bit words.
+        return b''.join((value % X256).to_bytes(32, 'big') for value in values)
+
+def toSigned(value):
+    return value - X256 if value >= X255 else value
+
+def signExtend(value, length):
+    bits = length << 3
+    if value >= (1 << (bits - 1)):
+        value -= (1 << bits)
+    return value % X256
+
+def sdiv(value0, value1):
+    # EVM 'sdiv' rounds towards zero and 'sdiv(-2 ** 255, -1) == -2 ** 255'.
+    value0, value1 = toSigned(value0), toSigned(value1)
+    if value1 == 0:
+        return 0
+    quotient = abs(value0) // abs(value1)
+    return (quotient if (value0 < 0) == (value1 < 0) else - quotient) % X256
+
+def smod(value0, value1):
+    value0, value1 = toSigned(value0), toSigned(value1)
+    if value1 == 0:
+        return 0
+    remainder = abs(value0) % abs(value1)
+    return (remainder if value0 >= 0 else - remainder) % X256
+
+class Emulator:
+    # A pure Python model of 'Operator.unlockCallback'. 'run' executes the
+    # 'data' that is given to 'nofeeswap.unlock', i.e., 'uint32 deadline'
+    # followed by the packed actions, against 'mock'. Transient slots live in
+    # 'slots' as 256-bit words and persist across runs, as within a single
+    # transaction, while the registers from 'FIRST_REGISTER' onwards live in
+    # 'registers' and start from zero in every run, as the memory of every
+    # call to 'unlockCallback' does, and so does the return stack of
+    # 'CALL_BLOCK' which holds the pointers to return to. 'result' holds the
+    # 'bytes' of 'RETURN_SLOTS' which 'nofeeswap.unlock' returns, and is empty
+    # if the run has none. A revert raises 'OperatorRevert' and discards the
+    # writes of the run. The scratch memory '[0, 64)' which receives the
+    # return data of the calls is modeled as well, since a call which returns
+    # fewer bytes leaves the previous content in place.
+    #
+    # 'transientBalanceSlot' and 'doubleBalanceSlot' are the storage
+    # constants of the core which are hashed by 'READ_TRANSIENT_BALANCE' and
+    # 'READ_DOUBLE_BALANCE'. 'maxSteps' bounds the number of actions per run
+    # in place of the gas limit.
+    def __init__(
+        self,
+        mock,
+        nofeeswap,
+        operator,
+        payer,
+        permit2 = '0x' + '00' * 20,
+        weth9 = '0x' + '00' * 20,
+        quoter = '0x' + '00' * 20,
+        transientBalanceSlot = 0,
+        doubleBalanceSlot = 0,
+        maxSteps = 1 << 20
+    ):
+        self.mock = mock
+        self.nofeeswap = to_checksum_address(nofeeswap)
+        self.operator = to_checksum_address(operator)
+        self.payer = to_checksum_address(payer)
+        self.permit2 = to_checksum_address(permit2)
+        self.weth9 = to_checksum_address(weth9)
+        self.quoter = to_checksum_address(quoter)
+        self.transientBalanceSlot = transientBalanceSlot
+        self.doubleBalanceSlot = doubleBalanceSlot
+        self.maxSteps = maxSteps
+        self.slots = {}
+        self.registers = {}
+        self.returnStack = []
+        self.memory = bytearray(64)
+        self.returnData = b''
+        self.result = b''
+        self.actions = {
+            PUSH0: self._push0,
+            PUSH10: self._push10,
+            PUSH16: self._push16,
+            PUSH32: self._push32,
+            NEG: self._neg,
+            ADD: self._add,
+            SUB: self._sub,
+            MIN: self._min,
+            MAX: self._max,
+            MUL: self._mul,
+            DIV: self._div,
+            DIV_ROUND_DOWN: self._divRoundDown,
+            DIV_ROUND_UP: self._divRoundUp,
+            LT: self._lt,
+            EQ: self._eq,
+            LTEQ: self._lteq,
+            ISZERO: self._iszero,
+            AND: self._and,
+            OR: self._or,
+            XOR: self._xor,
+            JUMPDEST: self._jumpdest,
+            JUMP: self._jump,
+            READ_TRANSIENT_BALANCE: self._readTransientBalance,
+            READ_BALANCE_OF_NATIVE: self._readBalanceOfNative,
+            READ_BALANCE_OF_ERC20: self._readBalanceOfERC20,
+            READ_BALANCE_OF_MULTITOKEN: self._readBalanceOfMultiToken,
+            READ_ALLOWANCE_ERC20: self._readAllowanceERC20,
+            READ_ALLOWANCE_PERMIT2: self._readAllowancePermit2,
+            READ_ALLOWANCE_ERC6909: self._readAllowanceERC6909,
+            READ_IS_OPERATOR_ERC6909: self._readIsOperatorERC6909,
+            READ_IS_APPROVED_FOR_ALL_ERC1155: self._readIsApprovedForAllERC1155,
+            READ_DOUBLE_BALANCE: self._readDoubleBalance,
+            WRAP_NATIVE: self._wrapNative,
+            UNWRAP_NATIVE: self._unwrapNative,
+            PERMIT_PERMIT2: self._permitPermit2,
+            PERMIT_BATCH_PERMIT2: self._permitBatchPermit2,
+            TRANSFER_NATIVE: self._transferNative,
+            TRANSFER_FROM_PAYER_ERC20: self._transferFromPayerERC20,
+            TRANSFER_FROM_PAYER_PERMIT2: self._transferFromPayerPermit2,
+            TRANSFER_FROM_PAYER_ERC6909: self._transferFromPayerERC6909,
+            SAFE_TRANSFER_FROM_PAYER_ERC1155: self._safeTransferFromPayerERC1155,
+            CLEAR: self._clear,
+            TAKE_TOKEN: self._takeToken,
+            TAKE_ERC6909: self._takeERC6909,
+            TAKE_ERC1155: self._takeERC1155,
+            SYNC_TOKEN: self._syncToken,
+            SYNC_MULTITOKEN: self._syncMultiToken,
+            SETTLE: self._settle,
+            TRANSFER_TRANSIENT_BALANCE: self._transferTransientBalance,
+            TRANSFER_TRANSIENT_BALANCE_FROM_PAYER: self._transferTransientBalanceFromPayer,
+            MODIFY_SINGLE_BALANCE: self._modifySingleBalance,
+            MODIFY_DOUBLE_BALANCE: self._modifyDoubleBalance,
+            SWAP: self._swap,
+            MODIFY_POSITION: self._modifyPosition,
+            DONATE: self._donate,
+            QUOTE_SWAP: self._quoteSwap,
+            QUOTE_MODIFY_POSITION: self._quoteModifyPosition,
+            QUOTE_DONATE: self._quoteDonate,
+            QUOTER_TRANSIENT_ACCESS: self._quoterTransientAccess,
+            ADDRESS_TABLE: self._addressTable,
+            SYNC_TOKEN_REF: self._syncTokenRef,
+            TRANSFER_FROM_PAYER_ERC20_REF: self._transferFromPayerERC20Ref,
+            TAKE_TOKEN_REF: self._takeTokenRef,
+            SETTLE_NET_ERC20: self._settleNetERC20,
+            SWAP_ROUTE: self._swapRoute,
+            CALL_BLOCK: self._callBlock,
+            RETURN_BLOCK: self._returnBlock,
+            LOOP: self._loop,
+            RETURN_SLOTS: self._returnSlots,
+        }
+
+    def tload(self, slot):
+        if slot >= FIRST_REGISTER:
+            return self.registers.get(slot, 0)
+        return self.slots.get(slot, 0)
+
+    def tstore(self, slot, value):
+        if slot >= FIRST_REGISTER:
+            self.registers[slot] = value % X256
+        else:
+            self.slots[slot] = value % X256
+
+    def run(self, data, timestamp = None):
+        data = bytes(data)
+        deadline = int.from_bytes(data[0:4].ljust(4, b'\x00'), 'big')
+        if timestamp is not None and timestamp > deadline:
+            raise OperatorRevert('DeadlinePassed')
+
+        snapshot = dict(self.slots)
+        self.data = data
+        self.registers = {}
+        self.returnStack = []
+        self.memory = bytearray(64)
+        self.returnData = b''
+        self.result = b''
+        try:
+            pointer = 4
+            steps = 0
+            while pointer < len(data):
+                steps += 1
+                if steps > self.maxSteps:
+                    raise OperatorRevert('OutOfSteps')
+                action = data[pointer]
+                if action not in self.actions:
+                    raise OperatorRevert('Revert', self.returnData)
+                pointer = self.actions[action](pointer + 1)
+
+            balance = self.mock.balance(self.operator)
+            if balance > 0:
+                success = self._call(self.payer, '', (), balance, 0)
+                if not success:
+                    raise OperatorRevert('Revert', self.returnData)
+        except OperatorRevert:
+            self.slots = snapshot
+            raise
+        return self
+
+    def _load(self, length, pointer):
+        chunk = self.data[pointer:pointer + length]
+        if len(chunk) < length:
+            chunk = chunk.ljust(length, b'\x00')
+        return int.from_bytes(chunk, 'big'), pointer + length
+
+    def _loadSlots(self, count, pointer):
+        chunk = self.data[pointer:pointer + count]
+        if len(chunk) < count:
+            chunk = chunk.ljust(count, b'\x00')
+        return list(chunk), pointer + count
+
+    def _copy(self, length, pointer):
+        return self.data[pointer:pointer + length].ljust(length, b'\x00'), pointer + length
+
+    def _mstore(self, offset, value):
+        # Only the scratch space '[0, 64)' is modeled.
+        word = (value % X256).to_bytes(32, 'big')
+        end = min(offset + 32, 64)
+        if offset < end:
+            self.memory[offset:end] = word[:end - offset]
+
+    def _mstoreSelector(self, signature):
+        self._mstore(0, int.from_bytes(keccak_256(signature.encode('utf-8')).digest()[:4], 'big') << 224)
+
+    def _mload(self, offset):
+        return int.from_bytes(self.memory[offset:offset + 32], 'big')
+
+    def _call(self, target, signature, arguments, value, outputSize):
+        success, returnData = self.mock.call(target, signature, arguments, value)
+        self.returnData = bytes(returnData)
+        output = self.returnData[:outputSize]
+        self.memory[0:len(output)] = output
+        return int(bool(success))
+
+    def _verifyUnsigned(self, slot):
+        amount = self.tload(slot)
+        if amount >= X255:
+            raise OperatorRevert('SafeMathError')
+        return amount
+
+    def _address(self, reference):
+        # The address table, if any, is the first action of 'data'.
+        header, pointer = self._load(2, 4)
+        if header >> 8 != ADDRESS_TABLE or reference >= header & 0xFF:
+            raise OperatorRevert('InvalidAddressReference')
+        return self._load(20, pointer + 20 * reference)[0]
+
+    def _removeOffset(self, limitOffsetted, poolId):
+        logOffset = toSigned(signExtend((poolId >> 180) & 0xFF, 1))
+        return limitOffsetted - (1 << 63) + (logOffset << 59)
+
+    def _addressTable(self, pointer):
+        if pointer != 5:
+            raise OperatorRevert('InvalidAddressTable')
+        numberOfAddresses, pointer = self._load(1, pointer)
+        return pointer + 20 * numberOfAddresses
+
+    def _push0(self, pointer):
+        (valueSlot,), pointer = self._loadSlots(1, pointer)
+        self.tstore(valueSlot, 0)
+        return pointer
+
+    def _push10(self, pointer):
+        value, pointer = self._load(10, pointer)
+        (valueSlot,), pointer = self._loadSlots(1, pointer)
+        self.tstore(valueSlot, signExtend(value, 10))
+        return pointer
+
+    def _push16(self, pointer):
+        value, pointer = self._load(16, pointer)
+        (valueSlot,), pointer = self._loadSlots(1, pointer)
+        self.tstore(valueSlot, signExtend(value, 16))
+        return pointer
+
+    def _push32(self, pointer):
+        value, pointer = self._load(32, pointer)
+        (valueSlot,), pointer = self._loadSlots(1, pointer)
+        self.tstore(valueSlot, value)
+        return pointer
+
+    def _neg(self, pointer):
+        (valueSlot, resultSlot), pointer = self._loadSlots(2, pointer)
+        value = self.tload(valueSlot)
+        if value == X255:
+            raise OperatorRevert('SafeMathError')
+        self.tstore(resultSlot, - value)
+        return pointer
+
+    def _binary(self, pointer):
+        (value0Slot, value1Slot, resultSlot), pointer = self._loadSlots(3, pointer)
+        return self.tload(value0Slot), self.tload(value1Slot), resultSlot, pointer
+
+    def _add(self, pointer):
+        value0, value1, resultSlot, pointer = self._binary(pointer)
+        result = toSigned(value0) + toSigned(value1)
+        if not - X255 <= result < X255:
+            raise OperatorRevert('SafeMathError')
+        self.tstore(resultSlot, result)
+        return pointer
+
+    def _sub(self, pointer):
+        value0, value1, resultSlot, pointer = self._binary(pointer)
+        result = toSigned(value0) - toSigned(value1)
+        if not - X255 <= result < X255:
+            raise OperatorRevert('SafeMathError')
+        self.tstore(resultSlot, result)
+        return pointer
+
+    def _min(self, pointer):
+        value0, value1, resultSlot, pointer = self._binary(pointer)
+        self.tstore(resultSlot, min(toSigned(value0), toSigned(value1)))
+        return pointer
+
+    def _max(self, pointer):
+        value0, value1, resultSlot, pointer = self._binary(pointer)
+        self.tstore(resultSlot, max(toSigned(value0), toSigned(value1)))
+        return pointer
+
+    def _mul(self, pointer):
+        # The overflow check of the operator is reproduced as is, i.e.,
+        # 'sdiv(result, value0) == value1' whenever 'value0 != 0'.
+        value0, value1, resultSlot, pointer = self._binary(pointer)
+        result = (value0 * value1) % X256
+        if value0 > 0 and sdiv(result, value0) != value1:
+            raise OperatorRevert('SafeMathError')
+        self.tstore(resultSlot, result)
+        return pointer
+
+    def _safeDivision(self, value0, value1):
+        if value1 == 0 or (value0 == X255 and value1 == mask256):
+            raise OperatorRevert('SafeMathError')
+
+    def _div(self, pointer):
+        value0, value1, resultSlot, pointer = self._binary(pointer)
+        self._safeDivision(value0, value1)
+        self.tstore(resultSlot, sdiv(value0, value1))
+        return pointer
+
+    def _divRoundDown(self, pointer):
+        value0, value1, resultSlot, pointer = self._binary(pointer)
+        self._safeDivision(value0, value1)
+        adjust = int((toSigned(value0) < 0) == (toSigned(value1) > 0) and smod(value0, value1) > 0)
+        self.tstore(resultSlot, sdiv(value0, value1) - adjust)
+        return pointer
+
+    def _divRoundUp(self, pointer):
+        value0, value1, resultSlot, pointer = self._binary(pointer)
+        self._safeDivision(value0, value1)
+        adjust = int((toSigned(value0) < 0) == (toSigned(value1) < 0) and smod(value0, value1) > 0)
+        self.tstore(resultSlot, sdiv(value0, value1) + adjust)
+        return pointer
+
+    def _lt(self, pointer):
+        value0, value1, resultSlot, pointer = self._binary(pointer)
+        self.tstore(resultSlot, int(toSigned(value0) < toSigned(value1)))
+        return pointer
+
+    def _eq(self, pointer):
+        value0, value1, resultSlot, pointer = self._binary(pointer)
+        self.tstore(resultSlot, int(value0 == value1))
+        return pointer
+
+    def _lteq(self, pointer):
+        value0, value1, resultSlot, pointer = self._binary(pointer)
+        self.tstore(resultSlot, int(toSigned(value0) <= toSigned(value1)))
+        return pointer
+
+    def _iszero(self, pointer):
+        (valueSlot, resultSlot), pointer = self._loadSlots(2, pointer)
+        self.tstore(resultSlot, int(self.tload(valueSlot) == 0))
+        return pointer
+
+    def _and(self, pointer):
+        value0, value1, resultSlot, pointer = self._binary(pointer)
+        self.tstore(resultSlot, value0 & value1)
+        return pointer
+
+    def _or(self, pointer):
+        value0, value1, resultSlot, pointer = self._binary(pointer)
+        self.tstore(resultSlot, value0 | value1)
+        return pointer
+
+    def _xor(self, pointer):
+        value0, value1, resultSlot, pointer = self._binary(pointer)
+        self.tstore(resultSlot, value0 ^ value1)
+        return pointer
+
+    def _jumpdest(self, pointer):
+        return pointer
+
+    def _jumpDestination(self, destination):
+        destination += 4
+        if destination >= len(self.data) or self.data[destination] != 20:
+            raise OperatorRevert('InvalidJumpDestination')
+        return destination
+
+    def _jump(self, pointer):
+        destination, pointer = self._load(2, pointer)
+        (conditionSlot,), pointer = self._loadSlots(1, pointer)
+        if self.tload(conditionSlot):
+            pointer = self._jumpDestination(destination)
+        return pointer
+
+    def _callBlock(self, pointer):
+        destination, pointer = self._load(2, pointer)
+        if len(self.returnStack) == 16:
+            raise OperatorRevert('ReturnStackOverflow')
+        if pointer - 4 >= 1 << 16:
+            raise OperatorRevert('InvalidJumpDestination')
+        self.returnStack += [pointer]
+        return self._jumpDestination(destination)
+
+    def _returnBlock(self, pointer):
+        # Returning with an empty stack ends the sequence.
+        if len(self.returnStack) == 0:
+            return len(self.data)
+        return self.returnStack.pop()
+
+    def _loop(self, pointer):
+        destination, pointer = self._load(2, pointer)
+        (counterSlot,), pointer = self._loadSlots(1, pointer)
+        counter = self._verifyUnsigned(counterSlot)
+        if counter > 0:
+            self.tstore(counterSlot, counter - 1)
+            if counter > 1:
+                pointer = self._jumpDestination(destination)
+        return pointer
+
+    def _returnSlots(self, pointer):
+        # Ends the sequence.
+        numberOfSlots, pointer = self._load(1, pointer)
+        slots, pointer = self._loadSlots(numberOfSlots, pointer)
+        self.result = b''.join(self.tload(slot).to_bytes(32, 'big') for slot in slots)
+        return len(self.data)
+
+    def _readTransientBalance(self, pointer):
+        tag, pointer = self._load(32, pointer)
+        owner, pointer = self._load(20, pointer)
+        (resultSlot,), pointer = self._loadSlots(1, pointer)
+        self._mstore(32, self.transientBalanceSlot)
+        self._mstore(20, owner)
+        self._mstore(0, tag)
+        transientSlot = keccak_256(self.memory).digest()
+        self._mstoreSelector('transientAccess(bytes32)')
+        self.memory[4:36] = transientSlot
+        self._call(self.nofeeswap, 'transientAccess(bytes32)', (transientSlot,), 0, 32)
+        self.tstore(resultSlot, self._mload(0))
+        return pointer
+
+    def _readBalanceOfNative(self, pointer):
+        owner, pointer = self._load(20, pointer)
+        (resultSlot,), pointer = self._loadSlots(1, pointer)
+        self.tstore(resultSlot, self.mock.balance(toAddress(owner)))
+        return pointer
+
+    def _read(self, target, signature, arguments, successSlot, resultSlot):
+        self.tstore(successSlot, self._call(target, signature, arguments, 0, 32))
+        self.tstore(resultSlot, self._mload(0))
+
+    def _readBalanceOfERC20(self, pointer):
+        token, pointer = self._load(20, pointer)
+        owner, pointer = self._load(20, pointer)
+        (successSlot, resultSlot), pointer = self._loadSlots(2, pointer)
+        self._mstoreSelector('balanceOf(address)')
+        self._mstore(4, owner)
+        self._read(toAddress(token), 'balanceOf(address)', (toAddress(owner),), successSlot, resultSlot)
+        return pointer
+
+    def _readBalanceOfMultiToken(self, pointer):
+        token, pointer = self._load(20, pointer)
+        id, pointer = self._load(32, pointer)
+        owner, pointer = self._load(20, pointer)
+        (successSlot, resultSlot), pointer = self._loadSlots(2, pointer)
+        self._read(toAddress(token), 'balanceOf(address,uint256)', (toAddress(owner), id), successSlot, resultSlot)
+        return pointer
+
+    def _readAllowanceERC20(self, pointer):
+        token, pointer = self._load(20, pointer)
+        owner, pointer = self._load(20, pointer)
+        spender, pointer = self._load(20, pointer)
+        (successSlot, resultSlot), pointer = self._loadSlots(2, pointer)
+        self._read(toAddress(token), 'allowance(address,address)', (toAddress(owner), toAddress(spender)), successSlot, resultSlot)
+        return pointer
+
+    def _readAllowancePermit2(self, pointer):
+        token, pointer = self._load(20, pointer)
+        owner, pointer = self._load(20, pointer)
+        spender, pointer = self._load(20, pointer)
+        (resultSlot,), pointer = self._loadSlots(1, pointer)
+        self._call(self.permit2, 'allowance(address,address,address)', (toAddress(owner), toAddress(token), toAddress(spender)), 0, 32)
+        self.tstore(resultSlot, self._mload(0))
+        return pointer
+
+    def _readAllowanceERC6909(self, pointer):
+        token, pointer = self._load(20, pointer)
+        id, pointer = self._load(32, pointer)
+        owner, pointer = self._load(20, pointer)
+        spender, pointer = self._load(20, pointer)
+        (successSlot, resultSlot), pointer = self._loadSlots(2, pointer)
+        self._read(toAddress(token), 'allowance(address,address,uint256)', (toAddress(owner), toAddress(spender), id), successSlot, resultSlot)
+        return pointer
+
+    def _readIsOperatorERC6909(self, pointer):
+        token, pointer = self._load(20, pointer)
+        owner, pointer = self._load(20, pointer)
+        spender, pointer = self._load(20, pointer)
+        (successSlot, resultSlot), pointer = self._loadSlots(2, pointer)
+        self._read(toAddress(token), 'isOperator(address,address)', (toAddress(owner), toAddress(spender)), successSlot, resultSlot)
+        return pointer
+
+    def _readIsApprovedForAllERC1155(self, pointer):
+        token, pointer = self._load(20, pointer)
+        owner, pointer = self._load(20, pointer)
+        spender, pointer = self._load(20, pointer)
+        (successSlot, resultSlot), pointer = self._loadSlots(2, pointer)
+        self._read(toAddress(token), 'isApprovedForAll(address,address)', (toAddress(owner), toAddress(spender)), successSlot, resultSlot)
+        return pointer
+
+    def _readDoubleBalance(self, pointer):
+        tag0, pointer = self._load(32, pointer)
+        tag1, pointer = self._load(32, pointer)
+        owner, pointer = self._load(20, pointer)
+        (value0Slot, value1Slot), pointer = self._loadSlots(2, pointer)
+        storageSlot = keccak_256(
+            tag0.to_bytes(32, 'big') + tag1.to_bytes(32, 'big') + owner.to_bytes(20, 'big') + (self.doubleBalanceSlot % (1 << 96)).to_bytes(12, 'big')
+        ).digest()
+        self._mstoreSelector('storageAccess(bytes32)')
+        self.memory[4:36] = storageSlot
+        self._call(self.nofeeswap, 'storageAccess(bytes32)', (storageSlot,), 0, 32)
+        doubleBalance = self._mload(0)
+        self.tstore(value0Slot, doubleBalance % X128)
+        self.tstore(value1Slot, doubleBalance >> 128)
+        return pointer
+
+    def _wrapNative(self, pointer):
+        (valueSlot, successSlot), pointer = self._loadSlots(2, pointer)
+        self._mstoreSelector('deposit()')
+        self.tstore(successSlot, self._call(self.weth9, 'deposit()', (), self._verifyUnsigned(valueSlot), 0))
+        return pointer
+
+    def _unwrapNative(self, pointer):
+        (amountSlot, successSlot), pointer = self._loadSlots(2, pointer)
+        self._mstoreSelector('withdraw(uint256)')
+        amount = self._verifyUnsigned(amountSlot)
+        self._mstore(4, amount)
+        self.tstore(successSlot, self._call(self.weth9, 'withdraw(uint256)', (amount,), 0, 0))
+        return pointer
+
+    def _permitAmount(self, amountSlot):
+        amount = self.tload(amountSlot)
+        if amount >= X160:
+            raise OperatorRevert('SafeMathError')
+        return amount
+
+    def _permitPermit2(self, pointer):
+        owner, pointer = self._load(20, pointer)
+        nonce, pointer = self._load(6, pointer)
+        (amountSlot,), pointer = self._loadSlots(1, pointer)
+        amount = self._permitAmount(amountSlot)
+        token, pointer = self._load(20, pointer)
+        expiration, pointer = self._load(6, pointer)
+        signatureDeadline, pointer = self._load(6, pointer)
+        spender, pointer = self._load(20, pointer)
+        (successSlot, signatureByteCount), pointer = self._loadSlots(2, pointer)
+        signature, pointer = self._copy(signatureByteCount, pointer)
+        self.tstore(successSlot, self._call(
+            self.permit2,
+            'permit(address,((address,uint160,uint48,uint48),address,uint256),bytes)',
+            (toAddress(owner), ((toAddress(token), amount, expiration, nonce), toAddress(spender), signatureDeadline), signature),
+            0,
+            0
+        ))
+        return pointer
+
+    def _permitBatchPermit2(self, pointer):
+        owner, pointer = self._load(20, pointer)
+        signatureDeadline, pointer = self._load(6, pointer)
+        (signatureByteCount,), pointer = self._loadSlots(1, pointer)
+        spender, pointer = self._load(20, pointer)
+        (successSlot, numberOfPermissions), pointer = self._loadSlots(2, pointer)
+        details = []
+        for k in range(numberOfPermissions):
+            token, pointer = self._load(20, pointer)
+            (amountSlot,), pointer = self._loadSlots(1, pointer)
+            amount = self._permitAmount(amountSlot)
+            expiration, pointer = self._load(5, pointer)
+            nonce, pointer = self._load(6, pointer)
+            details += [(toAddress(token), amount, expiration, nonce)]
+        signature, pointer = self._copy(signatureByteCount, pointer)
+        self.tstore(successSlot, self._call(
+            self.permit2,
+            'permit(address,((address,uint160,uint48,uint48)[],address,uint256),bytes)',
+            (toAddress(owner), (details, toAddress(spender), signatureDeadline), signature),
+            0,
+            0
+        ))
+        return pointer
+
+    def _transferNative(self, pointer):
+        to, pointer = self._load(20, pointer)
+        (amountSlot, successSlot), pointer = self._loadSlots(2, pointer)
+        self.tstore(successSlot, self._call(toAddress(to), '', (), self._verifyUnsigned(amountSlot), 0))
+        return pointer
+
+    def _transferFromPayerERC20(self, pointer):
+        token, pointer = self._load(20, pointer)
+        (amountSlot,), pointer = self._loadSlots(1, pointer)
+        to, pointer = self._load(20, pointer)
+        (successSlot, resultSlot), pointer = self._loadSlots(2, pointer)
+        self.tstore(successSlot, self._transferFromERC20(token, self._verifyUnsigned(amountSlot), to))
+        self.tstore(resultSlot, self._mload(0))
+        return pointer
+
+    def _transferFromPayerERC20Ref(self, pointer):
+        (tokenRef, amountSlot, toRef, successSlot, resultSlot), pointer = self._loadSlots(5, pointer)
+        token, to = self._address(tokenRef), self._address(toRef)
+        self.tstore(successSlot, self._transferFromERC20(token, self._verifyUnsigned(amountSlot), to))
+        self.tstore(resultSlot, self._mload(0))
+        return pointer
+
+    def _transferFromERC20(self, token, amount, to):
+        # The returned value of 'transferFrom', if any, is left in memory.
+        return self._call(toAddress(token), 'transferFrom(address,address,uint256)', (self.payer, toAddress(to), amount), 0, 32)
+
+    def _transferFromPayerPermit2(self, pointer):
+        to, pointer = self._load(20, pointer)
+        (amountSlot,), pointer = self._loadSlots(1, pointer)
+        token, pointer = self._load(20, pointer)
+        (successSlot,), pointer = self._loadSlots(1, pointer)
+        amount = self._verifyUnsigned(amountSlot)
+        self.tstore(successSlot, self._call(
+            self.permit2, 'transferFrom(address,address,uint160,address)', (self.payer, toAddress(to), amount, toAddress(token)), 0, 0
+        ))
+        return pointer
+
+    def _transferFromPayerERC6909(self, pointer):
+        token, pointer = self._load(20, pointer)
+        id, pointer = self._load(32, pointer)
+        to, pointer = self._load(20, pointer)
+        (amountSlot, successSlot, resultSlot), pointer = self._loadSlots(3, pointer)
+        amount = self._verifyUnsigned(amountSlot)
+        self._read(toAddress(token), 'transferFrom(address,address,uint256,uint256)', (self.payer, toAddress(to), id, amount), successSlot, resultSlot)
+        return pointer
+
+    def _safeTransferFromPayerERC1155(self, pointer):
+        token, pointer = self._load(20, pointer)
+        id, pointer = self._load(32, pointer)
+        to, pointer = self._load(20, pointer)
+        (amountSlot, successSlot), pointer = self._loadSlots(2, pointer)
+        dataByteCount, pointer = self._load(3, pointer)
+        data, pointer = self._copy(dataByteCount, pointer)
+        amount = self._verifyUnsigned(amountSlot)
+        self.tstore(successSlot, self._call(
+            toAddress(token), 'safeTransferFrom(address,address,uint256,uint256,bytes)', (self.payer, toAddress(to), id, amount, data), 0, 0
+        ))
+        return pointer
+
+    def _clear(self, pointer):
+        tag, pointer = self._load(32, pointer)
+        (amountSlot, successSlot), pointer = self._loadSlots(2, pointer)
+        amount = self._verifyUnsigned(amountSlot)
+        self.tstore(successSlot, self._call(self.nofeeswap, 'clear(uint256,uint256)', (tag, amount), 0, 0))
+        return pointer
+
+    def _takeToken(self, pointer):
+        token, pointer = self._load(20, pointer)
+        to, pointer = self._load(20, pointer)
+        (amountSlot, successSlot), pointer = self._loadSlots(2, pointer)
+        self.tstore(successSlot, self._take(token, to, self._verifyUnsigned(amountSlot)))
+        return pointer
+
+    def _takeTokenRef(self, pointer):
+        (tokenRef, toRef, amountSlot, successSlot), pointer = self._loadSlots(4, pointer)
+        token, to = self._address(tokenRef), self._address(toRef)
+        self.tstore(successSlot, self._take(token, to, self._verifyUnsigned(amountSlot)))
+        return pointer
+
+    def _take(self, token, to, amount):
+        return self._call(self.nofeeswap, 'take(address,address,uint256)', (toAddress(token), toAddress(to), amount), 0, 0)
+
+    def _takeERC6909(self, pointer):
+        token, pointer = self._load(20, pointer)
+        id, pointer = self._load(32, pointer)
+        to, pointer = self._load(20, pointer)
+        (amountSlot, successSlot), pointer = self._loadSlots(2, pointer)
+        amount = self._verifyUnsigned(amountSlot)
+        self.tstore(successSlot, self._call(
+            self.nofeeswap, 'take(address,uint256,address,uint256)', (toAddress(token), id, toAddress(to), amount), 0, 0
+        ))
+        return pointer
+
+    def _takeERC1155(self, pointer):
+        token, pointer = self._load(20, pointer)
+        id, pointer = self._load(32, pointer)
+        to, pointer = self._load(20, pointer)
+        (amountSlot, successSlot), pointer = self._loadSlots(2, pointer)
+        dataByteCount, pointer = self._load(3, pointer)
+        data, pointer = self._copy(dataByteCount, pointer)
+        amount = self._verifyUnsigned(amountSlot)
+        self.tstore(successSlot, self._call(
+            self.nofeeswap, 'take(address,uint256,address,uint256,bytes)', (toAddress(token), id, toAddress(to), amount, data), 0, 0
+        ))
+        return pointer
+
+    def _syncToken(self, pointer):
+        token, pointer = self._load(20, pointer)
+        self._sync(token)
+        return pointer
+
+    def _syncTokenRef(self, pointer):
+        (tokenRef,), pointer = self._loadSlots(1, pointer)
+        self._sync(self._address(tokenRef))
+        return pointer
+
+    def _sync(self, token):
+        self._mstoreSelector('sync(address)')
+        self._mstore(4, token)
+        self._call(self.nofeeswap, 'sync(address)', (toAddress(token),), 0, 0)
+
+    def _syncMultiToken(self, pointer):
+        token, pointer = self._load(20, pointer)
+        id, pointer = self._load(32, pointer)
+        self._call(self.nofeeswap, 'sync(address,uint256)', (toAddress(token), id), 0, 0)
+        return pointer
+
+    def _settle(self, pointer):
+        (valueSlot, successSlot, resultSlot), pointer = self._loadSlots(3, pointer)
+        self._mstoreSelector('settle()')
+        self.tstore(successSlot, self._call(self.nofeeswap, 'settle()', (), self._verifyUnsigned(valueSlot), 32))
+        self.tstore(resultSlot, self._mload(0))
+        return pointer
+
+    def _settleNetERC20(self, pointer):
+        token, pointer = self._load(20, pointer)
+        (amountSlot, successSlot), pointer = self._loadSlots(2, pointer)
+        amount = toSigned(self.tload(amountSlot))
+        success = 1
+        if amount < 0:
+            if amount == - X255:
+                raise OperatorRevert('SafeMathError')
+            success = self._take(token, int(self.payer, 16), - amount)
+        if amount > 0:
+            self._sync(token)
+            success = self._transferFromERC20(token, amount, int(self.nofeeswap, 16))
+            if self.returnData:
+                success &= int(len(self.returnData) >= 32 and self._mload(0) == 1)
+            if success:
+                self._mstoreSelector('settle()')
+                success = self._call(self.nofeeswap, 'settle()', (), 0, 0)
+        self.tstore(successSlot, success)
+        return pointer
+
+    def _transferTransientBalanceFrom(self, sender, pointer):
+        tag, pointer = self._load(32, pointer)
+        receiver, pointer = self._load(20, pointer)
+        (amountSlot, successSlot), pointer = self._loadSlots(2, pointer)
+        amount = self._verifyUnsigned(amountSlot)
+        self.tstore(successSlot, self._call(
+            self.nofeeswap,
+            'transferTransientBalanceFrom(address,address,uint256,uint256)',
+            (sender, toAddress(receiver), tag, amount),
+            0,
+            0
+        ))
+        return pointer
+
+    def _transferTransientBalance(self, pointer):
+        return self._transferTransientBalanceFrom(self.operator, pointer)
+
+    def _transferTransientBalanceFromPayer(self, pointer):
+        return self._transferTransientBalanceFrom(self.payer, pointer)
+
+    def _modifySingleBalance(self, pointer):
+        tag, pointer = self._load(32, pointer)
+        (amountSlot, successSlot), pointer = self._loadSlots(2, pointer)
+        self.tstore(successSlot, self._call(
+            self.nofeeswap, 'modifyBalance(address,uint256,int256)', (self.payer, tag, toSigned(self.tload(amountSlot))), 0, 0
+        ))
+        return pointer
+
+    def _modifyDoubleBalance(self, pointer):
+        tag0, pointer = self._load(32, pointer)
+        tag1, pointer = self._load(32, pointer)
+        (amount0Slot, amount1Slot, successSlot), pointer = self._loadSlots(3, pointer)
+        self.tstore(successSlot, self._call(
+            self.nofeeswap,
+            'modifyBalance(address,uint256,uint256,int256,int256)',
+            (self.payer, tag0, tag1, toSigned(self.tload(amount0Slot)), toSigned(self.tload(amount1Slot))),
+            0,
+            0
+        ))
+        return pointer
+
+    def _amounts(self, target, signature, arguments, successSlot, amount0Slot, amount1Slot):
+        self.tstore(successSlot, self._call(target, signature, arguments, 0, 64))
+        self.tstore(amount0Slot, self._mload(0))
+        self.tstore(amount1Slot, self._mload(32))
+
+    def _swapOn(self, target, pointer):
+        poolId, pointer = self._load(32, pointer)
+        (amountSpecifiedSlot,), pointer = self._loadSlots(1, pointer)
+        limitOffsetted, pointer = self._load(8, pointer)
+        (zeroForOne, crossThresholdSlot, successSlot, amount0Slot, amount1Slot), pointer = self._loadSlots(5, pointer)
+        hookDataBytesCount, pointer = self._load(2, pointer)
+        hookData, pointer = self._copy(hookDataBytesCount, pointer)
+        crossThreshold = self.tload(crossThresholdSlot)
+        if crossThreshold >= X128:
+            raise OperatorRevert('SafeMathError')
+        self._amounts(
+            target,
+            'swap(uint256,int256,int256,uint256,bytes)',
+            (
+                poolId,
+                toSigned(self.tload(amountSpecifiedSlot)),
+                self._removeOffset(limitOffsetted, poolId),
+                (crossThreshold << 128) | zeroForOne,
+                hookData
+            ),
+            successSlot,
+            amount0Slot,
+            amount1Slot
+        )
+        return pointer
+
+    def _swap(self, pointer):
+        return self._swapOn(self.nofeeswap, pointer)
+
+    def _quoteSwap(self, pointer):
+        return self._swapOn(self.quoter, pointer)
+
+    def _swapRoute(self, pointer):
+        (amountSpecifiedSlot, successSlot, amountInSlot, numberOfHops), pointer = self._loadSlots(4, pointer)
+        amountSpecified = toSigned(self.tload(amountSpecifiedSlot))
+        end = pointer + 42 * numberOfHops
+        success = 1
+        while pointer < end:
+            poolId, pointer = self._load(32, pointer)
+            limitOffsetted, pointer = self._load(8, pointer)
+            (zeroForOne, amountOutSlot), pointer = self._loadSlots(2, pointer)
+            success = self._call(
+                self.nofeeswap,
+                'swap(uint256,int256,int256,uint256,bytes)',
+                (poolId, amountSpecified, self._removeOffset(limitOffsetted, poolId), zeroForOne, b''),
+                0,
+                64
+            )
+            if not success:
+                break
+            # The incoming amount is the larger one, whichever the direction.
+            incoming, outgoing = sorted([toSigned(self._mload(0)), toSigned(self._mload(32))], reverse = True)
+            if amountInSlot != 0:
+                self.tstore(amountInSlot, incoming)
+                amountInSlot = 0
+            if amountOutSlot != 0:
+                self.tstore(amountOutSlot, outgoing)
+            amountSpecified = toSigned((- outgoing) % X256)
+        self.tstore(successSlot, success)
+        return end
+
+    def _modifyPositionOn(self, target, pointer):
+        poolId, pointer = self._load(32, pointer)
+        qMinOffsetted, pointer = self._load(8, pointer)
+        qMaxOffsetted, pointer = self._load(8, pointer)
+        (sharesSlot, successSlot, amount0Slot, amount1Slot), pointer = self._loadSlots(4, pointer)
+        hookDataBytesCount, pointer = self._load(2, pointer)
+        hookData, pointer = self._copy(hookDataBytesCount, pointer)
+        self._amounts(
+            target,
+            'modifyPosition(uint256,int256,int256,int256,bytes)',
+            (
+                poolId,
+                self._removeOffset(qMinOffsetted, poolId),
+                self._removeOffset(qMaxOffsetted, poolId),
+                toSigned(self.tload(sharesSlot)),
+                hookData
+            ),
+            successSlot,
+            amount0Slot,
+            amount1Slot
+        )
+        return pointer
+
+    def _modifyPosition(self, pointer):
+        return self._modifyPositionOn(self.nofeeswap, pointer)
+
+    def _quoteModifyPosition(self, pointer):
+        return self._modifyPositionOn(self.quoter, pointer)
+
+    def _donateOn(self, target, pointer):
+        poolId, pointer = self._load(32, pointer)
+        (sharesSlot, successSlot, amount0Slot, amount1Slot), pointer = self._loadSlots(4, pointer)
+        hookDataBytesCount, pointer = self._load(2, pointer)
+        hookData, pointer = self._copy(hookDataBytesCount, pointer)
+        shares = self._verifyUnsigned(sharesSlot)
+        self._amounts(target, 'donate(uint256,uint256,bytes)', (poolId, shares, hookData), successSlot, amount0Slot, amount1Slot)
+        return pointer
+
+    def _donate(self, pointer):
+        return self._donateOn(self.nofeeswap, pointer)
+
+    def _quoteDonate(self, pointer):
+        return self._donateOn(self.quoter, pointer)
+
+    def _quoterTransientAccess(self, pointer):
+        transientSlot, pointer = self._load(32, pointer)
+        (resultSlot,), pointer = self._loadSlots(1, pointer)
+        self._mstoreSelector('transientAccess(bytes32)')
+        self._mstore(4, transientSlot)
+        self._call(self.quoter, 'transientAccess(bytes32)', (transientSlot.to_bytes(32, 'big'),), 0, 32)
+        self.tstore(resultSlot, self._mload(0))
+        return pointer
@@ -0,0 +1,97 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+from sha3 import keccak_256
+from eth_abi import encode
+from eth_abi.packed import encode_packed
+from .constants import X60, X63, X216, X256
+
+def keccak(types, values):
+    return toInt(keccak_256(encode(types, values)).hexdigest())
+
+def keccakPacked(types, values):
+    return toInt(keccak_256(encode_packed(types, values)).hexdigest())
+
+def keccak256(input):
+    return toInt(keccak_256(input.encode('utf-8')).digest().hex())
+
+def getPoolId(sender, unsaltedPoolId):
+    return (unsaltedPoolId + (toInt(keccak_256(((toInt(sender) << 256) + unsaltedPoolId).to_bytes(52, 'big')).hexdigest()) << 188)) % (1 << 256)
+
+def addOffset(input):
+    if type(input) is list:
+        return [value + X63 for value in input]
+    else:
+        return input + X63
+
+def subOffset(input):
+    if type(input) is list:
+        return [value - X63 for value in input]
+    else:
+        return input - X63
+
+def getBoundaries(curve):
+    return min(curve[0], curve[1]), max(curve[0], curve[1])
+
+def toInt(value):
+    return int(value, 16)
+
+def twosComplement(value):
+    return value if value >= 0 else ((2 ** 256) + value)
+
+def twosComplementInt8(value):
+    return value if value >= 0 else (256 + value)
+
+def encodeKernel(kernel):
+    # sympy is only needed here, hence it is imported on first use.
+    from sympy import Integer, floor, exp
+    k = 0
+    for point in kernel[1:]:
+        k <<= 16
+        k += point[1]
+        k <<= 64
+        k += point[0]
+        k <<= 216
+        k += floor(X216 * exp(- Integer(point[0]) / X60))
+        k <<= 216
+        k += floor(X216 * exp(- 16 + Integer(point[0]) / X60))
+
+    l = 2 * (len(kernel) - 1)
+
+    result = [0] * l
+    while l != 0:
+        l -= 1
+        result[l] = k % X256
+        k //= X256
+
+    return result
+
+def encodeKernelCompact(kernel):
+    i = 0
+    k = 0
+    for point in kernel[1:]:
+        k <<= 16
+        k += point[1]
+        k <<= 64
+        k += point[0]
+        i += 80
+    if i % 256 != 0:
+        k = k << (256 - (i % 256))
+        i = i + (256 - (i % 256))
+    l = i // 256
+    kernelShortArray = [0] * l
+    while l != 0:
+        l -= 1
+        kernelShortArray[l] = k % (2 ** 256)
+        k //= (2 ** 256)
+
+    return kernelShortArray
+
+def encodeCurve(curve):
+    encodedCurve = [0]*((len(curve) + 3) // 4)
+    shift = 192
+    index = 0
+    for point in curve:
+        encodedCurve[index // 4] += (point << shift)
+        shift -= 64
+        shift = shift % 256
+        index += 1
+    return encodedCurve
@@ -0,0 +1,280 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+from .decoder import decodeActions
+from .actions import written
+from .constants import FIRST_REGISTER, PUSH0, PUSH10, PUSH16, PUSH32, NEG, ADD, SUB, MIN, MAX, MUL, DIV, DIV_ROUND_DOWN, DIV_ROUND_UP, LT, EQ, LTEQ, ISZERO, AND, OR, XOR, JUMPDEST, JUMP, READ_TRANSIENT_BALANCE, READ_BALANCE_OF_NATIVE, READ_BALANCE_OF_ERC20, READ_BALANCE_OF_MULTITOKEN, READ_ALLOWANCE_ERC20, READ_ALLOWANCE_PERMIT2, READ_ALLOWANCE_ERC6909, READ_IS_OPERATOR_ERC6909, READ_IS_APPROVED_FOR_ALL_ERC1155, READ_DOUBLE_BALANCE, WRAP_NATIVE, UNWRAP_NATIVE, PERMIT_PERMIT2, PERMIT_BATCH_PERMIT2, TRANSFER_NATIVE, TRANSFER_FROM_PAYER_ERC20, TRANSFER_FROM_PAYER_PERMIT2, TRANSFER_FROM_PAYER_ERC6909, SAFE_TRANSFER_FROM_PAYER_ERC1155, CLEAR, TAKE_TOKEN, TAKE_ERC6909, TAKE_ERC1155, SYNC_TOKEN, SYNC_MULTITOKEN, SETTLE, TRANSFER_TRANSIENT_BALANCE, TRANSFER_TRANSIENT_BALANCE_FROM_PAYER, MODIFY_SINGLE_BALANCE, MODIFY_DOUBLE_BALANCE, SWAP, MODIFY_POSITION, DONATE, QUOTE_SWAP, QUOTE_MODIFY_POSITION, QUOTE_DONATE, QUOTER_TRANSIENT_ACCESS, REVERT, ADDRESS_TABLE, SYNC_TOKEN_REF, TRANSFER_FROM_PAYER_ERC20_REF, TAKE_TOKEN_REF, SETTLE_NET_ERC20, SWAP_ROUTE, CALL_BLOCK, RETURN_BLOCK, LOOP, RETURN_SLOTS
+
+# The opcodes that 'Operator.unlockCallback' dispatches. The opcodes below 64
+# are separated from the rest by one comparison, after which those from 64
+# onwards take one more comparison to reject unknown opcodes. Each group,
+# 'REVERT' included, is then dispatched by a binary decision tree over the
+# low six bits of the opcode, from the most significant to the least, in which
+# a bit is only compared if opcodes are found on both of its sides.
+dispatched = range(PUSH0, RETURN_SLOTS + 1)
+
+def comparisons(opcode):
+    # The number of comparisons of the tree before 'opcode' is dispatched,
+    # excluding the first one which every action takes.
+    if opcode not in dispatched:
+        return 0
+    group = [k for k in dispatched if k >> 6 == opcode >> 6]
+    count = 0 if opcode < 64 else 1
+    for bit in reversed(range(6)):
+        prefix = (opcode >> (bit + 1)) << 1
+        if any(k >> bit == prefix for k in group) and any(k >> bit == prefix | 1 for k in group):
+            count += 1
+    return count
+
+depth = {opcode: comparisons(opcode) for opcode in dispatched}
+
+# The number of 'tload's and 'tstore's of each action, the account that it
+# accesses and the function that it calls, if any. The account is either a
+# field of the action, possibly referring to the address table, or one of the
+# contracts that the operator is deployed with. The functions are named by
+# their Solidity signatures as in 'Mock', except for 'SETTLE_NET_ERC20' which
+# either takes or transfers and settles, depending on the sign of the amount,
+# and is weighted as a whole. 'SWAP_ROUTE' makes one swap per hop and writes
+# only the amounts whose slots are not zero. 'RETURN_SLOTS' reads each of its
+# slots and copies its value as a word of return data.
+binary = (2, 1, None, None)
+
+accesses = {
+    PUSH0: (0, 1, None, None),
+    PUSH10: (0, 1, None, None),
+    PUSH16: (0, 1, None, None),
+    PUSH32: (0, 1, None, None),
+    NEG: (1, 1, None, None),
+    ADD: binary,
+    SUB: binary,
+    MIN: binary,
+    MAX: binary,
+    MUL: binary,
+    DIV: binary,
+    DIV_ROUND_DOWN: binary,
+    DIV_ROUND_UP: binary,
+    LT: binary,
+    EQ: binary,
+    LTEQ: binary,
+    ISZERO: (1, 1, None, None),
+    AND: binary,
+    OR: binary,
+    XOR: binary,
+    JUMPDEST: (0, 0, None, None),
+    JUMP: (1, 0, None, None),
+    READ_TRANSIENT_BALANCE: (0, 1, 'nofeeswap', 'transientAccess(bytes32)'),
+    READ_BALANCE_OF_NATIVE: (0, 1, 'owner', None),
+    READ_BALANCE_OF_ERC20: (0, 2, 'token', 'balanceOf(address)'),
+    READ_BALANCE_OF_MULTITOKEN: (0, 2, 'token', 'balanceOf(address,uint256)'),
+    READ_ALLOWANCE_ERC20: (0, 2, 'token', 'allowance(address,address)'),
+    READ_ALLOWANCE_PERMIT2: (0, 1, 'permit2', 'allowance(address,address,address)'),
+    READ_ALLOWANCE_ERC6909: (0, 2, 'token', 'allowance(address,address,uint256)'),
+    READ_IS_OPERATOR_ERC6909: (0, 2, 'token', 'isOperator(address,address)'),
+    READ_IS_APPROVED_FOR_ALL_ERC1155: (0, 2, 'token', 'isApprovedForAll(address,address)'),
+    READ_DOUBLE_BALANCE: (0, 2, 'nofeeswap', 'storageAccess(bytes32)'),
+    WRAP_NATIVE: (1, 1, 'weth9', 'deposit()'),
+    UNWRAP_NATIVE: (1, 1, 'weth9', 'withdraw(uint256)'),
+    PERMIT_PERMIT2: (1, 1, 'permit2', 'permit(address,((address,uint160,uint48,uint48),address,uint256),bytes)'),
+    PERMIT_BATCH_PERMIT2: (0, 1, 'permit2', 'permit(address,((address,uint160,uint48,uint48)[],address,uint256),bytes)'),
+    TRANSFER_NATIVE: (1, 1, 'to', ''),
+    TRANSFER_FROM_PAYER_ERC20: (1, 2, 'token', 'transferFrom(address,address,uint256)'),
+    TRANSFER_FROM_PAYER_PERMIT2: (1, 1, 'permit2', 'transferFrom(address,address,uint160,address)'),
+    TRANSFER_FROM_PAYER_ERC6909: (1, 2, 'token', 'transferFrom(address,address,uint256,uint256)'),
+    SAFE_TRANSFER_FROM_PAYER_ERC1155: (1, 1, 'token', 'safeTransferFrom(address,address,uint256,uint256,bytes)'),
+    CLEAR: (1, 1, 'nofeeswap', 'clear(uint256,uint256)'),
+    TAKE_TOKEN: (1, 1, 'nofeeswap', 'take(address,address,uint256)'),
+    TAKE_ERC6909: (1, 1, 'nofeeswap', 'take(address,uint256,address,uint256)'),
+    TAKE_ERC1155: (1, 1, 'nofeeswap', 'take(address,uint256,address,uint256,bytes)'),
+    SYNC_TOKEN: (0, 0, 'nofeeswap', 'sync(address)'),
+    SYNC_MULTITOKEN: (0, 0, 'nofeeswap', 'sync(address,uint256)'),
+    SETTLE: (1, 2, 'nofeeswap', 'settle()'),
+    TRANSFER_TRANSIENT_BALANCE: (1, 1, 'nofeeswap', 'transferTransientBalanceFrom(address,address,uint256,uint256)'),
+    TRANSFER_TRANSIENT_BALANCE_FROM_PAYER: (1, 1, 'nofeeswap', 'transferTransientBalanceFrom(address,address,uint256,uint256)'),
+    MODIFY_SINGLE_BALANCE: (1, 1, 'nofeeswap', 'modifyBalance(address,uint256,int256)'),
+    MODIFY_DOUBLE_BALANCE: (2, 1, 'nofeeswap', 'modifyBalance(address,uint256,uint256,int256,int256)'),
+    SWAP: (2, 3, 'nofeeswap', 'swap(uint256,int256,int256,uint256,bytes)'),
+    MODIFY_POSITION: (1, 3, 'nofeeswap', 'modifyPosition(uint256,int256,int256,int256,bytes)'),
+    DONATE: (1, 3, 'nofeeswap', 'donate(uint256,uint256,bytes)'),
+    QUOTE_SWAP: (2, 3, 'quoter', 'swap(uint256,int256,int256,uint256,bytes)'),
+    QUOTE_MODIFY_POSITION: (1, 3, 'quoter', 'modifyPosition(uint256,int256,int256,int256,bytes)'),
+    QUOTE_DONATE: (1, 3, 'quoter', 'donate(uint256,uint256,bytes)'),
+    QUOTER_TRANSIENT_ACCESS: (0, 1, 'quoter', 'transientAccess(bytes32)'),
+    REVERT: (0, 0, None, None),
+    ADDRESS_TABLE: (0, 0, None, None),
+    SYNC_TOKEN_REF: (0, 0, 'nofeeswap', 'sync(address)'),
+    TRANSFER_FROM_PAYER_ERC20_REF: (1, 2, 'tokenRef', 'transferFrom(address,address,uint256)'),
+    TAKE_TOKEN_REF: (1, 1, 'nofeeswap', 'take(address,address,uint256)'),
+    SETTLE_NET_ERC20: (1, 1, 'token', 'SETTLE_NET_ERC20'),
+    SWAP_ROUTE: (1, 1, 'nofeeswap', 'swap(uint256,int256,int256,uint256,bytes)'),
+    CALL_BLOCK: (0, 0, None, None),
+    RETURN_BLOCK: (0, 0, None, None),
+    LOOP: (1, 1, None, None),
+    RETURN_SLOTS: (0, 0, None, None),
+}
+
+# The slot fields of each action are read or written as in 'written'. An
+# access to a register, i.e., a slot from 'FIRST_REGISTER' onwards, is counted
+# as 'register' in place of 'tload' or 'tstore'.
+def slotFields(layout, fields):
+    # The '(name, slot)' pairs of the slot fields of an action, including
+    # those within its lists, e.g., the permissions of 'PERMIT_BATCH_PERMIT2'.
+    for field in layout:
+        if len(field) == 3 and isinstance(field[1], list):
+            for entry in fields[field[0]]:
+                yield from slotFields(field[1], dict(zip([item[0] for item in field[1]], entry)))
+        elif field[1] == 'uint8' and field[0].endswith('Slot'):
+            yield field[0], fields[field[0]]
+
+# The weights which are fixed by the gas schedule (Cancun) rather than
+# calibrated: the intrinsic cost of a transaction, calldata, transient
+# storage, a register in memory, 'calldatacopy' per word and a warm account
+# access.
+schedule = {
+    'transaction': 21000,
+    'zeroByte': 4,
+    'nonZeroByte': 16,
+    'tload': 100,
+    'tstore': 100,
+    'register': 3,
+    'word': 3,
+    'call': 100,
+    'coldAccount': 2500,
+}
+
+class GasModel:
+    # A static estimate of the gas that 'nofeeswap.unlock(operator, data)'
+    # uses, without a node. Every action of 'data' is counted once, i.e.,
+    # jumps are assumed to fall through, loops to run once and blocks to be
+    # called once. The estimate is the dot product of 'weights' with the
+    # features of 'features':
+    #
+    #   'base'         the fixed cost of 'unlock', 'unlockCallback' and the
+    #                  final refund,
+    #   'action'       the loop and decoding overhead of one action,
+    #   'case'         one comparison of the dispatch tree,
+    #   'byte'         one byte of 'data' being forwarded to the callback,
+    #   'tload'        one transient load, 'tstore' likewise,
+    #   'register'     one load or store of a register in memory,
+    #   'call'         one external call to a warm account,
+    #   'coldAccount'  the first access of an account in the transaction,
+    #   'word'         one word of 'hookData', 'data', signature or return
+    #                  data copied,
+    #
+    # as well as calldata and the function being called, e.g., the feature
+    # 'swap(uint256,int256,int256,uint256,bytes)' counts the swaps and its
+    # weight is the gas spent within nofeeswap per swap. The weights that
+    # are not in 'schedule' default to zero and are fitted to benchmark runs
+    # by 'calibrate'. 'nofeeswap' is warm from the start as it calls the
+    # operator, and so are the operator and 'warm'.
+    def __init__(self, weights = {}, warm = ()):
+        self.weights = {**schedule, 'base': 0, 'action': 0, 'case': 0, 'byte': 0, **weights}
+        self.warm = set(warm)
+
+    def features(self, data):
+        data = bytes(data)
+        deadline, actions = decodeActions(data)
+        padded = data + bytes(-len(data) % 32)
+        zeros = padded.count(0)
+        features = {
+            'transaction': 1,
+            'zeroByte': zeros,
+            'nonZeroByte': len(padded) - zeros,
+            'base': 1,
+            'byte': len(data),
+        }
+        touched = {'nofeeswap'} | self.warm
+        table = []
+        if actions and actions[0].opcode == ADDRESS_TABLE:
+            table = [entry[0] for entry in actions[0].addresses]
+
+        def add(name, count):
+            features[name] = features.get(name, 0) + count
+
+        for action in actions:
+            tloads, tstores, account, function = accesses[action.opcode]
+            calls = 1
+            if action.opcode == PERMIT_BATCH_PERMIT2:
+                tloads = len(action.permissions)
+            if action.opcode == SWAP_ROUTE:
+                tstores += len([slot for name, slot in slotFields(action.layout, action.fields) if name in ['amountInSlot', 'amountOutSlot'] and slot != 0])
+                calls = len(action.hops)
+            if action.opcode == RETURN_SLOTS:
+                tloads = len(action.slots)
+                add('word', len(action.slots))
+            add('action', 1)
+            add('case', depth.get(action.opcode, 0))
+            add('tload', tloads)
+            add('tstore', tstores)
+            for name, slot in slotFields(action.layout, action.fields):
+                if slot >= FIRST_REGISTER:
+                    replaced = ['tstore' if name in written[action.opcode] else 'tload']
+                    if action.opcode == LOOP:
+                        replaced = ['tload', 'tstore']
+                    for name in replaced:
+                        add('register', 1)
+                        add(name, -1)
+            for field in action.layout:
+                if len(field) == 3 and field[1] == 'bytes':
+                    add('word', (len(getattr(action, field[0])) + 31) // 32)
+            if account is not None:
+                if account.endswith('Ref'):
+                    account = table[getattr(action, account)]
+                else:
+                    account = getattr(action, account, account)
+                if account not in touched:
+                    touched.add(account)
+                    add('coldAccount', 1)
+            if function is not None:
+                add('call', calls)
+                add(function, calls)
+        return features
+
+    def estimate(self, data):
+        return sum(self.weights.get(name, 0) * count for name, count in self.features(data).items())
+
+    def cheapest(self, candidates):
+        # The candidate 'data' with the lowest estimate, e.g., among routes.
+        return min(candidates, key = self.estimate)
+
+    def calibrate(self, samples, fixed = tuple(schedule), penalty = 1e-9):
+        # Fits the weights which are not 'fixed' to 'samples', a list of
+        # '(data, gasUsed)' pairs such as the 'tx.gas_used' of benchmark runs,
+        # by least squares. A small ridge 'penalty' towards the current
+        # weights keeps the features that the samples do not separate at
+        # their current values. Returns 'self'.
+        rows = [(self.features(data), gasUsed) for data, gasUsed in samples]
+        names = sorted({name for features, gasUsed in rows for name in features if name not in fixed})
+        size = len(names)
+        matrix = [[0.0] * size for k in range(size)]
+        vector = [0.0] * size
+        for features, gasUsed in rows:
+            residual = gasUsed - sum(self.weights.get(name, 0) * features[name] for name in features if name in fixed)
+            row = [features.get(name, 0) for name in names]
+            for ii in range(size):
+                if row[ii] != 0:
+                    vector[ii] += row[ii] * residual
+                    for jj in range(size):
+                        matrix[ii][jj] += row[ii] * row[jj]
+        scale = penalty * max([matrix[ii][ii] for ii in range(size)] + [1])
+        for ii in range(size):
+            matrix[ii][ii] += scale
+            vector[ii] += scale * self.weights.get(names[ii], 0)
+        for name, value in zip(names, solve(matrix, vector)):
+            self.weights[name] = value
+        return self
+
+def solve(matrix, vector):
+    # Gaussian elimination with partial pivoting on a symmetric positive
+    # definite system.
+    size = len(vector)
+    rows = [matrix[k][:] + [vector[k]] for k in range(size)]
+    for ii in range(size):
+        pivot = max(range(ii, size), key = lambda k: abs(rows[k][ii]))
+        rows[ii], rows[pivot] = rows[pivot], rows[ii]
+        for jj in range(ii + 1, size):
+            factor = rows[jj][ii] / rows[ii][ii]
+            if factor != 0:
+                for kk in range(ii, size + 1):
+                    rows[jj][kk] -= factor * rows[ii][kk]
+    result = [0.0] * size
+    for ii in reversed(range(size)):
+        result[ii] = (rows[ii][size] - sum(rows[ii][kk] * result[kk] for kk in range(ii + 1, size))) / rows[ii][ii]
+    return result
@@ -0,0 +1,41 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+import os
+import time
+
+def logTest(request, worker_id):
+    if os.path.exists('testLogs') == False:
+        os.mkdir('testLogs')
+    path = os.path.relpath('./testLogs/'+ worker_id + ".md", os.getcwd())
+
+    num = 1
+    if hasattr(request.function, 'pytestmark'):
+        for kk in range(len(request.function.pytestmark)):
+            num *= len(request.function.pytestmark[kk].args[1])
+
+    if os.path.isfile(path):
+        with open(path, "r+") as f:
+            old = f.read()
+            start = old.find('\n')
+            index = int(old[0:start])
+            old = old[start+1:]
+            start = old.find('\n')
+            pastTime = float(old[0:start])
+            index += 1
+        content = str(index) + '\n' + str(time.time()) + old[start:]
+    else:
+        with open(path, "a") as f:
+            f.seek(0)
+        index = 1
+        content = str(index) + "\n" + str(time.time()) + "\n\n"
+        pastTime = time.time()
+
+    content += request.fspath.basename + '\n' + str(request.function)
+    for fixture in [item for item in request.fixturenames if item not in ["request"]]:
+        content += '\n'
+        content += fixture + ' == ' + str(request.getfixturevalue(fixture))
+    content += '\n' + 'total == ' + str(num)
+    content += '\n' + 'time == ' + str(time.time() - pastTime) + '\n\n'
+
+    with open(path, "r+") as f:
+        f.seek(0)
+        f.write(content)
@@ -0,0 +1,348 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+from .assembler import Slot, Field, Assembler, packedSize
+from .actions import AddressTable, layouts, written
+from .constants import PUSH0, PUSH10, PUSH16, PUSH32, NEG, ADD, SUB, MIN, MAX, MUL, DIV, DIV_ROUND_DOWN, DIV_ROUND_UP, LT, EQ, LTEQ, ISZERO, AND, OR, XOR, JUMPDEST, JUMP, SYNC_TOKEN, SETTLE, TRANSFER_FROM_PAYER_ERC20, TAKE_TOKEN, REVERT, ADDRESS_TABLE, SYNC_TOKEN_REF, TRANSFER_FROM_PAYER_ERC20_REF, TAKE_TOKEN_REF, CALL_BLOCK, RETURN_BLOCK, LOOP, RETURN_SLOTS
+
+# Arithmetic actions have no side effect other than their result slot. Every
+# other action either calls another contract or affects the control flow and
+# is treated as a barrier by the passes below.
+arithmetic = {
+    PUSH0, PUSH10, PUSH16, PUSH32, NEG, ADD, SUB, MIN, MAX, MUL, DIV, DIV_ROUND_DOWN, DIV_ROUND_UP, LT, EQ, LTEQ, ISZERO, AND, OR, XOR
+}
+
+# The actions whose addresses may be replaced by references to the address
+# table, along with the positions of the addresses and the replacement.
+references = {
+    SYNC_TOKEN: ((1,), SYNC_TOKEN_REF),
+    TRANSFER_FROM_PAYER_ERC20: ((1, 3), TRANSFER_FROM_PAYER_ERC20_REF),
+    TAKE_TOKEN: ((1, 2), TAKE_TOKEN_REF),
+}
+
+# The actions whose destination is a label.
+branches = [JUMP, CALL_BLOCK, LOOP]
+
+# Arithmetic actions which never revert, so that they can be removed once
+# their result is overwritten before being read.
+nonReverting = {PUSH0, PUSH10, PUSH16, PUSH32, ISZERO, MIN, MAX, LT, EQ, LTEQ, AND, OR, XOR}
+
+int256Min = - (1 << 255)
+int256Max = (1 << 255) - 1
+
+def signed(type, value):
+    if type.startswith('uint'):
+        bits = int(type[4:])
+        if value >= (1 << (bits - 1)):
+            value -= (1 << bits)
+    return value
+
+def push(value, slot):
+    # The narrowest push which stores 'value' in 'slot'.
+    if value == 0:
+        return (['uint8', 'uint8'], [PUSH0, slot], None)
+    if - (1 << 79) <= value < (1 << 79):
+        return (['uint8', 'int80', 'uint8'], [PUSH10, value, slot], None)
+    if - (1 << 127) <= value < (1 << 127):
+        return (['uint8', 'int128', 'uint8'], [PUSH16, value, slot], None)
+    return (['uint8', 'int256', 'uint8'], [PUSH32, value, slot], None)
+
+def evaluate(opcode, values):
+    # The result of an arithmetic action on constant inputs or 'None' if the
+    # action reverts or is not folded.
+    if opcode == NEG:
+        return None if values[0] == int256Min else - values[0]
+    if opcode == ISZERO:
+        return int(values[0] == 0)
+    if opcode in [ADD, SUB]:
+        result = values[0] + values[1] if opcode == ADD else values[0] - values[1]
+        return result if int256Min <= result <= int256Max else None
+    if opcode == MIN:
+        return min(values)
+    if opcode == MAX:
+        return max(values)
+    if opcode == LT:
+        return int(values[0] < values[1])
+    if opcode == EQ:
+        return int(values[0] == values[1])
+    if opcode == LTEQ:
+        return int(values[0] <= values[1])
+    if opcode == AND:
+        return values[0] & values[1]
+    if opcode == OR:
+        return values[0] | values[1]
+    if opcode == XOR:
+        return values[0] ^ values[1]
+    return None
+
+def size(entry):
+    types, values, name = entry
+    return sum(packedSize(type, value) for type, value in zip(types, values))
+
+def cost(program):
+    return (sum(size(entry) for entry in program), len(program))
+
+def operands(opcode, values):
+    # The '(name, type)' of each of 'values' after the opcode, flattened as in
+    # 'Action.packed', or 'None' if 'values' do not follow the layout of
+    # 'opcode'.
+    if opcode not in layouts:
+        return None
+    result = []
+    counts = {}
+    for field in layouts[opcode][1]:
+        if len(field) == 2 or field[1] == 'bytes':
+            if len(result) + 1 < len(values):
+                counts[field[0]] = values[len(result) + 1]
+            result += [field[:2]]
+        else:
+            count = counts.get(field[2])
+            if not isinstance(count, int):
+                return None
+            result += field[1] * count
+    return result if len(result) + 1 == len(values) else None
+
+def slots(entry):
+    # The slots that an action reads and writes as in 'written'. If 'values'
+    # do not follow a known layout, every 'uint8' operand is assumed to be
+    # read so that no store that feeds the action is dropped.
+    types, values, name = entry
+    opcode = values[0]
+    fields = operands(opcode, values)
+    if fields is None:
+        return [value for type, value in zip(types[1:], values[1:]) if type == 'uint8'], []
+    reads, writes = [], []
+    for (field, type), value in zip(fields, values[1:]):
+        if type == 'uint8' and field.endswith('Slot'):
+            if field in written[opcode]:
+                writes += [value]
+            if field not in written[opcode] or opcode == LOOP:
+                reads += [value]
+    return reads, writes
+
+def referenced(program):
+    return {name for types, values, name in program if values[0] in branches}
+
+def removeUnreachable(program):
+    # Drops the actions between a 'REVERT', 'RETURN_BLOCK' or 'RETURN_SLOTS'
+    # and the next label which is the destination of a branch, as well as the
+    # labels that no branch refers to.
+    targets = referenced(program)
+    result = []
+    reachable = True
+    for entry in program:
+        types, values, name = entry
+        if values[0] == JUMPDEST:
+            if name not in targets:
+                continue
+            reachable = True
+        if reachable:
+            result += [entry]
+        if values[0] in [REVERT, RETURN_BLOCK, RETURN_SLOTS]:
+            reachable = False
+    return result
+
+def fold(program, zero, narrowOnly):
+    # Propagates constants within each block. Pushes are narrowed, arithmetic
+    # on constants becomes a push, conditional jumps on constants are resolved
+    # and 'NEG' of a negation is dropped when it restores the original slot.
+    # With 'narrowOnly', an action is only replaced if it does not grow. The
+    # value of a 'Field' is unknown.
+    result = []
+    known = {zero: 0}
+    negations = {}
+    reachable = True
+    for entry in program:
+        types, values, name = entry
+        opcode = values[0]
+        if opcode == JUMPDEST:
+            known, negations, reachable = {zero: 0}, {}, True
+        if not reachable:
+            continue
+
+        if opcode not in arithmetic:
+            if opcode == JUMP and values[2] in known:
+                if known[values[2]] == 0:
+                    continue
+                reachable = False
+            elif opcode != JUMP:
+                known, negations = {zero: 0}, {}
+            result += [entry]
+            continue
+
+        reads, writes = slots(entry)
+        target = writes[0]
+        replacement = entry
+        if opcode in [PUSH10, PUSH16, PUSH32]:
+            if not isinstance(values[1], Field):
+                replacement = push(signed(types[1], values[1]), target)
+        elif opcode != PUSH0 and all(slot in known for slot in reads):
+            value = evaluate(opcode, [known[slot] for slot in reads])
+            if value is not None:
+                candidate = push(value, target)
+                if not narrowOnly or size(candidate) <= size(entry):
+                    replacement = candidate
+        elif opcode == NEG and negations.get(reads[0]) == target:
+            continue
+
+        if replacement[1][0] == PUSH0:
+            value = 0
+        elif replacement[1][0] in [PUSH10, PUSH16, PUSH32] and not isinstance(replacement[1][1], Field):
+            value = replacement[1][1]
+        else:
+            value = None
+
+        negations = {
+            slot: source for slot, source in negations.items() if slot != target and source != target
+        }
+        if opcode == NEG and replacement is entry and reads[0] != target:
+            negations[target] = reads[0]
+        known.pop(target, None)
+        if value is not None:
+            known[target] = value
+        result += [replacement]
+    return result
+
+def removeDeadStores(program):
+    # Drops non-reverting arithmetic whose result is overwritten, or discarded
+    # by a 'REVERT', before it is read within the same block. The number of a
+    # 'Slot' is only meaningful to the sequence itself, so a store to a 'Slot'
+    # which is never read afterwards is dropped as well unless it is inside a
+    # loop. As in 'Assembler.liveRanges', a call is treated as a loop up to
+    # the end of the sequence.
+    labels = {name: ii for ii, (types, values, name) in enumerate(program) if values[0] == JUMPDEST}
+    loops = [
+        (labels[name], ii) for ii, (types, values, name) in enumerate(program) if values[0] in [JUMP, LOOP] and labels.get(name, ii) < ii
+    ] + [
+        (min(labels[name], ii), len(program) - 1) for ii, (types, values, name) in enumerate(program) if values[0] == CALL_BLOCK and name in labels
+    ]
+    dead = set()
+    for ii, entry in enumerate(program):
+        if entry[1][0] not in nonReverting:
+            continue
+        target = slots(entry)[1][0]
+        if isinstance(target, Slot) and not any(begin <= ii <= end for begin, end in loops):
+            if not any(target in slots(later)[0] for later in program[ii + 1:]):
+                dead.add(ii)
+                continue
+        for later in program[ii + 1:]:
+            opcode = later[1][0]
+            if opcode == REVERT:
+                dead.add(ii)
+                break
+            if opcode not in arithmetic:
+                break
+            reads, writes = slots(later)
+            if target in reads:
+                break
+            if target in writes:
+                dead.add(ii)
+                break
+    return [entry for ii, entry in enumerate(program) if ii not in dead]
+
+def removeRedundantCalls(program, zero):
+    # A 'SYNC_TOKEN' is redundant if the next call within the same block is
+    # another 'SYNC_TOKEN' which overwrites it. A 'SETTLE' with a zero value
+    # right after another 'SETTLE' has nothing left to settle and is dropped
+    # if none of its result slots is read by the sequence.
+    read = {slot for entry in program for slot in slots(entry)[0]}
+    dead = set()
+    for ii, entry in enumerate(program):
+        if entry[1][0] not in [SYNC_TOKEN, SETTLE]:
+            continue
+        for jj in range(ii + 1, len(program)):
+            if program[jj][1][0] not in arithmetic:
+                break
+        else:
+            continue
+        following = program[jj]
+        if entry[1][0] == SYNC_TOKEN and following[1][0] == SYNC_TOKEN:
+            dead.add(ii)
+        if entry[1][0] == SETTLE and following[1][0] == SETTLE:
+            reads, writes = slots(following)
+            if reads[0] == zero and not any(slot in read for slot in writes):
+                dead.add(jj)
+    return [entry for ii, entry in enumerate(program) if ii not in dead]
+
+def optimize(assembler):
+    # Returns a new 'Assembler' whose sequence has the same effect as that of
+    # 'assembler' but fewer calldata bytes. The passes are repeated until they
+    # no longer reduce the cost. Folding may replace a short action with a
+    # longer push in the hope of removing the push that fed it, so both the
+    # aggressive and the conservative variants are run and the cheaper one is
+    # kept. 'assembler' should hold a complete sequence since stores to slots
+    # that are not read afterwards are dropped. Sequences with jumps that are
+    # not resolved through labels refer to byte offsets and are returned
+    # unchanged.
+    if any(values[0] in branches + [JUMPDEST] and name is None for types, values, name in assembler.program):
+        return assembler
+
+    candidates = []
+    for narrowOnly in [False, True]:
+        program = assembler.program
+        while True:
+            previous = cost(program)
+            program = removeUnreachable(program)
+            program = fold(program, assembler.zero, narrowOnly)
+            program = removeDeadStores(program)
+            program = removeRedundantCalls(program, assembler.zero)
+            if cost(program) >= previous:
+                break
+        candidates += [program]
+    program = min(candidates, key = cost)
+
+    optimized = Assembler()
+    optimized.zero = assembler.zero
+    optimized.reserve(*assembler.reserved)
+    for types, values, name in program:
+        if values[0] == JUMPDEST:
+            optimized.label(name)
+        elif values[0] in branches:
+            optimized.branch(types, values, name)
+        else:
+            optimized.action(types, values)
+    return optimized
+
+def tabulate(assembler):
+    # Returns a new 'Assembler' whose sequence starts with an 'ADDRESS_TABLE'
+    # and in which the actions of 'references' refer to the table rather than
+    # repeating addresses. An address costs 20 bytes in the table and saves
+    # 19 bytes per reference, so only the addresses which are used at least
+    # twice are listed, and an action is only replaced if all of its
+    # addresses are. 'assembler' is returned unchanged if no address is
+    # repeated, if it already has a table or if it has jumps which are not
+    # resolved through labels. The table has to be the first action of
+    # 'data', so 'assembler' should hold a complete sequence.
+    program = assembler.program
+    if any(
+        values[0] == ADDRESS_TABLE or (values[0] in branches + [JUMPDEST] and name is None) for types, values, name in program
+    ):
+        return assembler
+
+    uses = {}
+    for types, values, name in program:
+        if values[0] in references:
+            for k in references[values[0]][0]:
+                uses[values[k]] = uses.get(values[k], 0) + 1
+    table = [address for address, count in uses.items() if count >= 2][:255]
+    if len(table) == 0:
+        return assembler
+    index = {address: k for k, address in enumerate(table)}
+
+    tabulated = Assembler()
+    tabulated.zero = assembler.zero
+    tabulated.reserve(*assembler.reserved)
+    tabulated.action(AddressTable([(address,) for address in table]))
+    for types, values, name in program:
+        opcode = values[0]
+        if opcode == JUMPDEST:
+            tabulated.label(name)
+        elif opcode in branches:
+            tabulated.branch(types, values, name)
+        elif opcode in references and all(values[k] in index for k in references[opcode][0]):
+            positions, replacement = references[opcode]
+            tabulated.action(
+                ['uint8' if k in positions else type for k, type in enumerate(types)],
+                [replacement] + [index[value] if k in positions else value for k, value in enumerate(values) if k > 0]
+            )
+        else:
+            tabulated.action(types, values)
+    return tabulated
@@ -0,0 +1,1341 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+import os
+import json
+import inspect
+import mpmath
+from array import array
+from bisect import bisect_right
+from fractions import Fraction
+from functools import lru_cache
+from sympy import Integer, Symbol, Piecewise, And, floor, piecewise_fold, exp, N, oo
+from sha3 import keccak_256
+from .constants import X15, X59, X60, X63, X64, X216
+from .encoders import addOffset, getBoundaries, encodeCurve
+
+def toRational(input):
+    if type(input) is list:
+        return [(value - X63) / Integer(X59) for value in input]
+    else:
+        return (input - X63) / Integer(X59)
+
+def extendCurve(curve, prices, depth = 9):
+    # Yields 'curve' followed by every extension of it with points from
+    # 'prices' in depth-first order, up to 'depth' points.
+    yield curve
+    if len(curve) < depth:
+        for priceX59 in prices:
+            if min(curve[-2], curve[-1]) < priceX59 < max(curve[-2], curve[-1]):
+                yield from extendCurve(curve + [priceX59], prices, depth)
+
+def generateCurves(prices, spacingX59):
+    for price0X59 in prices:
+        for price1X59 in [price0X59 + spacingX59, price0X59 - spacingX59]:
+            if price1X59 > 0 and price1X59 < X64:
+                yield from extendCurve([price0X59, price1X59], prices)
+
+# If the environment variable 'NOFEE_DATA_CACHE' points to a directory, the
+# generated data is persisted there in files named after the hash of the
+# generating source code and the arguments, so that xdist workers and reruns
+# load it instead of generating it again.
+dataCacheDirectory = os.environ.get('NOFEE_DATA_CACHE', '')
+
+def dataGeneration(n, size = 100):
+    if not dataCacheDirectory:
+        return _dataGeneration(n, size)
+
+    source = ''.join(inspect.getsource(function) for function in [addOffset, getBoundaries, extendCurve, generateCurves, _dataGeneration])
+    digest = keccak_256((source + repr((n, size))).encode()).hexdigest()
+    path = os.path.join(dataCacheDirectory, 'dataGeneration-' + digest[0:32] + '.json')
+
+    if os.path.isfile(path):
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return data['initializations'], data['swaps'], data['kernelsValid'], data['kernelsInvalid']
+
+    initializations, swaps, kernelsValid, kernelsInvalid = _dataGeneration(n, size)
+    os.makedirs(dataCacheDirectory, exist_ok = True)
+    temporary = path + '.' + str(os.getpid())
+    with open(temporary, 'w') as f:
+        json.dump({'initializations': initializations, 'swaps': swaps, 'kernelsValid': kernelsValid, 'kernelsInvalid': kernelsInvalid}, f)
+    os.replace(temporary, path)
+    return initializations, swaps, kernelsValid, kernelsInvalid
+
+def _dataGeneration(n, size):
+    logPriceTickX59 = 57643193118714
+
+    feeSpacingSmallX59 = 288302457773874 # 0.05% fee
+    feeSpacingMediumX59 = 1731981530143823 # 0.3% fee
+    feeSpacingLargeX59 = 5793624167011548 # 1.0% fee
+
+    logPriceSpacingSmallX59 = 10 * logPriceTickX59
+    logPriceSpacingMediumX59 = 60 * logPriceTickX59
+    logPriceSpacingLargeX59 = 200 * logPriceTickX59
+
+    horizontalSteps = [0, 2**32, X64 - 2**32 - 1]
+    verticalSteps = [0, 1, X15 // 2, X15 - 1, X15]
+    prices = addOffset([
+        0,
+        -1, +1,
+        # -feeSpacingSmallX59, +feeSpacingSmallX59,
+        -logPriceSpacingSmallX59, +logPriceSpacingSmallX59,
+        -logPriceSpacingLargeX59, +logPriceSpacingLargeX59
+        # -feeSpacingSmallX59,
+        # +logPriceSpacingLargeX59
+    ])
+
+    # A list of valid kernels of various sizes and shapes to be used for testing
+    kernelsValid = [
+        [
+            [0, 0], 
+            [1*logPriceSpacingSmallX59, 1*X15 // 8], 
+            [1*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 8*X15 // 8]
+        ],
+        [
+            [0, 0], 
+            [1*logPriceSpacingSmallX59, 1*X15 // 8], 
+            [1*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 3*X15 // 8], 
+            [4*logPriceSpacingSmallX59, 8*X15 // 8]
+        ],
+        [
+            [0, 0], 
+            [1*logPriceSpacingSmallX59, 1*X15 // 8], 
+            [1*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 3*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 4*X15 // 8], 
+            [4*logPriceSpacingSmallX59, 8*X15 // 8]
+        ],
+        [
+            [0, 0], 
+            [1*logPriceSpacingSmallX59, 1*X15 // 8], 
+            [1*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 3*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 4*X15 // 8], 
+            [4*logPriceSpacingSmallX59, 4*X15 // 8], 
+            [5*logPriceSpacingSmallX59, 8*X15 // 8]
+        ],
+        [
+            [0, 0], 
+            [1*logPriceSpacingSmallX59, 1*X15 // 8], 
+            [1*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 3*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 4*X15 // 8], 
+            [4*logPriceSpacingSmallX59, 4*X15 // 8], 
+            [5*logPriceSpacingSmallX59, 5*X15 // 8], 
+            [6*logPriceSpacingSmallX59, 8*X15 // 8]
+        ],
+        [
+            [0, 0], 
+            [1*logPriceSpacingSmallX59, 0*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 1*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 8*X15 // 8]
+        ],
+        [
+            [0, 0], 
+            [1*logPriceSpacingSmallX59, 0*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 1*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [4*logPriceSpacingSmallX59, 8*X15 // 8]
+        ],
+        [
+            [0, 0], 
+            [1*logPriceSpacingSmallX59, 0*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 1*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [4*logPriceSpacingSmallX59, 3*X15 // 8], 
+            [5*logPriceSpacingSmallX59, 8*X15 // 8]
+        ],
+        [
+            [0, 0], 
+            [1*logPriceSpacingSmallX59, 0*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 1*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [4*logPriceSpacingSmallX59, 3*X15 // 8], 
+            [4*logPriceSpacingSmallX59, 8*X15 // 8], 
+            [5*logPriceSpacingSmallX59, 8*X15 // 8]
+        ],
+        [
+            [0, 0], 
+            [1*logPriceSpacingSmallX59, 0*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 1*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [4*logPriceSpacingSmallX59, 3*X15 // 8], 
+            [4*logPriceSpacingSmallX59, 4*X15 // 8], 
+            [5*logPriceSpacingSmallX59, 4*X15 // 8], 
+            [6*logPriceSpacingSmallX59, 8*X15 // 8]
+        ],
+        [
+            [0, 0], 
+            [1*logPriceSpacingSmallX59, 0*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 1*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [4*logPriceSpacingSmallX59, 3*X15 // 8], 
+            [4*logPriceSpacingSmallX59, 4*X15 // 8], 
+            [5*logPriceSpacingSmallX59, 4*X15 // 8], 
+            [6*logPriceSpacingSmallX59, 8*X15 // 8]
+        ],
+        [
+            [0, 0], 
+            [1*logPriceSpacingSmallX59, 0*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 1*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 1*X15 // 8], 
+            [4*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [5*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [6*logPriceSpacingSmallX59, 3*X15 // 8], 
+            [7*logPriceSpacingSmallX59, 3*X15 // 8], 
+            [8*logPriceSpacingSmallX59, 8*X15 // 8]
+        ],
+        [
+            [0, 0], 
+            [1*logPriceSpacingSmallX59, 0*X15 // 8], 
+            [1*logPriceSpacingSmallX59, 1*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 1*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 3*X15 // 8], 
+            [4*logPriceSpacingSmallX59, 3*X15 // 8], 
+            [5*logPriceSpacingSmallX59, 8*X15 // 8]
+        ],
+        [
+            [0, 0], 
+            [1*logPriceSpacingSmallX59, 0*X15 // 8], 
+            [1*logPriceSpacingSmallX59, 1*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 3*X15 // 8], 
+            [4*logPriceSpacingSmallX59, 4*X15 // 8], 
+            [5*logPriceSpacingSmallX59, 4*X15 // 8], 
+            [6*logPriceSpacingSmallX59, 8*X15 // 8]
+        ],
+        [
+            [0, 0], 
+            [1*logPriceSpacingSmallX59, 1*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 1*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 3*X15 // 8], 
+            [4*logPriceSpacingSmallX59, 3*X15 // 8], 
+            [4*logPriceSpacingSmallX59, 4*X15 // 8], 
+            [5*logPriceSpacingSmallX59, 5*X15 // 8], 
+            [6*logPriceSpacingSmallX59, 8*X15 // 8]
+        ],
+        [
+            [0, 0], 
+            [1*logPriceSpacingSmallX59, 1*X15 // 8], 
+            [1*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 3*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 4*X15 // 8], 
+            [4*logPriceSpacingSmallX59, 4*X15 // 8], 
+            [5*logPriceSpacingSmallX59, 5*X15 // 8], 
+            [6*logPriceSpacingSmallX59, 8*X15 // 8]
+        ],
+        [
+            [0, 0], 
+            [1*logPriceSpacingSmallX59, 1*X15 // 8], 
+            [1*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 3*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 4*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 5*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 6*X15 // 8], 
+            [4*logPriceSpacingSmallX59, 6*X15 // 8], 
+            [5*logPriceSpacingSmallX59, 8*X15 // 8]
+        ],
+        [
+            [0, 0], 
+            [1*logPriceSpacingSmallX59, 1*X15 // 8], 
+            [2*logPriceSpacingSmallX59, 1*X15 // 8], 
+            [3*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [4*logPriceSpacingSmallX59, 2*X15 // 8], 
+            [5*logPriceSpacingSmallX59, 3*X15 // 8], 
+            [6*logPriceSpacingSmallX59, 3*X15 // 8], 
+            [7*logPriceSpacingSmallX59, 4*X15 // 8], 
+            [9*logPriceSpacingSmallX59, 8*X15 // 8]
+        ]
+    ]
+
+    for horizontalStep1X59 in horizontalSteps:
+        for verticalStep1X15 in verticalSteps:
+            valid1 = (horizontalStep1X59 != 0)
+            if valid1 and horizontalStep1X59 >= 2 ** 40:
+                kernel1 = [[0, 0], [horizontalStep1X59, verticalStep1X15]]
+                if verticalStep1X15 == X15:
+                    if kernel1 not in kernelsValid:
+                        kernelsValid += [kernel1]
+                for horizontalStep2X59 in horizontalSteps:
+                    for verticalStep2X15 in verticalSteps:
+                        valid2 = ((horizontalStep2X59 != 0) or (verticalStep2X15 != 0)) and \
+                            (verticalStep1X15 + verticalStep2X15 <= X15) and \
+                            ((verticalStep1X15 != 0) or (verticalStep2X15 != 0)) and \
+                            ((horizontalStep1X59 != 0) or (horizontalStep2X59 != 0)) and \
+                            (2 ** 40 <= horizontalStep1X59 + horizontalStep2X59 < X64 - 1)
+                        if valid2:
+                            kernel2 = [
+                                [0, 0], 
+                                [horizontalStep1X59, verticalStep1X15], 
+                                [horizontalStep1X59 + horizontalStep2X59, verticalStep1X15 + verticalStep2X15]
+                            ]
+                            if (verticalStep1X15 + verticalStep2X15 == X15) and (horizontalStep2X59 != 0):
+                                if kernel2 not in kernelsValid:
+                                    kernelsValid += [kernel2]
+                            for horizontalStep3X59 in horizontalSteps:
+                                for verticalStep3X15 in verticalSteps:
+                                    valid3 = ((horizontalStep3X59 != 0) or (verticalStep3X15 != 0)) and \
+                                        ((verticalStep2X15 != 0) or (verticalStep3X15 != 0)) and \
+                                        ((horizontalStep2X59 != 0) or (horizontalStep3X59 != 0)) and \
+                                        (2 ** 40 <= horizontalStep1X59 + horizontalStep2X59 + horizontalStep3X59 < X64 - 1)
+                                    if valid3:
+                                        kernel3 = [
+                                            [0, 0], 
+                                            [horizontalStep1X59, verticalStep1X15], 
+                                            [horizontalStep1X59 + horizontalStep2X59, verticalStep1X15 + verticalStep2X15], 
+                                            [horizontalStep1X59 + horizontalStep2X59 + horizontalStep3X59, verticalStep1X15 + verticalStep2X15 + verticalStep3X15]
+                                        ]
+                                        if (verticalStep1X15 + verticalStep2X15 + verticalStep3X15 == X15) and (horizontalStep3X59 != 0) and (horizontalStep1X59 + horizontalStep2X59 + horizontalStep3X59 >= 2 ** 40):
+                                            if kernel3 not in kernelsValid:
+                                                kernelsValid += [kernel3]
+
+    # A list of kernels that are not valid
+    kernelsInvalid = [[[0, 0]]]
+    for horizontalStep1X59 in horizontalSteps:
+        for verticalStep1X15 in verticalSteps:
+            kernel1 = [[0, 0], [horizontalStep1X59, verticalStep1X15]]
+            kernelsInvalid += [kernel1]
+            for horizontalStep2X59 in horizontalSteps:
+                for verticalStep2X15 in verticalSteps:
+                    kernel2 = [
+                        [0, 0], 
+                        [horizontalStep1X59, verticalStep1X15], 
+                        [horizontalStep1X59 + horizontalStep2X59, verticalStep1X15 + verticalStep2X15]
+                    ]
+                    kernelsInvalid += [kernel2]
+                    for horizontalStep3X59 in horizontalSteps:
+                        for verticalStep3X15 in verticalSteps:
+                            kernel3 = [
+                                [0, 0], 
+                                [horizontalStep1X59, verticalStep1X15], 
+                                [horizontalStep1X59 + horizontalStep2X59, verticalStep1X15 + verticalStep2X15], 
+                                [horizontalStep1X59 + horizontalStep2X59 + horizontalStep3X59, verticalStep1X15 + verticalStep2X15 + verticalStep3X15]
+                            ]
+                            kernelsInvalid += [kernel3]
+    kernelsInvalid = [kernel for kernel in kernelsInvalid if (
+        (kernel not in kernelsValid) and (kernel[-1][1] <= X15) and (kernel[-1][1] != kernel[-2][1] if len(kernel) > 1 else True)
+    )]
+
+    # The curves and targets are generated lazily and only until 'size' of
+    # each are collected.
+    initializations = dict()
+    initializations['kernel'] = []
+    initializations['curve'] = []
+    for k in range(min(n, len(kernelsValid))):
+        if len(initializations['curve']) >= size:
+            break
+        kernel = kernelsValid[k]
+        for curve in generateCurves(prices, kernel[-1][0]):
+            if len(initializations['curve']) >= size:
+                break
+            initializations['kernel'] += [kernel]
+            initializations['curve'] += [curve]
+
+    swaps = dict()
+    swaps['kernel'] = []
+    swaps['curve'] = []
+    swaps['target'] = []
+    for k in range(min(n, len(kernelsValid))):
+        if len(swaps['target']) >= size:
+            break
+        kernel = kernelsValid[k]
+        for curve in generateCurves(prices, kernel[-1][0]):
+            if len(swaps['target']) >= size:
+                break
+            qLowerX59, qUpperX59 = getBoundaries(curve)
+            for targetX59 in prices:
+                if len(swaps['target']) >= size:
+                    break
+                if (targetX59 != curve[-1]) and (qLowerX59 < targetX59) and (targetX59 < qUpperX59):
+                    swaps['kernel'] += [kernel]
+                    swaps['curve'] += [curve]
+                    swaps['target'] += [targetX59]
+
+    return initializations, swaps, kernelsValid, kernelsInvalid
+
+def amend(curve, targetX59):
+    newCurve = [point for point in curve]
+    point0 = newCurve[0]
+    point1 = newCurve[1]
+    if targetX59 <= min(point0, point1):
+        return [max(point0, point1), min(point0, point1)]
+    if targetX59 >= max(point0, point1):
+        return [min(point0, point1), max(point0, point1)]
+    index = 1
+    while (True):
+        if (min(point0, point1) < targetX59 < max(point0, point1)):
+            point0 = point1
+            index += 1
+            if (index < len(newCurve)):
+                point1 = curve[index]
+            else:
+                break
+        else:
+            break
+    if (index < len(newCurve)):
+        newCurve[index] = targetX59
+        newCurve = newCurve[0: (index + 1)]
+    else:
+        newCurve += [targetX59]
+    return newCurve
+
+class CompiledKernel:
+    # A kernel '[[x, y], ...]' compiled once into coefficient tables. It can be
+    # indexed like the original list while the reference functions read the
+    # breakpoints and the rational coordinates 'b' and 'c' directly from the
+    # tables.
+    __slots__ = ('points', 'breakpoints', 'c', 'b')
+
+    def __init__(self, kernel):
+        self.points = tuple((int(point[0]), int(point[1])) for point in kernel)
+        self.breakpoints = array('Q', [point[0] for point in self.points])
+        self.c = tuple(Integer(point[1]) / X15 for point in self.points)
+        self.b = tuple(Integer(point[0]) / X59 for point in self.points)
+
+    def __len__(self):
+        return len(self.points)
+
+    def __getitem__(self, index):
+        return self.points[index]
+
+    def __iter__(self):
+        return iter(self.points)
+
+    def __repr__(self):
+        return 'CompiledKernel(' + str([list(point) for point in self.points]) + ')'
+
+def kernelFingerprint(kernel):
+    if type(kernel) is CompiledKernel:
+        return kernel.points
+    return tuple((int(point[0]), int(point[1])) for point in kernel)
+
+@lru_cache(maxsize = 1024)
+def _compileKernel(fingerprint):
+    return CompiledKernel(fingerprint)
+
+def compileKernel(kernel):
+    if type(kernel) is CompiledKernel:
+        return kernel
+    return _compileKernel(kernelFingerprint(kernel))
+
+def getFunctionFromKernel(kernel):
+    kernel = compileKernel(kernel)
+    h = Symbol('h', real = True)
+    args = []
+    for k in range(len(kernel) - 1):
+        c0 = kernel.c[k]
+        c1 = kernel.c[k + 1]
+        b0 = kernel.b[k]
+        b1 = kernel.b[k + 1]
+        if b1 != b0:
+            args = args + [(
+                c0 + ((c1 - c0) * (h - b0) / (b1 - b0)),
+                And(b0 < h, h < b1)
+            )]
+    args = args + [(0, h < 0), (0, kernel.b[-1] < h), (0, True)]
+    return Piecewise(*args), h
+
+def getFunctionFromCurve(curve, kernel):
+    zKernel, h = getFunctionFromKernel(kernel)
+    args = []
+    for k in range(len(curve), 1, -1):
+        point0 = (curve[min(k, len(curve) - 1)] - X63) / Integer(X59)
+        point1 = (curve[k - 1] - X63) / Integer(X59)
+        point2 = (curve[k - 2] - X63) / Integer(X59)
+        if point2 > point0:
+            args = args + [(zKernel.subs(h, h - point1), And(point0 < h, h < point2))]
+        else:
+            args = args + [(zKernel.subs(h, point1 - h), And(point2 < h, h < point0))]
+    point1 = min((curve[0] - X63) / Integer(X59), (curve[1] - X63) / Integer(X59))
+    point2 = max((curve[0] - X63) / Integer(X59), (curve[1] - X63) / Integer(X59))
+    args = args + [(0, h < point1), (0, point2 < h), (0, True)]
+    return Piecewise(*args), h
+
+# The engine used by 'outgoing' and 'incoming' to evaluate each kernel
+# segment. 'sympy' integrates symbolically and 'mpmath' evaluates the
+# closed-form antiderivative directly. 'integer' and 'adaptive' defer the
+# evaluation to 'floorIntegral' where, after exact cancellation, the closed
+# form is evaluated with an error bound at increasing precisions until the
+# floor is proven, using fixed-point arithmetic with only int operations and
+# interval arithmetic, respectively. All of them return identical floors.
+integralEngines = ['sympy', 'mpmath', 'integer', 'adaptive']
+integralEngine = 'sympy'
+
+mpContext = mpmath.MPContext()
+mpContext.dps = 220
+
+# The precisions in bits attempted first by the 'integer' and 'adaptive'
+# engines. The integrals are around '2 ** 216' in magnitude, so fewer bits
+# cannot settle a floor. Beyond the last one, the precision keeps doubling.
+ivContext = mpmath.MPIntervalContext()
+adaptivePrecisions = [256, 512, 1024, 2048, 4096]
+
+def setIntegralEngine(engine):
+    global integralEngine
+    if engine not in integralEngines:
+        raise ValueError('Unknown integral engine: ' + str(engine))
+    integralEngine = engine
+
+@lru_cache(maxsize = None)
+def ln2Integer(precision):
+    # 'log(2) = sum(1 / (k * 2 ** k))' with 'precision' fractional bits and 64
+    # extra bits to absorb the truncation of each term.
+    guard = precision + 64
+    result = 0
+    for k in range(1, guard + 1):
+        result += (1 << (guard - k)) // k
+    return result >> 64
+
+def expInteger(exponent, precision):
+    # Both 'exponent' and the result are fixed-point numbers with 'precision'
+    # fractional bits. The exponent is reduced to '[0, log(2))' before the
+    # Taylor series is applied. Returns the result and a bound on its error in
+    # units of '2 ** -precision'.
+    #
+    # 'ln2' is within 2 units of 'log(2)' at 'guard' bits, so the reduced
+    # exponent 'r' is within '2 * abs(q)' units, which moves the series by at
+    # most '4 * abs(q)' units as its value is below 2. Each of the 'k' terms
+    # is truncated by at most 6 units and the dropped tail is below 23 units.
+    # The shift by 'q' scales these errors and the final truncations add one
+    # unit each.
+    if exponent == 0:
+        return 1 << precision, 0
+    guard = precision + 64
+    exponent <<= 64
+    ln2 = ln2Integer(guard)
+    q = exponent // ln2
+    r = exponent - q * ln2
+    result = 0
+    term = 1 << guard
+    k = 0
+    while term != 0:
+        result += term
+        k += 1
+        term = ((term * r) >> guard) // k
+    result = (result << q) if q >= 0 else (result >> (- q))
+    return result >> 64, 2 + (((6 * k + 4 * abs(q) + 25) << max(q, 0)) >> 64)
+
+class AdaptiveIntegral:
+    # An unevaluated sum of kernel segments produced by the 'integer' and
+    # 'adaptive' engines. Each term
+    # '(c0, c1, b0, b1, limit0, limit1, sign, shiftX59)' is mapped to its
+    # integer coefficient so that common terms cancel exactly when prefix sums
+    # are subtracted.
+    __slots__ = ('terms',)
+
+    def __init__(self, terms = None):
+        self.terms = terms or {}
+
+    def combine(self, other, factor):
+        if isinstance(other, AdaptiveIntegral):
+            terms = dict(self.terms)
+            for term, coefficient in other.terms.items():
+                coefficient = terms.get(term, 0) + factor * coefficient
+                if coefficient == 0:
+                    terms.pop(term, None)
+                else:
+                    terms[term] = coefficient
+            return AdaptiveIntegral(terms)
+        if other == 0:
+            return self
+        return NotImplemented
+
+    def __add__(self, other):
+        return self.combine(other, +1)
+
+    def __radd__(self, other):
+        return self.combine(other, +1)
+
+    def __sub__(self, other):
+        return self.combine(other, -1)
+
+    def __rsub__(self, other):
+        return AdaptiveIntegral().combine(self, -1).combine(other, +1)
+
+    def scale(self, shiftX59):
+        return AdaptiveIntegral({term[:-1] + (term[-1] + shiftX59,): coefficient for term, coefficient in self.terms.items()})
+
+    def expand(self):
+        # The exact value as '{exponent: coefficient}' such that the integral
+        # is equal to 'sum(coefficient * exp(exponent))'. Terms that share an
+        # exponent are combined, so sums which are zero but not term by term
+        # cancel here exactly.
+        expansion = {}
+        for term, coefficient in self.terms.items():
+            for exponent, value in adaptiveExpansion(term):
+                expansion[exponent] = expansion.get(exponent, 0) + coefficient * value
+        return {exponent: value for exponent, value in expansion.items() if value != 0}
+
+@lru_cache(maxsize = 1 << 16)
+def adaptiveExpansion(term):
+    # 'X216 * exp(-8) * (F(limit1) - F(limit0)) / 2' as in 'segmentIntegral',
+    # multiplied by 'exp(shiftX59 / X60)', where
+    # 'F(x) = exp(a * x) * ((c0 + m * (x - b0)) / a - m / (a * a))' is written
+    # as '((exponent, coefficient), (exponent, coefficient))' with rational
+    # exponents and coefficients.
+    c0, c1, b0, b1, limit0, limit1, sign, shiftX59 = term
+    c0 = Fraction(c0.p, c0.q)
+    c1 = Fraction(c1.p, c1.q)
+    b0 = Fraction(b0 - X63, X59)
+    b1 = Fraction(b1 - X63, X59)
+    a = Fraction(sign, 2)
+    m = (c1 - c0) / (b1 - b0)
+    expansion = []
+    for limit, direction in [(limit1, 1), (limit0, -1)]:
+        x = Fraction(limit - X63, X59)
+        expansion.append((
+            a * x + Fraction(shiftX59, X60) - 8,
+            direction * Fraction(X216, 2) * ((c0 + m * (x - b0)) / a - m / (a * a))
+        ))
+    return tuple(expansion)
+
+@lru_cache(maxsize = 1 << 16)
+def adaptiveExp(exponent, precision):
+    ctx = ivContext
+    ctx.prec = precision
+    return ctx.exp(ctx.mpf(exponent.numerator) / exponent.denominator)
+
+def intervalQuotient(numerator, denominator, precision):
+    # The floors of the ends of an interval which encloses
+    # 'numerator / denominator', where both are expansions as in
+    # 'AdaptiveIntegral.expand', using interval arithmetic.
+    ctx = ivContext
+    ctx.prec = precision
+    values = []
+    for expansion in [numerator, denominator]:
+        total = ctx.mpf(0)
+        for exponent, coefficient in expansion.items():
+            total += ctx.mpf(coefficient.numerator) / coefficient.denominator * adaptiveExp(exponent, precision)
+        values += [total]
+    lower, upper = (values[0] / values[1])._mpi_
+    return mpmath.libmp.to_int(mpmath.libmp.mpf_floor(lower)), mpmath.libmp.to_int(mpmath.libmp.mpf_floor(upper))
+
+def integerSum(expansion, precision):
+    # An expansion as a fixed-point number with 'precision' fractional bits
+    # and a bound on its error, using only int operations.
+    value = 0
+    error = 0
+    for exponent, coefficient in expansion.items():
+        power, bound = expInteger((exponent.numerator << precision) // exponent.denominator, precision)
+        if (exponent.numerator << precision) % exponent.denominator != 0:
+            # The truncated exponent moves the power by at most one unit of
+            # its own magnitude.
+            bound += (power >> precision) + 2
+        value += (coefficient.numerator * power) // coefficient.denominator
+        error += (abs(coefficient.numerator) * bound) // coefficient.denominator + 2
+    return value, error
+
+def integerQuotient(numerator, denominator, precision):
+    # As 'intervalQuotient' for a positive 'denominator', with 'integerSum'.
+    value0, error0 = integerSum(numerator, precision)
+    value1, error1 = integerSum(denominator, precision)
+    lower0, upper0 = value0 - error0, value0 + error0
+    lower1, upper1 = value1 - error1, value1 + error1
+    if lower1 <= 0:
+        return 0, 1
+    return lower0 // (upper1 if lower0 >= 0 else lower1), upper0 // (lower1 if upper0 >= 0 else upper1)
+
+# The enclosures of the engines whose floors are proven by 'floorQuotient'.
+quotients = {'integer': integerQuotient, 'adaptive': intervalQuotient}
+
+def rationalQuotient(numerator, denominator):
+    # The rational 'q' with 'numerator == q * denominator', if any, where both
+    # are expansions without zero coefficients.
+    if not numerator:
+        return Fraction(0)
+    if numerator.keys() != denominator.keys():
+        return None
+    exponent = next(iter(denominator))
+    quotient = numerator[exponent] / denominator[exponent]
+    if all(numerator[exponent] == quotient * coefficient for exponent, coefficient in denominator.items()):
+        return quotient
+    return None
+
+def floorQuotient(numerator, denominator, engine):
+    # The floor of 'numerator / denominator' for a positive 'denominator'. By
+    # the Lindemann-Weierstrass theorem, 'exp' at distinct rational exponents
+    # are linearly independent over the rationals. Hence, the quotient is
+    # either the rational of 'rationalQuotient', which is floored exactly, or
+    # irrational and never an integer, in which case the enclosure eventually
+    # falls strictly between two integers and escalating the precision always
+    # terminates.
+    quotient = rationalQuotient(numerator, denominator)
+    if quotient is not None:
+        return Integer(quotient.numerator // quotient.denominator)
+    precision = adaptivePrecisions[0]
+    while True:
+        lower, upper = quotients[engine](numerator, denominator, precision)
+        if lower == upper:
+            return Integer(lower)
+        # The width of the enclosure tells how many more bits are needed.
+        required = precision + (upper - lower).bit_length() + 8
+        precision = next((rung for rung in adaptivePrecisions if rung >= required), max(required, 2 * precision))
+
+def segmentIntegral(c0, c1, b0, b1, limit0, limit1, sign, engine = None):
+    # Calculates 'X216 * exp(-8) * (F(limit1) - F(limit0)) / 2' where 'F' is
+    # the antiderivative of 'z(h) * exp(sign * h / 2)' and 'z' is the linear
+    # interpolation between '(b0, c0)' and '(b1, c1)'.
+    engine = engine or integralEngine
+    if engine == 'sympy':
+        h = Symbol('h', real = True)
+        f = ((c0 + ((c1 - c0) * (h - toRational(b0)) / (toRational(b1) - toRational(b0)))) * exp(sign * h / 2)).integrate(h)
+        return N(X216 * exp(-8) * (f.subs(h, toRational(limit1)) - f.subs(h, toRational(limit0))) / 2, 200)
+    if engine == 'mpmath':
+        ctx = mpContext
+        c0 = ctx.mpf(c0.p) / c0.q
+        c1 = ctx.mpf(c1.p) / c1.q
+        b0 = ctx.mpf(b0 - X63) / X59
+        b1 = ctx.mpf(b1 - X63) / X59
+        limit0 = ctx.mpf(limit0 - X63) / X59
+        limit1 = ctx.mpf(limit1 - X63) / X59
+        a = ctx.mpf(sign) / 2
+        m = (c1 - c0) / (b1 - b0)
+        F = lambda x: ctx.exp(a * x) * ((c0 + m * (x - b0)) / a - m / (a * a))
+        return X216 * ctx.exp(-8) * (F(limit1) - F(limit0)) / 2
+    if engine in quotients:
+        if limit0 == limit1:
+            return AdaptiveIntegral()
+        return AdaptiveIntegral({(c0, c1, b0, b1, limit0, limit1, sign, 0): 1})
+    raise ValueError('Unknown integral engine: ' + str(engine))
+
+def floorIntegral(integral, engine = None):
+    engine = engine or integralEngine
+    if engine == 'mpmath':
+        return Integer(int(mpContext.floor(integral)))
+    if engine in quotients:
+        if integral == 0:
+            return Integer(0)
+        return floorQuotient(integral.expand(), {Fraction(0): Fraction(1)}, engine)
+    return floor(integral)
+
+def outgoing(curve, kernel, qMinX59, qMaxX59, engine = None):
+    if qMinX59 == qMaxX59:
+        return Integer(0)
+    
+    engine = engine or integralEngine
+    kernel = compileKernel(kernel)
+    x = kernel.breakpoints
+    c = kernel.c
+    integral = 0
+
+    if curve[-1] <= qMinX59:
+        for kk in range(len(curve), 1, -1):
+            point0 = curve[min(kk, len(curve) - 1)]
+            point1 = curve[kk - 1]
+            point2 = curve[kk - 2]
+            if point0 < point2:
+                begin = max(qMinX59, point0)
+                end = min(qMaxX59, point2)
+                if begin < end:
+                    for ii in range(len(kernel) - 1):
+                        c0 = c[ii]
+                        c1 = c[ii + 1]
+                        b0 = point1 + x[ii]
+                        b1 = point1 + x[ii + 1]
+                        limit0 = max(b0, begin)
+                        limit1 = min(b1, end)
+                        if limit0 < limit1:
+                            integral += segmentIntegral(c0, c1, b0, b1, limit0, limit1, -1, engine)
+        return floorIntegral(integral, engine)
+    
+    if qMaxX59 <= curve[-1]:
+        for kk in range(len(curve), 1, -1):
+            point0 = curve[min(kk, len(curve) - 1)]
+            point1 = curve[kk - 1]
+            point2 = curve[kk - 2]
+            if point2 < point0:
+                begin = min(qMaxX59, point0)
+                end = max(qMinX59, point2)
+                if end < begin:
+                    for ii in range(len(kernel) - 1):
+                        c0 = c[ii]
+                        c1 = c[ii + 1]
+                        b0 = point1 - x[ii]
+                        b1 = point1 - x[ii + 1]
+                        limit0 = max(b1, end)
+                        limit1 = min(b0, begin)
+                        if limit0 < limit1:
+                            integral += segmentIntegral(c0, c1, b0, b1, limit0, limit1, +1, engine)
+        return floorIntegral(integral, engine)
+
+def incoming(curve, kernel, qMinX59, qMaxX59, engine = None):
+    if qMinX59 == qMaxX59:
+        return Integer(0)
+    
+    engine = engine or integralEngine
+    kernel = compileKernel(kernel)
+    x = kernel.breakpoints
+    c = kernel.c
+    integral = 0
+
+    if curve[-1] <= qMinX59:
+        for kk in range(len(curve), 1, -1):
+            point0 = curve[min(kk, len(curve) - 1)]
+            point1 = curve[kk - 1]
+            point2 = curve[kk - 2]
+            if point0 < point2:
+                begin = max(qMinX59, point0)
+                end = min(qMaxX59, point2)
+                if begin < end:
+                    for ii in range(len(kernel) - 1):
+                        c0 = c[ii]
+                        c1 = c[ii + 1]
+                        b0 = point1 + x[ii]
+                        b1 = point1 + x[ii + 1]
+                        limit0 = max(b0, begin)
+                        limit1 = min(b1, end)
+                        if limit0 < limit1:
+                            integral += segmentIntegral(c0, c1, b0, b1, limit0, limit1, +1, engine)
+        return floorIntegral(integral, engine)
+    
+    if qMaxX59 <= curve[-1]:
+        for kk in range(len(curve), 1, -1):
+            point0 = curve[min(kk, len(curve) - 1)]
+            point1 = curve[kk - 1]
+            point2 = curve[kk - 2]
+            if point2 < point0:
+                begin = min(qMaxX59, point0)
+                end = max(qMinX59, point2)
+                if end < begin:
+                    for ii in range(len(kernel) - 1):
+                        c0 = c[ii]
+                        c1 = c[ii + 1]
+                        b0 = point1 - x[ii]
+                        b1 = point1 - x[ii + 1]
+                        limit0 = max(b1, end)
+                        limit1 = min(b0, begin)
+                        if limit0 < limit1:
+                            integral += segmentIntegral(c0, c1, b0, b1, limit0, limit1, -1, engine)
+        return floorIntegral(integral, engine)
+
+class CurveIndex:
+    # Prefix integrals over both sides of a curve for a given kernel so that
+    # 'outgoing' and 'incoming' can be answered for arbitrary '[qMin, qMax]'
+    # via binary search plus a partial segment evaluation at each end.
+    def __init__(self, curve, kernel, engine = None):
+        self.curve = list(curve)
+        self.kernel = compileKernel(kernel)
+        self.engine = engine or integralEngine
+        self.pieces = {}
+        self.prefixes = {}
+
+    def getPieces(self, right):
+        # The curve pieces to the right ('right == True') or to the left of
+        # 'curve[-1]', each paired with the kernel segment that covers it.
+        if right not in self.pieces:
+            curve = self.curve
+            kernel = self.kernel
+            x = kernel.breakpoints
+            c = kernel.c
+            pieces = []
+            for kk in range(len(curve), 1, -1):
+                point0 = curve[min(kk, len(curve) - 1)]
+                point1 = curve[kk - 1]
+                point2 = curve[kk - 2]
+                if right and point0 < point2:
+                    for ii in range(len(kernel) - 1):
+                        b0 = point1 + x[ii]
+                        b1 = point1 + x[ii + 1]
+                        limit0 = max(b0, point0)
+                        limit1 = min(b1, point2)
+                        if limit0 < limit1:
+                            pieces += [(limit0, limit1, c[ii], c[ii + 1], b0, b1)]
+                if not(right) and point2 < point0:
+                    for ii in range(len(kernel) - 1):
+                        b0 = point1 - x[ii]
+                        b1 = point1 - x[ii + 1]
+                        limit0 = max(b1, point2)
+                        limit1 = min(b0, point0)
+                        if limit0 < limit1:
+                            pieces += [(limit0, limit1, c[ii], c[ii + 1], b0, b1)]
+            self.pieces[right] = sorted(pieces, key = lambda piece: piece[0])
+        return self.pieces[right]
+
+    def getPrefix(self, right, sign):
+        if (right, sign) not in self.prefixes:
+            pieces = self.getPieces(right)
+            cumulative = [0]
+            for limit0, limit1, c0, c1, b0, b1 in pieces:
+                cumulative += [cumulative[-1] + segmentIntegral(c0, c1, b0, b1, limit0, limit1, sign, self.engine)]
+            self.prefixes[(right, sign)] = ([piece[0] for piece in pieces], cumulative)
+        return self.prefixes[(right, sign)]
+
+    def evaluate(self, right, sign, qX59):
+        # The integral from the beginning of the given side up to 'qX59'.
+        starts, cumulative = self.getPrefix(right, sign)
+        j = bisect_right(starts, qX59) - 1
+        if j < 0:
+            return 0
+        limit0, limit1, c0, c1, b0, b1 = self.pieces[right][j]
+        if limit1 <= qX59:
+            return cumulative[j + 1]
+        if qX59 == limit0:
+            return cumulative[j]
+        return cumulative[j] + segmentIntegral(c0, c1, b0, b1, limit0, qX59, sign, self.engine)
+
+    def integral(self, sign, qMinX59, qMaxX59):
+        if qMinX59 == qMaxX59:
+            return Integer(0)
+        if self.curve[-1] <= qMinX59:
+            return floorIntegral(self.evaluate(True, sign, qMaxX59) - self.evaluate(True, sign, qMinX59), self.engine)
+        if qMaxX59 <= self.curve[-1]:
+            return floorIntegral(self.evaluate(False, - sign, qMaxX59) - self.evaluate(False, - sign, qMinX59), self.engine)
+
+    def outgoing(self, qMinX59, qMaxX59):
+        return self.integral(-1, qMinX59, qMaxX59)
+
+    def incoming(self, qMinX59, qMaxX59):
+        return self.integral(+1, qMinX59, qMaxX59)
+
+# Indices are keyed by the content of the curve. Hence, once 'amend' produces a
+# new curve, the index of the old curve is no longer consulted and is
+# eventually evicted.
+@lru_cache(maxsize = 64)
+def _getCurveIndex(curve, fingerprint, engine):
+    return CurveIndex(curve, compileKernel(fingerprint), engine)
+
+def getCurveIndex(curve, kernel, engine = None):
+    return _getCurveIndex(tuple(curve), kernelFingerprint(kernel), engine or integralEngine)
+
+# Up to a factor of 'exp(- (lower - X63) / X60)', the integral over an entire
+# interval whose curve is '[upper, lower]' does not depend on 'lower'.
+# Similarly, up to 'exp(+ (upper - X63) / X60)', the integral over an interval
+# whose curve is '[lower, upper]' does not depend on 'upper'. Hence, the two
+# unfloored integrals are computed once per kernel and are scaled per interval.
+@lru_cache(maxsize = 256)
+def _getIntervalTemplate(fingerprint, engine):
+    kernel = compileKernel(fingerprint)
+    x = kernel.breakpoints
+    descending = 0
+    ascending = 0
+    for ii in range(len(kernel) - 1):
+        c0 = kernel.c[ii]
+        c1 = kernel.c[ii + 1]
+        if x[ii] < x[ii + 1]:
+            b0 = X63 + x[ii]
+            b1 = X63 + x[ii + 1]
+            descending += segmentIntegral(c0, c1, b0, b1, b0, b1, -1, engine)
+            b0 = X63 - x[ii]
+            b1 = X63 - x[ii + 1]
+            ascending += segmentIntegral(c0, c1, b0, b1, b1, b0, +1, engine)
+    return descending, ascending
+
+def getIntervalTemplate(kernel, engine = None):
+    return _getIntervalTemplate(kernelFingerprint(kernel), engine or integralEngine)
+
+def scaleIntegral(integral, shiftX59, engine = None):
+    # Multiplies an unfloored integral by 'exp(shiftX59 / X60)'.
+    engine = engine or integralEngine
+    if engine == 'sympy':
+        return N(integral * exp(Integer(shiftX59) / X60), 200)
+    if engine == 'mpmath':
+        return integral * mpContext.exp(mpContext.mpf(shiftX59) / X60)
+    if engine in quotients:
+        return integral.scale(shiftX59)
+    raise ValueError('Unknown integral engine: ' + str(engine))
+
+def outgoingInterval(kernel, lowerX59, upperX59, descending, engine = None):
+    # Equivalent to
+    #
+    # 'outgoing([upperX59, lowerX59], kernel, lowerX59, upperX59, engine)'
+    #
+    # if 'descending' and to
+    #
+    # 'outgoing([lowerX59, upperX59], kernel, lowerX59, upperX59, engine)'
+    #
+    # otherwise.
+    engine = engine or integralEngine
+    curve = [upperX59, lowerX59] if descending else [lowerX59, upperX59]
+    kernel = compileKernel(kernel)
+    if upperX59 - lowerX59 != kernel.breakpoints[-1]:
+        return outgoing(curve, kernel, lowerX59, upperX59, engine)
+    unitDescending, unitAscending = getIntervalTemplate(kernel, engine)
+    if descending:
+        return floorIntegral(scaleIntegral(unitDescending, - (lowerX59 - X63), engine), engine)
+    else:
+        return floorIntegral(scaleIntegral(unitAscending, + (upperX59 - X63), engine), engine)
+
+def intervalIntegrals(curve, kernel, logPrices, engine = None):
+    # Batch version of the per-interval integrals in 'Pool.modifyPosition'.
+    # Returns two lists holding the exact outgoing integrals of every interval
+    # '[logPrice, logPrice + spacing]' towards tokens 0 and 1, respectively.
+    # The intervals are aligned with the curve. Hence, an interval above the
+    # curve has no integral towards token 1 and one below it has none towards
+    # token 0, and only the remaining integrals are evaluated.
+    engine = engine or integralEngine
+    lower = min(curve[0], curve[1])
+    upper = max(curve[0], curve[1])
+    current = curve[-1]
+    spacing = upper - lower
+    index = getCurveIndex(curve, kernel, engine)
+
+    integrals0 = []
+    integrals1 = []
+    for logPrice in logPrices:
+        if logPrice + spacing <= lower:
+            integrals0 += [Integer(0)]
+        elif logPrice == lower:
+            integrals0 += [index.outgoing(current, upper)]
+        else:
+            integrals0 += [outgoingInterval(kernel, logPrice, logPrice + spacing, True, engine)]
+        if upper <= logPrice:
+            integrals1 += [Integer(0)]
+        elif logPrice == lower:
+            integrals1 += [index.outgoing(lower, current)]
+        else:
+            integrals1 += [outgoingInterval(kernel, logPrice, logPrice + spacing, False, engine)]
+    return integrals0, integrals1
+
+# The maximum integrals only depend on the kernel. Hence, they are memoized in
+# a bounded LRU cache keyed by 'kernelFingerprint(kernel)' which is shared by
+# 'Pool', 'checkPool' and the test modules.
+maxIntegralsCacheSize = 1024
+
+def getMaxIntegrals(kernel, engine = None):
+    return _getMaxIntegrals(kernelFingerprint(kernel), engine or integralEngine)
+
+def getMaxIntegralsCacheInfo():
+    return _getMaxIntegrals.cache_info()
+
+def clearMaxIntegralsCache():
+    _getMaxIntegrals.cache_clear()
+
+@lru_cache(maxsize = maxIntegralsCacheSize)
+def _getMaxIntegrals(fingerprint, engine):
+    kernel = compileKernel(fingerprint)
+    if engine != 'sympy':
+        # Both integrals are translation invariant. Hence, they are evaluated
+        # segment by segment over '[X63, X63 + kernel[-1][0]]'.
+        x = kernel.breakpoints
+        outgoingMax = 0
+        incomingMax = 0
+        for ii in range(len(kernel) - 1):
+            if x[ii] < x[ii + 1]:
+                b0 = X63 + x[ii]
+                b1 = X63 + x[ii + 1]
+                outgoingMax += segmentIntegral(kernel.c[ii], kernel.c[ii + 1], b0, b1, b0, b1, -1, engine)
+                incomingMax += segmentIntegral(kernel.c[ii], kernel.c[ii + 1], b0, b1, b0, b1, +1, engine)
+        return floorIntegral(outgoingMax, engine), floorIntegral(scaleIntegral(incomingMax, - x[-1], engine), engine)
+    lower = 1
+    upper = kernel[-1][0] + 1
+    zKernel, hKernel = getFunctionFromKernel(kernel)
+    zOutgoing = piecewise_fold(zKernel.subs(hKernel, hKernel - (Integer(lower - (2 ** 63)) / (2 ** 59))) * exp(- hKernel / 2), evaluate = True)._eval_integral(hKernel)
+    outgoingMax = floor(N((2 ** 216) * exp(-8) * exp(+ Integer(lower - (2 ** 63)) / (2 ** 60)) * (zOutgoing.subs(hKernel, Integer(upper - 2 ** 63) / (2 ** 59)) - zOutgoing.subs(hKernel, Integer(lower - 2 ** 63) / (2 ** 59))) / 2, 100))
+    zIncoming = piecewise_fold(zKernel.subs(hKernel, hKernel - (Integer(lower - (2 ** 63)) / (2 ** 59))) * exp(+ hKernel / 2), evaluate = True)._eval_integral(hKernel)
+    incomingMax = floor(N((2 ** 216) * exp(-8) * exp(- Integer(upper - (2 ** 63)) / (2 ** 60)) * (zIncoming.subs(hKernel, Integer(upper - 2 ** 63) / (2 ** 59)) - zIncoming.subs(hKernel, Integer(lower - 2 ** 63) / (2 ** 59))) / 2, 100))
+    return outgoingMax, incomingMax
+
+class Pool:
+    def __init__(
+        self,
+        logOffset,
+        curve,
+        kernel,
+        protocolGrowthPortion,
+        poolGrowthPortion,
+        numberOfIntervals
+    ):
+        self.protocolGrowthPortion = protocolGrowthPortion
+        self.poolGrowthPortion = poolGrowthPortion
+        self.logOffset = Integer(logOffset)
+        self.curve = curve
+        self.kernel = kernel
+        self.amount0 = 0
+        self.amount1 = 0
+        self.poolAccrued0 = 0
+        self.poolAccrued1 = 0
+        self.protocolAccrued0 = 0
+        self.protocolAccrued1 = 0
+
+        lower = min(curve[0], curve[1])
+        upper = max(curve[0], curve[1])
+        spacing = upper - lower
+        minLogPrice = max(spacing - ((- lower) % spacing), lower - numberOfIntervals * spacing)
+        maxLogPrice = ((2 ** 64) - 1) - (((2 ** 64) - 1) % spacing) + (lower % spacing)
+        if maxLogPrice > ((2 ** 64) - 1):
+            maxLogPrice -= spacing
+        maxLogPrice = min(maxLogPrice, upper + numberOfIntervals * spacing)
+
+        self.growth = {}
+        self.sharesTotal = {}
+        for logPrice in range(minLogPrice, maxLogPrice, spacing):
+            self.growth[logPrice] = Integer(1)
+            self.sharesTotal[logPrice] = Integer(0)
+
+    def modifyPosition(
+        self,
+        logPriceMin,
+        logPriceMax,
+        shares
+    ):
+        logPriceMinOffsetted = int(logPriceMin - self.logOffset * (1 << 59) + (1 << 63))
+        logPriceMaxOffsetted = int(logPriceMax - self.logOffset * (1 << 59) + (1 << 63))
+        lower = min(self.curve[0], self.curve[1])
+        upper = max(self.curve[0], self.curve[1])
+        spacing = upper - lower
+
+        outgoingMax, incomingMax = getMaxIntegrals(self.kernel)
+
+        logPrices = list(range(logPriceMinOffsetted, logPriceMaxOffsetted, spacing))
+        integrals0, integrals1 = intervalIntegrals(self.curve, self.kernel, logPrices)
+
+        for logPrice, integral0, integral1 in zip(logPrices, integrals0, integrals1):
+            growth = self.growth[logPrice]
+            _shares = shares
+            sqrtOffset = exp(self.logOffset / 2)
+
+            if integral0 != 0:
+                self.amount0 += _shares * growth * (integral0 / outgoingMax) / sqrtOffset
+            if integral1 != 0:
+                self.amount1 += _shares * growth * (integral1 / outgoingMax) * sqrtOffset
+
+            self.sharesTotal[logPrice] += shares
+
+    def swap(
+        self,
+        target,
+        overshoot
+    ):
+        current = self.curve[-1]
+        if target == current:
+            return Integer(1), Integer(1), Integer(1)
+        zeroForOne = target < current
+        outgoingMax, incomingMax = getMaxIntegrals(self.kernel)
+
+        lower = min(self.curve[0], self.curve[1])
+        upper = max(self.curve[0], self.curve[1])
+        spacing = upper - lower
+
+        g = Integer(0)
+        g_minus = Integer(0)
+        g_plus = Integer(0)
+
+        while (current != target):
+            growth = self.growth[lower]
+            shares = self.sharesTotal[lower]
+            sqrtOffset = exp(self.logOffset / 2)
+
+            _target = max(target, lower) if zeroForOne else min(target, upper)
+            index = getCurveIndex(self.curve, self.kernel)
+
+            self.amount0 -= shares * growth * (index.outgoing(current, upper) / outgoingMax) / sqrtOffset
+            self.amount1 -= shares * growth * (index.outgoing(lower, current) / outgoingMax) * sqrtOffset
+
+            if _target != target:
+                if zeroForOne:
+                    g = (index.outgoing(current, upper) + index.incoming(lower, current)) / outgoingInterval(self.kernel, lower, upper, True)
+                    self.amount0 += shares * g * growth * (outgoingInterval(self.kernel, lower, upper, True) / outgoingMax) / sqrtOffset
+                    self.growth[lower] = (1 + (g - 1) * (1 - self.protocolGrowthPortion) * (1 - self.poolGrowthPortion)) * self.growth[lower]
+                    self.curve = [lower - spacing, lower]
+                    current = lower
+                    upper = lower
+                    lower = lower - spacing
+                else:
+                    g = (index.outgoing(lower, current) + index.incoming(current, upper)) / outgoingInterval(self.kernel, lower, upper, False)
+                    self.amount1 += shares * g * growth * (outgoingInterval(self.kernel, lower, upper, False) / outgoingMax) * sqrtOffset
+                    self.growth[lower] = (1 + (g - 1) * (1 - self.protocolGrowthPortion) * (1 - self.poolGrowthPortion)) * self.growth[lower]
+                    self.curve = [upper + spacing, upper]
+                    current = upper
+                    lower = upper
+                    upper = upper + spacing
+            else:
+                _curve = amend(amend(self.curve, overshoot), target)
+
+                _index = getCurveIndex(_curve, self.kernel)
+                denominator0 = _index.outgoing(target, upper)
+                denominator1 = _index.outgoing(lower, target)
+
+                if zeroForOne:
+                    numerator0 = index.outgoing(current, upper) + index.incoming(target, current)
+                    numerator1 = index.outgoing(lower, target)
+                else:
+                    numerator0 = index.outgoing(target, upper)
+                    numerator1 = index.outgoing(lower, current) + index.incoming(current, target)
+
+                if denominator0 == 0:
+                    g0 = +oo
+                else:
+                    g0 = numerator0 / denominator0
+
+                if denominator1 == 0:
+                    g1 = +oo
+                else:
+                    g1 = numerator1 / denominator1
+
+                g = min(g0, g1)
+
+                self.amount0 += shares * g * growth * (denominator0 / outgoingMax) / sqrtOffset
+                self.amount1 += shares * g * growth * (denominator1 / outgoingMax) * sqrtOffset
+
+                if (overshoot != upper) and not(zeroForOne and (overshoot == target)):
+                    _curve_plus = amend(amend(self.curve, overshoot + 1), target)
+
+                    denominator0 = outgoing(_curve_plus, self.kernel, target, upper)
+                    denominator1 = outgoing(_curve_plus, self.kernel, lower, target)
+
+                    if denominator0 == 0:
+                        g0 = Integer(1)
+                    else:
+                        g0 = numerator0 / denominator0
+
+                    if denominator1 == 0:
+                        g1 = Integer(1)
+                    else:
+                        g1 = numerator1 / denominator1
+
+                    g_plus = min(g0, g1)
+
+                if (overshoot != lower) and not(not(zeroForOne) and (overshoot == target)):
+                    _curve_minus = amend(amend(self.curve, overshoot - 1), target)
+
+                    denominator0 = outgoing(_curve_minus, self.kernel, target, upper)
+                    denominator1 = outgoing(_curve_minus, self.kernel, lower, target)
+
+                    if denominator0 == 0:
+                        g0 = Integer(1)
+                    else:
+                        g0 = numerator0 / denominator0
+
+                    if denominator1 == 0:
+                        g1 = Integer(1)
+                    else:
+                        g1 = numerator1 / denominator1
+
+                    g_plus = min(g0, g1)
+
+                self.curve = _curve
+                self.growth[lower] = (1 + (g - 1) * (1 - self.protocolGrowthPortion) * (1 - self.poolGrowthPortion)) * self.growth[lower]
+                current = target
+
+        return g, g_minus, g_plus
+
+def getGrowthMultiplier(nofeeswap, access, poolId, lower, upper, logPrice):
+    growthMultiplier = access._readGrowthMultiplier(nofeeswap, poolId, logPrice)
+
+    if growthMultiplier != 0:
+        return growthMultiplier
+    else:
+        if logPrice <= lower:
+            return (2 ** 208) * exp(+ Integer(logPrice - (2 ** 63)) / (2 ** 60)) / (1 - exp(- Integer(upper - lower) / (2 ** 60)))
+        else:
+            return (2 ** 208) * exp(- Integer(logPrice - (2 ** 63)) / (2 ** 60)) / (1 - exp(- Integer(upper - lower) / (2 ** 60)))
+
+def intervalGrowths(lower, upper, logPrices, multipliers, engine = None):
+    # Batch version of the growth reconstruction in 'checkPool'. 'multipliers'
+    # maps every 'logPrice' and 'logPrice + spacing' to the growth multiplier
+    # read from the contract, where '0' stands for the default value of
+    # 'getGrowthMultiplier'. Each entry is evaluated once in 'mpContext' and
+    # the resulting growths are returned as integers. With the 'integer' or
+    # 'adaptive' engine, the floors are proven as in 'floorIntegral' instead.
+    engine = engine or integralEngine
+    spacing = upper - lower
+    if engine in quotients:
+        return provenGrowths(lower, upper, logPrices, multipliers, engine)
+    denominator = 1 - mpContext.exp(- mpContext.mpf(spacing) / X60)
+    values = {}
+    for logPrice, growthMultiplier in multipliers.items():
+        if growthMultiplier != 0:
+            values[logPrice] = mpContext.mpf(growthMultiplier)
+        elif logPrice <= lower:
+            values[logPrice] = (2 ** 208) * mpContext.exp(+ mpContext.mpf(logPrice - X63) / X60) / denominator
+        else:
+            values[logPrice] = (2 ** 208) * mpContext.exp(- mpContext.mpf(logPrice - X63) / X60) / denominator
+
+    growths = []
+    for logPrice in logPrices:
+        if logPrice < lower:
+            growth = (values[logPrice + spacing] - values[logPrice]) * mpContext.exp(- mpContext.mpf(logPrice + spacing - X63) / X60)
+        else:
+            growth = (values[logPrice] - values[logPrice + spacing]) * mpContext.exp(+ mpContext.mpf(logPrice - X63) / X60)
+        growths += [int(mpContext.floor(growth / (2 ** 97)))]
+    return growths
+
+def provenGrowths(lower, upper, logPrices, multipliers, engine):
+    # Every growth is the quotient of two expansions as in
+    # 'AdaptiveIntegral.expand', where the denominator is
+    # '1 - exp(- spacing / X60)' which is shared by the default multipliers.
+    spacing = upper - lower
+    denominator = {Fraction(0): Fraction(1), Fraction(- spacing, X60): Fraction(-1)}
+    values = {}
+    for logPrice, growthMultiplier in multipliers.items():
+        if growthMultiplier != 0:
+            values[logPrice] = {exponent: int(growthMultiplier) * coefficient for exponent, coefficient in denominator.items()}
+        elif logPrice <= lower:
+            values[logPrice] = {Fraction(+ (logPrice - X63), X60): Fraction(2 ** 208)}
+        else:
+            values[logPrice] = {Fraction(- (logPrice - X63), X60): Fraction(2 ** 208)}
+
+    growths = []
+    for logPrice in logPrices:
+        if logPrice < lower:
+            terms = [(values[logPrice + spacing], +1), (values[logPrice], -1)]
+            shift = Fraction(- (logPrice + spacing - X63), X60)
+        else:
+            terms = [(values[logPrice], +1), (values[logPrice + spacing], -1)]
+            shift = Fraction(+ (logPrice - X63), X60)
+        numerator = {}
+        for expansion, sign in terms:
+            for exponent, coefficient in expansion.items():
+                numerator[exponent + shift] = numerator.get(exponent + shift, 0) + sign * coefficient / (2 ** 97)
+        numerator = {exponent: coefficient for exponent, coefficient in numerator.items() if coefficient != 0}
+        growths += [int(floorQuotient(numerator, denominator, engine))]
+    return growths
+
+def checkPool(nofeeswap, access, poolId, pool):
+    curve = pool.curve
+    lower = min(curve[0], curve[1])
+    upper = max(curve[0], curve[1])
+    current = curve[-1]
+    spacing = upper - lower
+    minLogPrice = min(list(pool.growth.keys()))
+    maxLogPrice = max(list(pool.growth.keys()))
+
+    staticParamsStoragePointerExtension, staticParamsStoragePointer, logPriceCurrent, sharesTotal, growth, integral0, integral1 = access._readDynamicParams(nofeeswap, poolId)
+    curveArray = list(access._readCurve(nofeeswap, poolId, logPriceCurrent).return_value)
+
+    sharesTotalAll = {}
+    growthAll = {}
+
+    sharesTotalAll[lower] = sharesTotal
+    growthAll[lower] = growth
+
+    logPrices = list(range(lower - spacing, minLogPrice - 1, - spacing)) + list(range(lower + spacing, maxLogPrice + 1, + spacing))
+    multipliers = {}
+    for logPrice in logPrices:
+        for _logPrice in [logPrice, logPrice + spacing]:
+            if _logPrice not in multipliers:
+                multipliers[_logPrice] = access._readGrowthMultiplier(nofeeswap, poolId, _logPrice)
+    growthAll.update(zip(logPrices, intervalGrowths(lower, upper, logPrices, multipliers)))
+
+    for logPrice in range(lower - spacing, minLogPrice - 1, - spacing):
+        sharesTotalAll[logPrice] = sharesTotalAll[logPrice + spacing] - access._readSharesDelta(nofeeswap, poolId, logPrice + spacing)
+
+    for logPrice in range(lower + spacing, maxLogPrice + 1, + spacing):
+        sharesTotalAll[logPrice] = sharesTotalAll[logPrice - spacing] + access._readSharesDelta(nofeeswap, poolId, logPrice)
+
+    for logPrice in range(minLogPrice, maxLogPrice, spacing):
+        assert abs(floor((1 << 111) * pool.growth[logPrice]) - growthAll[logPrice]) <= 2 ** 10
+        assert pool.sharesTotal[logPrice] == sharesTotalAll[logPrice]
+
+    index = getCurveIndex(pool.curve, pool.kernel)
+    assert abs(integral0 - index.outgoing(current, upper)) <= 2 ** 64
+    assert abs(integral1 - index.outgoing(lower, current)) <= 2 ** 64
+    assert current == logPriceCurrent
+    assert curveArray == encodeCurve(pool.curve)
@@ -0,0 +1,325 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+from .constants import FIRST_REGISTER
+from .assembler import Assembler, Field, Template
+from .optimizer import optimize, tabulate
+from .actions import Push32, Neg, Lt, Iszero, And, Revert, TransferFromPayerERC20, TakeToken, SyncToken, Settle, SettleNetERC20, ModifySingleBalance, Swap, SwapRoute, ModifyPosition, Donate, ReturnSlots
+
+def assembleSequence(build, deadline, optimized = False):
+    # 'build' appends the actions of a sequence to an 'Assembler'. By default,
+    # the actions are encoded as they are written with transient slots only.
+    # With 'optimized', they are rewritten by 'optimize', their slots are kept
+    # in registers where possible and their addresses are moved to an address
+    # table by 'tabulate'.
+    if optimized:
+        return tabulate(optimize(build(Assembler()))).assemble(deadline)
+    return build(Assembler().reserve(*range(FIRST_REGISTER, 256))).assemble(deadline)
+
+def mintActions(assembler, nofeeswap, token0, token1, tagShares, poolId, qMin, qMax, shares, hookData):
+    sharesSlot = assembler.register()
+
+    successSlot = assembler.register()
+
+    amount0Slot = assembler.register()
+    amount1Slot = assembler.register()
+
+    successSlotTransfer0 = assembler.register()
+    successSlotTransfer1 = assembler.register()
+    resultSlotTransfer0 = assembler.register()
+    resultSlotTransfer1 = assembler.register()
+
+    valueSlotSettle = assembler.zero
+    successSlotSettle0 = assembler.register()
+    resultSlotSettle0 = assembler.register()
+
+    successSlotSettle1 = assembler.register()
+    resultSlotSettle1 = assembler.register()
+
+    sharesSuccessSlot = assembler.register()
+
+    logOffset = ((poolId >> 180) % 256)
+    if logOffset >= 128:
+        logOffset -= 256
+
+    lower = qMin + (1 << 63) - (logOffset * (1 << 59))
+    upper = qMax + (1 << 63) - (logOffset * (1 << 59))
+
+    assembler.action(Push32(shares, sharesSlot))
+    assembler.action(ModifyPosition(poolId, lower, upper, sharesSlot, successSlot, amount0Slot, amount1Slot, hookData))
+    assembler.action(SyncToken(token0.address))
+    assembler.action(TransferFromPayerERC20(token0.address, amount0Slot, nofeeswap.address, successSlotTransfer0, resultSlotTransfer0))
+    assembler.action(Settle(valueSlotSettle, successSlotSettle0, resultSlotSettle0))
+    assembler.action(SyncToken(token1.address))
+    assembler.action(TransferFromPayerERC20(token1.address, amount1Slot, nofeeswap.address, successSlotTransfer1, resultSlotTransfer1))
+    assembler.action(Settle(valueSlotSettle, successSlotSettle1, resultSlotSettle1))
+    assembler.action(ModifySingleBalance(tagShares, sharesSlot, sharesSuccessSlot))
+    return assembler
+
+def mintSequence(nofeeswap, token0, token1, tagShares, poolId, qMin, qMax, shares, hookData, deadline, optimized = False):
+    return assembleSequence(lambda assembler: mintActions(assembler, nofeeswap, token0, token1, tagShares, poolId, qMin, qMax, shares, hookData), deadline, optimized)
+
+def burnActions(assembler, token0, token1, payer, tagShares, poolId, qMin, qMax, shares, hookData):
+    sharesSlot = assembler.register()
+
+    successSlot = assembler.register()
+
+    amount0Slot = assembler.register()
+    amount1Slot = assembler.register()
+
+    successSlotSettle0 = assembler.register()
+    successSlotSettle1 = assembler.register()
+
+    sharesSuccessSlot = assembler.register()
+
+    logOffset = ((poolId >> 180) % 256)
+    if logOffset >= 128:
+        logOffset -= 256
+
+    lower = qMin + (1 << 63) - (logOffset * (1 << 59))
+    upper = qMax + (1 << 63) - (logOffset * (1 << 59))
+
+    assembler.action(Push32(-shares, sharesSlot))
+    assembler.action(ModifyPosition(poolId, lower, upper, sharesSlot, successSlot, amount0Slot, amount1Slot, hookData))
+    assembler.action(Neg(amount0Slot, amount0Slot))
+    assembler.action(Neg(amount1Slot, amount1Slot))
+    assembler.action(TakeToken(token0.address, payer.address, amount0Slot, successSlotSettle0))
+    assembler.action(TakeToken(token1.address, payer.address, amount1Slot, successSlotSettle1))
+    assembler.action(ModifySingleBalance(tagShares, sharesSlot, sharesSuccessSlot))
+    return assembler
+
+def burnSequence(token0, token1, payer, tagShares, poolId, qMin, qMax, shares, hookData, deadline, optimized = False):
+    return assembleSequence(lambda assembler: burnActions(assembler, token0, token1, payer, tagShares, poolId, qMin, qMax, shares, hookData), deadline, optimized)
+
+def offsetLimit(poolId, limit):
+    # The 'uint64' limit of 'SWAP', clamped. A 'Field' is passed through as it
+    # already holds the offsetted limit.
+    if isinstance(limit, Field):
+        return limit
+
+    logOffset = ((poolId >> 180) % 256)
+    if logOffset >= 128:
+        logOffset -= 256
+
+    limitOffsetted = limit + (1 << 63) - (logOffset * (1 << 59))
+    if limitOffsetted < 0:
+        limitOffsetted = 0
+    if limitOffsetted >= (2 ** 64):
+        limitOffsetted = (2 ** 64) - 1
+    return limitOffsetted
+
+def payActions(assembler, nofeeswap, token, payer, amountSlot, zeroSlot, label):
+    # Settles the signed amount in 'amountSlot' of 'token' as 'swapSequence'
+    # always has: a negative amount is taken to 'payer' and a positive one is
+    # pulled from the caller of 'nofeeswap.unlock' and settled.
+    logicSlot = assembler.register()
+    amountSlotTake = assembler.register()
+    successSlotTake = assembler.register()
+    successSlotTransfer = assembler.register()
+    resultSlotTransfer = assembler.register()
+    successSlotSettle = assembler.register()
+    resultSlotSettle = assembler.register()
+
+    assembler.action(Lt(zeroSlot, amountSlot, logicSlot))
+    assembler.jump((label, 'pay'), logicSlot)
+    assembler.action(Neg(amountSlot, amountSlotTake))
+    assembler.action(TakeToken(token.address, payer.address, amountSlotTake, successSlotTake))
+    assembler.label((label, 'pay'))
+    assembler.action(Iszero(logicSlot, logicSlot))
+    assembler.jump((label, 'paid'), logicSlot)
+    assembler.action(SyncToken(token.address))
+    assembler.action(TransferFromPayerERC20(token.address, amountSlot, nofeeswap.address, successSlotTransfer, resultSlotTransfer))
+    assembler.action(Settle(zeroSlot, successSlotSettle, resultSlotSettle))
+    assembler.label((label, 'paid'))
+    return assembler
+
+def swapActions(assembler, nofeeswap, token0, token1, payer, poolId, amountSpecified, limit, zeroForOne, hookData, returnAmounts = False):
+    # If 'payer' is 'None', 'SETTLE_NET_ERC20' takes the output to, and pulls
+    # the input from, the caller of 'nofeeswap.unlock' and the sequence
+    # reverts if either settlement fails. Otherwise, the output is taken to
+    # 'payer' while the input is still pulled from the caller of
+    # 'nofeeswap.unlock' by 'TRANSFER_FROM_PAYER_ERC20'. With 'returnAmounts',
+    # the sequence ends with a 'RETURN_SLOTS' of 'amount0' and 'amount1' which
+    # 'decodeResult' reads from the return value of 'nofeeswap.unlock'.
+    successSlot = assembler.register()
+
+    amount0Slot = assembler.register()
+    amount1Slot = assembler.register()
+
+    amountSpecifiedSlot = assembler.register()
+    zeroSlot = assembler.zero
+
+    # Labels are keyed by the position of the block so that several swaps can
+    # be composed in one assembler.
+    block = len(assembler)
+
+    limitOffsetted = offsetLimit(poolId, limit)
+
+    assembler.action(Push32(amountSpecified, amountSpecifiedSlot))
+    assembler.action(
+      Swap(
+        poolId,
+        amountSpecifiedSlot,
+        limitOffsetted,
+        zeroForOne,
+        zeroSlot,
+        successSlot,
+        amount0Slot,
+        amount1Slot,
+        hookData
+      )
+    )
+    assembler.jump((block, 'swapSucceeded'), successSlot)
+    assembler.action(Revert())
+    assembler.label((block, 'swapSucceeded'))
+
+    if payer is None:
+        successSlotSettle0 = assembler.register()
+        successSlotSettle1 = assembler.register()
+        successSlotSettle = assembler.register()
+
+        assembler.action(SettleNetERC20(token0.address, amount0Slot, successSlotSettle0))
+        assembler.action(SettleNetERC20(token1.address, amount1Slot, successSlotSettle1))
+        assembler.action(And(successSlotSettle0, successSlotSettle1, successSlotSettle))
+        assembler.jump((block, 'settleSucceeded'), successSlotSettle)
+        assembler.action(Revert())
+        assembler.label((block, 'settleSucceeded'))
+    else:
+        payActions(assembler, nofeeswap, token0, payer, amount0Slot, zeroSlot, (block, 0))
+        payActions(assembler, nofeeswap, token1, payer, amount1Slot, zeroSlot, (block, 1))
+
+    if returnAmounts:
+        assembler.action(ReturnSlots([(amount0Slot,), (amount1Slot,)]))
+
+    return assembler
+
+def swapSequence(nofeeswap, token0, token1, payer, poolId, amountSpecified, limit, zeroForOne, hookData, deadline, returnAmounts = False, optimized = False):
+    return assembleSequence(lambda assembler: swapActions(assembler, nofeeswap, token0, token1, payer, poolId, amountSpecified, limit, zeroForOne, hookData, returnAmounts), deadline, optimized)
+
+def swapTemplate(nofeeswap, token0, token1, payer, deadline):
+    # The swap sequence with 'poolId', 'amountSpecified', 'limit',
+    # 'zeroForOne' and 'hookData' left as fields, to be filled by 'swapFill'.
+    return Template(tabulate(optimize(swapActions(
+        Assembler(),
+        nofeeswap,
+        token0,
+        token1,
+        payer,
+        Field('poolId', 0),
+        Field('amountSpecified', 0),
+        Field('limit', 1 << 63),
+        Field('zeroForOne', 0),
+        Field('hookData', b'')
+    ))), deadline)
+
+def swapFill(template, poolId, amountSpecified, limit, zeroForOne, hookData, deadline = None):
+    values = {
+        'poolId': poolId,
+        'amountSpecified': amountSpecified,
+        'limit': offsetLimit(poolId, limit),
+        'zeroForOne': zeroForOne,
+        'hookData': hookData,
+    }
+    if deadline is not None:
+        values['deadline'] = deadline
+    return template.fill(**values)
+
+def routeActions(assembler, nofeeswap, tokens, route, amountSpecified, returnAmounts = False):
+    # A multi-hop swap through 'route', a list of '(poolId, limit, zeroForOne)'
+    # from 'tokens[0]' to 'tokens[-1]', where the output of each hop is the
+    # exact input of the next one. Only the input of the first hop and the
+    # output of the last hop are settled with the caller of 'nofeeswap.unlock',
+    # which leaves the unspent output of a hop whose limit is reached in
+    # nofeeswap. With 'returnAmounts', the sequence ends by returning the input
+    # and the output as in 'swapActions'.
+    successSlot = assembler.register()
+
+    amountInSlot = assembler.register()
+    amountOutSlot = assembler.register()
+
+    successSlotSettle0 = assembler.register()
+    successSlotSettle1 = assembler.register()
+    successSlotSettle = assembler.register()
+
+    amountSpecifiedSlot = assembler.register()
+
+    block = len(assembler)
+
+    hops = []
+    for k, (poolId, limit, zeroForOne) in enumerate(route):
+        hops += [(poolId, offsetLimit(poolId, limit), zeroForOne, amountOutSlot if k == len(route) - 1 else 0)]
+
+    assembler.action(Push32(amountSpecified, amountSpecifiedSlot))
+    assembler.action(SwapRoute(amountSpecifiedSlot, successSlot, amountInSlot, hops))
+    assembler.jump((block, 'routeSucceeded'), successSlot)
+    assembler.action(Revert())
+    assembler.label((block, 'routeSucceeded'))
+
+    assembler.action(SettleNetERC20(tokens[0].address, amountInSlot, successSlotSettle0))
+    assembler.action(SettleNetERC20(tokens[-1].address, amountOutSlot, successSlotSettle1))
+    assembler.action(And(successSlotSettle0, successSlotSettle1, successSlotSettle))
+    assembler.jump((block, 'settleSucceeded'), successSlotSettle)
+    assembler.action(Revert())
+    assembler.label((block, 'settleSucceeded'))
+
+    if returnAmounts:
+        assembler.action(ReturnSlots([(amountInSlot,), (amountOutSlot,)]))
+
+    return assembler
+
+def routeSequence(nofeeswap, tokens, route, amountSpecified, deadline, returnAmounts = False, optimized = False):
+    return assembleSequence(lambda assembler: routeActions(assembler, nofeeswap, tokens, route, amountSpecified, returnAmounts), deadline, optimized)
+
+def donateActions(assembler, nofeeswap, token0, token1, poolId, shares, hookData):
+    sharesSlot = assembler.register()
+
+    successSlot = assembler.register()
+
+    amount0Slot = assembler.register()
+    amount1Slot = assembler.register()
+
+    successSlotTransfer0 = assembler.register()
+    successSlotTransfer1 = assembler.register()
+    resultSlotTransfer0 = assembler.register()
+    resultSlotTransfer1 = assembler.register()
+
+    valueSlotSettle = assembler.zero
+    successSlotSettle0 = assembler.register()
+    resultSlotSettle0 = assembler.register()
+
+    successSlotSettle1 = assembler.register()
+    resultSlotSettle1 = assembler.register()
+
+    assembler.action(Push32(shares, sharesSlot))
+    assembler.action(Donate(poolId, sharesSlot, successSlot, amount0Slot, amount1Slot, hookData))
+    assembler.action(SyncToken(token0.address))
+    assembler.action(TransferFromPayerERC20(token0.address, amount0Slot, nofeeswap.address, successSlotTransfer0, resultSlotTransfer0))
+    assembler.action(Settle(valueSlotSettle, successSlotSettle0, resultSlotSettle0))
+    assembler.action(SyncToken(token1.address))
+    assembler.action(TransferFromPayerERC20(token1.address, amount1Slot, nofeeswap.address, successSlotTransfer1, resultSlotTransfer1))
+    assembler.action(Settle(valueSlotSettle, successSlotSettle1, resultSlotSettle1))
+    return assembler
+
+def donateSequence(nofeeswap, token0, token1, poolId, shares, hookData, deadline, optimized = False):
+    return assembleSequence(lambda assembler: donateActions(assembler, nofeeswap, token0, token1, poolId, shares, hookData), deadline, optimized)
+
+def collectActions(assembler, token0, token1, tag0, tag1, payer, amount0, amount1):
+    amount0Slot = assembler.register()
+    amount1Slot = assembler.register()
+
+    successSlot0 = assembler.register()
+    successSlot1 = assembler.register()
+
+    successSlotSettle0 = assembler.register()
+    successSlotSettle1 = assembler.register()
+
+    assembler.action(Push32(amount0, amount0Slot))
+    assembler.action(Push32(amount1, amount1Slot))
+    assembler.action(ModifySingleBalance(tag0, amount0Slot, successSlot0))
+    assembler.action(ModifySingleBalance(tag1, amount1Slot, successSlot1))
+    assembler.action(Neg(amount0Slot, amount0Slot))
+    assembler.action(Neg(amount1Slot, amount1Slot))
+    assembler.action(TakeToken(token0.address, payer.address, amount0Slot, successSlotSettle0))
+    assembler.action(TakeToken(token1.address, payer.address, amount1Slot, successSlotSettle1))
+    return assembler
+
+def collectSequence(token0, token1, tag0, tag1, payer, amount0, amount1, deadline, optimized = False):
+    return assembleSequence(lambda assembler: collectActions(assembler, token0, token1, tag0, tag1, payer, amount0, amount1), deadline, optimized)
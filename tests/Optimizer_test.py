@@ -0,0 +1,203 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+import pytest
+from Nofee import logTest, Assembler, ReturnSlots, optimize, tabulate, PUSH0, PUSH10, PUSH16, PUSH32, NEG, ADD, LT, ISZERO, JUMP, JUMPDEST, REVERT, SYNC_TOKEN, SETTLE, TAKE_TOKEN, ADDRESS_TABLE, RETURN_SLOTS, SYNC_TOKEN_REF, TRANSFER_FROM_PAYER_ERC20, TRANSFER_FROM_PAYER_ERC20_REF, TAKE_TOKEN_REF, swapActions, mintActions, burnActions, donateActions, collectActions
+
+deadline = 2 ** 32 - 1
+
+token0 = '0x' + '1' * 40
+token1 = '0x' + '2' * 40
+
+def opcodes(assembler):
+    return [values[0] for types, values, name in assembler.program]
+
+@pytest.mark.parametrize('value, opcode', [(0, PUSH0), (-1, PUSH10), ((1 << 79) - 1, PUSH10), (1 << 79, PUSH16), (-(1 << 127), PUSH16), ((1 << 127), PUSH32)])
+def test_pushNarrowing(value, opcode, request, worker_id):
+    logTest(request, worker_id)
+
+    assembler = Assembler()
+    slot = assembler.slot()
+    assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, value, slot])
+    assembler.action(['uint8', 'address', 'address', 'uint8', 'uint8'], [TAKE_TOKEN, token0, token1, slot, assembler.slot()])
+
+    optimized = optimize(assembler)
+    assert opcodes(optimized) == [opcode, TAKE_TOKEN]
+    types, values, name = optimized.program[0]
+    assert values[-1] is slot
+    if opcode != PUSH0:
+        assert values[1] == value
+    assert len(optimized.assemble(deadline)) <= len(assembler.assemble(deadline))
+
+def test_constantFolding(request, worker_id):
+    logTest(request, worker_id)
+
+    assembler = Assembler()
+    a = assembler.slot()
+    b = assembler.slot()
+    c = assembler.slot()
+    assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, 5, a])
+    assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, 7, b])
+    assembler.action(['uint8', 'uint8', 'uint8', 'uint8'], [ADD, a, b, c])
+    assembler.action(['uint8', 'uint8', 'uint8'], [NEG, c, c])
+    assembler.action(['uint8', 'address', 'address', 'uint8', 'uint8'], [TAKE_TOKEN, token0, token1, c, a])
+
+    optimized = optimize(assembler)
+    assert opcodes(optimized) == [PUSH10, TAKE_TOKEN]
+    assert optimized.program[0][1][1:] == [-12, c]
+
+def test_negationPair(request, worker_id):
+    logTest(request, worker_id)
+
+    assembler = Assembler()
+    a = assembler.slot()
+    b = assembler.slot()
+    assembler.action(['uint8', 'address', 'address', 'uint8', 'uint8'], [TAKE_TOKEN, token0, token1, a, a])
+    assembler.action(['uint8', 'uint8', 'uint8'], [NEG, a, b])
+    assembler.action(['uint8', 'uint8', 'uint8'], [NEG, b, a])
+    assembler.action(['uint8', 'address', 'address', 'uint8', 'uint8'], [TAKE_TOKEN, token0, token1, a, b])
+
+    assert opcodes(optimize(assembler)) == [TAKE_TOKEN, NEG, TAKE_TOKEN]
+
+    # An in-place pair reverts on 'type(int256).min' and is therefore kept.
+    assembler = Assembler()
+    a = assembler.slot()
+    assembler.action(['uint8', 'address', 'address', 'uint8', 'uint8'], [TAKE_TOKEN, token0, token1, a, a])
+    assembler.action(['uint8', 'uint8', 'uint8'], [NEG, a, a])
+    assembler.action(['uint8', 'uint8', 'uint8'], [NEG, a, a])
+    assembler.action(['uint8', 'address', 'address', 'uint8', 'uint8'], [TAKE_TOKEN, token0, token1, a, a])
+
+    assert opcodes(optimize(assembler)) == opcodes(assembler)
+
+def test_overflowIsKept(request, worker_id):
+    logTest(request, worker_id)
+
+    assembler = Assembler()
+    a = assembler.slot()
+    assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, -(1 << 255), a])
+    assembler.action(['uint8', 'uint8', 'uint8'], [NEG, a, a])
+    assembler.action(['uint8', 'address', 'address', 'uint8', 'uint8'], [TAKE_TOKEN, token0, token1, a, a])
+
+    assert opcodes(optimize(assembler)) == [PUSH32, NEG, TAKE_TOKEN]
+
+def test_unreachable(request, worker_id):
+    logTest(request, worker_id)
+
+    assembler = Assembler()
+    a = assembler.slot()
+    assembler.action(['uint8', 'address', 'address', 'uint8', 'uint8'], [TAKE_TOKEN, token0, token1, a, a])
+    assembler.jump('end', a)
+    assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, 1, a])
+    assembler.action(['uint8'], [REVERT])
+    assembler.action(['uint8', 'address'], [SYNC_TOKEN, token0])
+    assembler.label('unused')
+    assembler.action(['uint8', 'address'], [SYNC_TOKEN, token1])
+    assembler.label('end')
+    assembler.jump('skip', assembler.zero)
+    assembler.label('skip')
+    assembler.action(['uint8', 'address'], [SYNC_TOKEN, token1])
+
+    optimized = optimize(assembler)
+    assert opcodes(optimized) == [TAKE_TOKEN, JUMP, REVERT, JUMPDEST, SYNC_TOKEN]
+    assert optimized.program[-1][1][1] == token1
+    optimized.assemble(deadline)
+
+def test_returnSlots(request, worker_id):
+    logTest(request, worker_id)
+
+    # A slot which is only returned is still read, and nothing runs after the
+    # return.
+    assembler = Assembler()
+    a = assembler.register()
+    b = assembler.register()
+    assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, 5, a])
+    assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, 6, b])
+    assembler.action(ReturnSlots([(a,)]))
+    assembler.action(['uint8', 'address'], [SYNC_TOKEN, token0])
+
+    optimized = optimize(assembler)
+    assert opcodes(optimized) == [PUSH10, RETURN_SLOTS]
+    assert optimized.program[1][1][2] is a
+
+def test_redundantCalls(request, worker_id):
+    logTest(request, worker_id)
+
+    assembler = Assembler()
+    a = assembler.slot()
+    assembler.action(['uint8', 'address'], [SYNC_TOKEN, token0])
+    assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, 1, a])
+    assembler.action(['uint8', 'address'], [SYNC_TOKEN, token1])
+    assembler.action(['uint8', 'uint8', 'uint8', 'uint8'], [SETTLE, assembler.zero, assembler.slot(), assembler.slot()])
+    assembler.action(['uint8', 'uint8', 'uint8', 'uint8'], [SETTLE, assembler.zero, assembler.slot(), assembler.slot()])
+    assembler.action(['uint8', 'address', 'address', 'uint8', 'uint8'], [TAKE_TOKEN, token0, token1, a, a])
+
+    assert opcodes(optimize(assembler)) == [PUSH10, SYNC_TOKEN, SETTLE, TAKE_TOKEN]
+
+    # A second settle whose success is checked is kept.
+    assembler = Assembler()
+    success = assembler.slot()
+    assembler.action(['uint8', 'uint8', 'uint8', 'uint8'], [SETTLE, assembler.zero, assembler.slot(), assembler.slot()])
+    assembler.action(['uint8', 'uint8', 'uint8', 'uint8'], [SETTLE, assembler.zero, success, assembler.slot()])
+    assembler.jump('end', success)
+    assembler.action(['uint8'], [REVERT])
+    assembler.label('end')
+
+    assert opcodes(optimize(assembler)) == opcodes(assembler)
+
+def test_sequences(request, worker_id):
+    logTest(request, worker_id)
+
+    class Account:
+        def __init__(self, address):
+            self.address = address
+
+    nofeeswap, token0, token1, payer = [Account('0x' + str(k) * 40) for k in range(1, 5)]
+    poolId = 1 << 188
+    for assembler in [
+        swapActions(Assembler(), nofeeswap, token0, token1, payer, poolId, -10, 0, 1, b''),
+        swapActions(Assembler(), nofeeswap, token0, token1, None, poolId, -10, 0, 1, b''),
+        mintActions(Assembler(), nofeeswap, token0, token1, 1, poolId, 0, 100, 10, b''),
+        burnActions(Assembler(), token0, token1, payer, 1, poolId, 0, 100, 10, b''),
+        donateActions(Assembler(), nofeeswap, token0, token1, poolId, 10, b''),
+        collectActions(Assembler(), token0, token1, 1, 2, payer, 3, 4),
+    ]:
+        optimized = optimize(assembler)
+        assert len(optimized.assemble(deadline)) < len(assembler.assemble(deadline))
+        assert [opcode if opcode != PUSH10 else PUSH32 for opcode in opcodes(optimized)] == opcodes(assembler)
+
+def test_tabulate(request, worker_id):
+    logTest(request, worker_id)
+
+    payer = '0x' + '3' * 40
+    nofeeswap = '0x' + '4' * 40
+    assembler = Assembler()
+    amount = assembler.slot()
+    assembler.action(['uint8', 'int256', 'uint8'], [PUSH32, 5, amount])
+    assembler.action(['uint8', 'address'], [SYNC_TOKEN, token0])
+    assembler.action(['uint8', 'address', 'uint8', 'address', 'uint8', 'uint8'], [TRANSFER_FROM_PAYER_ERC20, token0, amount, nofeeswap, assembler.slot(), assembler.slot()])
+    assembler.action(['uint8', 'address', 'address', 'uint8', 'uint8'], [TAKE_TOKEN, token0, payer, amount, assembler.slot()])
+    assembler.action(['uint8', 'address', 'address', 'uint8', 'uint8'], [TAKE_TOKEN, token1, payer, amount, assembler.slot()])
+
+    tabulated = tabulate(assembler)
+    assert opcodes(tabulated) == [ADDRESS_TABLE, PUSH32, SYNC_TOKEN_REF, TRANSFER_FROM_PAYER_ERC20, TAKE_TOKEN_REF, TAKE_TOKEN]
+    # 'token1' and 'nofeeswap' are only used once and are not listed.
+    assert tabulated.program[0][1][1:] == [2, token0, payer]
+    assert tabulated.program[4][1][1:3] == [0, 1]
+    assert len(tabulated.assemble(deadline)) < len(assembler.assemble(deadline))
+    assert tabulate(tabulated) is tabulated
+
+    assembler = Assembler()
+    assembler.action(['uint8', 'address'], [SYNC_TOKEN, token0])
+    assembler.action(['uint8', 'address'], [SYNC_TOKEN, token1])
+    assert tabulate(assembler) is assembler
+
+    class Account:
+        def __init__(self, address):
+            self.address = address
+
+    assembler = optimize(mintActions(Assembler(), Account(nofeeswap), Account(token0), Account(token1), 5, 1 << 188, -100, 100, 1000, b''))
+    tabulated = tabulate(assembler)
+    assert opcodes(tabulated).count(TRANSFER_FROM_PAYER_ERC20_REF) == 2
+    assert len(tabulated.assemble(deadline)) < len(assembler.assemble(deadline)) - 40
+
+    # Every address of a swap is used once.
+    assembler = optimize(swapActions(Assembler(), Account(nofeeswap), Account(token0), Account(token1), None, 1 << 188, -10, 0, 1, b''))
+    assert tabulate(assembler) is assembler
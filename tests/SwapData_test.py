@@ -3,7 +3,7 @@ import pytest
 from brownie import chain, accounts, Access, Nofeeswap, NofeeswapDelegatee, ERC20FixedSupply, MockHook, Operator, Deployer
 from sympy import Float, Integer, floor, Float, log, ceiling
 from eth_abi import encode
-from Nofee import logTest, address0, mintSequence, burnSequence, swapSequence, keccak, toInt, twosComplementInt8, encodeKernelCompact, encodeCurve, checkPool, getPoolId, Pool
+from Nofee import logTest, address0, mintSequence, burnSequence, swapSequence, keccak, toInt, twosComplementInt8, encodeKernelCompact, encodeCurve, checkPool, getPoolId, Pool, Assembler, optimize, tabulate, swapActions
 
 logPriceTickX59 = 57643193118714
 
@@ -888,6 +888,8 @@ def test_swapData(deployment, request, worker_id):
     gasLogPrice = 0
     gasIncoming = 0
     gasOutgoing = 0
+    gasRegisters = 0
+    gasTransient = 0
 
     for n in range(len(data)):
         d = data[n]
@@ -945,6 +947,34 @@ def test_swapData(deployment, request, worker_id):
 
             chain.undo()
 
+            # The same swap, optimized and with its slots in registers, moves
+            # the same amounts.
+            balance0 = token0.balanceOf(nofeeswap)
+            balance1 = token1.balanceOf(nofeeswap)
+            tx = nofeeswap.unlock(
+                operator,
+                swapSequence(nofeeswap, token0, token1, root, poolId, amountSpecified, logPriceLimit, zeroForOne, hookData, deadline, optimized = True),
+                {'from': root}
+            )
+            assert token0.balanceOf(nofeeswap) - balance0 == amount0
+            assert token1.balanceOf(nofeeswap) - balance1 == amount1
+            gasRegisters += tx.gas_used
+            gasUsed = tx.gas_used
+
+            chain.undo()
+
+            # The optimized swap with every register reserved, which keeps its
+            # slots in transient storage.
+            tx = nofeeswap.unlock(
+                operator,
+                tabulate(optimize(swapActions(Assembler().reserve(*range(248, 256)), nofeeswap, token0, token1, root, poolId, amountSpecified, logPriceLimit, zeroForOne, hookData))).assemble(deadline),
+                {'from': root}
+            )
+            gasTransient += tx.gas_used
+            assert gasUsed < tx.gas_used
+
+            chain.undo()
+
             (incoming, outgoing) = (amount0, amount1) if (amount0 >= 0 and amount1 <= 0) else (amount1, amount0)
 
             # swap with incoming
@@ -998,4 +1028,6 @@ def test_swapData(deployment, request, worker_id):
     print(numberOfSwaps)
     print(gasLogPrice / numberOfSwaps)
     print(gasIncoming / numberOfSwaps)
-    print(gasOutgoing / numberOfSwaps)
\ No newline at end of file
+    print(gasOutgoing / numberOfSwaps)
+    print(gasRegisters / numberOfSwaps)
+    print((gasTransient - gasRegisters) / numberOfSwaps)
\ No newline at end of file